@@ -12,9 +12,349 @@
     * @url https://github.com/DFRobot/DFRobot_STCC4
  """
 
+import ctypes
+import random
 import smbus2
+import threading
 import time
-from typing import Optional, Tuple, Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+ 
+def _crc8_table(polynomial: int) -> bytes:
+    """
+    Build the 256-entry lookup table of a MSB-first CRC-8
+    :param polynomial: CRC polynomial without the leading x^8 term
+    :return: Table indexed by (crc ^ data_byte)
+    """
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ polynomial) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+        table[i] = crc
+    return bytes(table)
+ 
+I2C_M_RD = 0x0001  # read flag of struct i2c_msg (linux/i2c.h)
+ 
+def _i2c_msg_over(addr: int, flags: int, buf: bytearray) -> smbus2.i2c_msg:
+    """
+    Build an i2c_msg whose data buffer is buf itself, so a transaction neither copies nor allocates it
+    :param addr: I2C address of the message
+    :param flags: 0 for a write, I2C_M_RD for a read
+    :param buf: Buffer to send from or receive into, it cannot be resized while the message exists
+    :return: i2c_msg for smbus2.SMBus.i2c_rdwr, its len can be lowered to use only the start of buf
+    """
+    # A view of the first byte is enough for the address, and makes no new array type
+    cbuf = ctypes.c_char.from_buffer(buf)
+    # Pointer made from the address, not cast from cbuf: a cast would hold buf in a reference cycle until the next gc
+    msg = smbus2.i2c_msg(addr=addr, flags=flags, len=len(buf),
+                         buf=ctypes.cast(ctypes.addressof(cbuf), ctypes.POINTER(ctypes.c_char)))
+    msg._view = cbuf
+    return msg
+ 
+class STCC4Bus:
+    """
+    Interface of the I2C bus used by DFRobot_STCC4_I2C
+    The driver passes its own preallocated buffers with the number of bytes to use, so an implementation
+    can run a transaction without allocating. Every method raises OSError if the transaction fails (e.g. NACK).
+    """
+ 
+    def write(self, addr: int, buf: bytearray, length: int) -> None:
+        """
+        Write the first length bytes of buf in one transaction
+        :param addr: I2C address of the device
+        """
+        raise NotImplementedError
+ 
+    def write_read(self, addr: int, wbuf: bytearray, wlength: int, rbuf: bytearray, rlength: int) -> None:
+        """
+        Write the first wlength bytes of wbuf, then read rlength bytes into rbuf after a repeated start
+        :param addr: I2C address of the device
+        """
+        raise NotImplementedError
+ 
+    def close(self) -> None:
+        """Release the bus"""
+        pass
+ 
+class SMBus2Bus(STCC4Bus):
+    """
+    STCC4Bus on top of smbus2, every transaction is a single i2c_rdwr call
+    The data is not copied, but each transaction makes its i2c_msg structures (and smbus2 its ioctl argument),
+    a few small ctypes objects; DFRobot_STCC4_bus.LinuxI2CBus reuses its structures instead.
+    """
+ 
+    def __init__(self, bus=1):
+        """
+        Constructor
+        :param bus: I2C bus number to open, or an already opened smbus2.SMBus handle (it is not closed by close())
+        """
+        if isinstance(bus, int):
+            self._smbus = smbus2.SMBus(bus)
+            self._owned = True
+        else:
+            self._smbus = bus
+            self._owned = False
+ 
+    @staticmethod
+    def _msg(addr: int, flags: int, buf: bytearray, length: int) -> smbus2.i2c_msg:
+        # Made per call: nothing keeps the caller's buffer alive or locked after the transaction
+        msg = _i2c_msg_over(addr, flags, buf)
+        msg.len = length
+        return msg
+ 
+    def write(self, addr: int, buf: bytearray, length: int) -> None:
+        self._smbus.i2c_rdwr(self._msg(addr, 0, buf, length))
+ 
+    def write_read(self, addr: int, wbuf: bytearray, wlength: int, rbuf: bytearray, rlength: int) -> None:
+        self._smbus.i2c_rdwr(self._msg(addr, 0, wbuf, wlength), self._msg(addr, I2C_M_RD, rbuf, rlength))
+ 
+    def close(self) -> None:
+        if self._owned:
+            self._smbus.close()
+ 
+class STCC4Measurement:
+    """
+    Reusable record holding one decoded measurement frame
+    Decoding into it allocates nothing besides the float objects of temperature, humidity and timestamp.
+    co2_concentration : CO2 concentration in ppm
+    temperature : Temperature in degrees Celsius
+    humidity : Relative humidity in percent
+    sensor_status : Sensor status word
+    temp_raw / hum_raw : Raw 16-bit temperature and humidity words
+    timestamp : time.monotonic() when the frame was read
+    """
+    
+    __slots__ = ("co2_concentration", "temperature", "humidity", "sensor_status", "temp_raw", "hum_raw", "timestamp")
+ 
+    def __init__(self):
+        self.co2_concentration = 0
+        self.temperature = 0.0
+        self.humidity = 0.0
+        self.sensor_status = 0
+        self.temp_raw = 0
+        self.hum_raw = 0
+        self.timestamp = 0.0
+ 
+    def as_tuple(self) -> Tuple[int, float, float, int]:
+        """
+        :return: Tuple of (co2_concentration, temperature, humidity, sensor_status), as returned by measurement()
+        """
+        return (self.co2_concentration, self.temperature, self.humidity, self.sensor_status)
+ 
+class RetryPolicy:
+    """
+    Retry policy of the bus transactions of DFRobot_STCC4_I2C
+    A failed transaction is tried again after an exponential backoff with jitter, until it succeeds,
+    max_attempts is reached, the deadline would be passed or the failure is not retryable.
+    """
+    
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.001, max_delay: float = 0.1,
+                 multiplier: float = 2.0, jitter: float = 0.5, deadline: Optional[float] = None,
+                 retry_on: Tuple[type, ...] = (OSError,), retry_crc: bool = True):
+        """
+        Constructor
+        :param max_attempts: Attempts of one transaction, 1 disables retries
+        :param base_delay: Backoff before the first retry, in seconds
+        :param max_delay: Upper bound of the backoff, in seconds
+        :param multiplier: Growth factor of the backoff from one retry to the next
+        :param jitter: Fraction of the backoff removed at random (0 to 1), so sensors failing together do not retry together
+        :param deadline: Longest time in seconds spent on one transaction including its retries, no limit if None
+        :param retry_on: Exception classes raised by the bus that are retried
+        :param retry_crc: Whether a response with a wrong CRC is read again
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = tuple(retry_on)
+        self.retry_crc = retry_crc
+        self._random = random.Random()
+ 
+    def backoff(self, attempt: int) -> float:
+        """
+        :param attempt: Number of the attempt that just failed, from 1
+        :return: Delay in seconds before the next attempt
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1.0 - self.jitter * self._random.random())
+ 
+    def retryable(self, error: Optional[BaseException]) -> bool:
+        """
+        :param error: Exception raised by the bus, None for a response with a wrong CRC
+        :return: True if the failed transaction may be tried again
+        """
+        if error is None:
+            return self.retry_crc
+        return isinstance(error, self.retry_on)
+ 
+class CircuitBreaker:
+    """
+    Circuit breaker of one bus, shared by all sensors on it and tracking each address on its own
+    After failure_threshold consecutive failed transactions of an address its circuit opens: every transaction
+    to that address then fails at once without touching the bus, for reset_timeout seconds. One trial transaction
+    is then let through (half-open), its success closes the circuit and its failure opens it again.
+    A dead sensor so costs nothing once its circuit is open, and the other sensors of the bus are not affected.
+    """
+    
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+ 
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 5.0):
+        """
+        Constructor
+        :param failure_threshold: Consecutive failures opening the circuit of an address
+        :param reset_timeout: Time in seconds a circuit stays open before a trial transaction
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # addr -> [consecutive failures, time the circuit opened or None, trial running]
+        self._circuits = {}
+        self._lock = threading.Lock()
+ 
+    def allow(self, addr: int) -> bool:
+        """
+        :param addr: I2C address of the device
+        :return: True if a transaction to addr may be run, it must then be reported with record()
+        """
+        circuit = self._circuits.get(addr)
+        if circuit is None or circuit[1] is None:
+            return True
+        with self._lock:
+            if circuit[2] or time.monotonic() - circuit[1] < self.reset_timeout:
+                return False
+            circuit[2] = True
+            return True
+ 
+    def record(self, addr: int, ok: Optional[bool]):
+        """
+        Report the result of a transaction allowed by allow()
+        :param addr: I2C address of the device
+        :param ok: True if the transaction succeeded, False if it failed, None if the device refused it as it
+        normally does (a read before a new sample is ready): neither a failure nor a success, a trial ends undecided
+        """
+        with self._lock:
+            circuit = self._circuits.get(addr)
+            if ok is None:
+                if circuit is not None:
+                    circuit[2] = False
+                return
+            if ok:
+                if circuit is not None:
+                    del self._circuits[addr]
+                return
+            if circuit is None:
+                circuit = self._circuits[addr] = [0, None, False]
+            circuit[0] += 1
+            if circuit[2] or circuit[0] >= self.failure_threshold:
+                circuit[1] = time.monotonic()
+                circuit[2] = False
+ 
+    def state(self, addr: int) -> int:
+        """
+        :param addr: I2C address of the device
+        :return: CLOSED, OPEN or HALF_OPEN
+        """
+        circuit = self._circuits.get(addr)
+        if circuit is None or circuit[1] is None:
+            return self.CLOSED
+        if circuit[2] or time.monotonic() - circuit[1] >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+ 
+    def reset(self, addr: Optional[int] = None):
+        """
+        Close a circuit
+        :param addr: I2C address of the device, every address if None
+        """
+        with self._lock:
+            if addr is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(addr, None)
+ 
+class _SampleSchedule:
+    """
+    Read schedule of continuous measurement, following the sensor's own data-ready cadence
+    The sensor publishes a sample every interval, at a phase the host cannot see: it is only known to lie
+    between the last refused read (NACK or unchanged frame) and the read that returned the new sample.
+    Each next read is planned one interval later in the middle of that window, and refused reads are
+    repeated after the half window, so the window halves every cycle down to min_step.
+    Being re-anchored on the sensor every sample, the schedule never drifts away from it, and once converged
+    a sample is read at most min_step after it is available, with about two reads per sample.
+    """
+    
+    NONE = 0        # nothing new yet, read again at next_read
+    NEW = 1         # a new sample was read
+    TIMEOUT = 2     # no new sample for timeout seconds
+ 
+    def __init__(self, interval: float, poll: float, timeout: Optional[float] = None, start: Optional[float] = None,
+                 min_step: float = 0.001):
+        """
+        :param poll: Largest period between two reads while waiting for a new sample
+        :param start: time.monotonic() the measurement started, so the first sample is due one interval later;
+        if None the sensor is assumed to be measuring already and the first read is immediate
+        :param min_step: Smallest period between two reads, the latency the schedule converges to
+        """
+        self.interval = interval
+        self.poll = poll
+        self.min_step = min_step
+        self.timeout = timeout if timeout is not None else 3 * interval
+        if start is None:
+            self.last_new = time.monotonic() - interval
+        else:
+            self.last_new = start
+        self.next_read = self.last_new + interval - poll
+        self._earliest = self.last_new + interval
+        self._step = poll
+        # Time of the last refused read since the last new sample
+        self._refused = None
+        # Whatever is read after a start or trigger is new, even if it equals the last frame of an earlier measurement
+        self._nacked = start is not None
+ 
+    @property
+    def due(self) -> float:
+        """time.monotonic() at which the next sample is expected"""
+        return self.last_new + self.interval
+ 
+    def update(self, now: float, read_ok: bool, same_frame: bool, nacked: bool = False) -> int:
+        """
+        Account for the result of one read
+        :param now: time.monotonic() of the read
+        :param read_ok: True if a valid frame was read
+        :param same_frame: True if the frame equals the previous new sample
+        :param nacked: True if the read failed because the sensor had no new sample yet
+        :return: NONE, NEW or TIMEOUT
+        """
+        # An unchanged frame is a stale one, unless the sensor said it had nothing new just before
+        # or the next sample may already be out, so the sensor really measured the same values twice
+        if read_ok and (not same_frame or self._nacked or now >= self._earliest):
+            if self._refused is not None:
+                window = min(now - self._refused, 2 * self.poll)
+            else:
+                # Read late: the sample may be older than the current window, widen it again
+                window = min(4 * self._step, 2 * self.poll)
+            self._step = max(self.min_step, window / 2)
+            self._refused = None
+            self._nacked = False
+            self.last_new = now
+            self._earliest = now - window + self.interval
+            self.next_read = now + self.interval - self._step
+            return self.NEW
+        self._nacked = (self._nacked and not read_ok) or nacked
+        self._refused = now
+        self.next_read = now + self._step
+        # Back off to poll if the sample is much later than expected
+        self._step = min(self.poll, 2 * self._step)
+        if now - self.last_new >= self.timeout:
+            self.last_new = now
+            return self.TIMEOUT
+        return self.NONE
  
 class DFRobot_STCC4:
     """Base class for DFRobot STCC4 CO2 sensor"""
@@ -24,6 +364,9 @@ class DFRobot_STCC4:
     ERR_DATA_READ = 2
     ERR_DATA_WRITE = 3
     ERR_IC_VERSION = 4
+    ERR_CRC = 5
+    ERR_CIRCUIT_OPEN = 6
+    ERR_STATUS = 7        # sample left out for its status flags, see DFRobot_STCC4_poller
     
     # Sensor commands
     STCC4_GET_ID = 0x365B
@@ -40,6 +383,27 @@ class DFRobot_STCC4:
     STCC4_ENABLE_TESTING_MODE = 0x3FBC
     STCC4_DISABLE_TESTING_MODE = 0x3F3D
     STCC4_FORC_CALIBRATION = 0x362F
+    
+    # Expected value of get_id
+    STCC4_PRODUCT_ID = 0x0901018A
+    
+    # Raw RHT compensation words after power-up, reset or sleep: 25 degrees Celsius, 50 %RH
+    DEFAULT_RHT_RAW = (0x6666, 0x72AF)
+    
+    # Delays and retries in seconds
+    START_STOP_DELAY = 1.0        # after start/stop continuous measurement
+    GET_ID_RETRIES = 5            # attempts of get_id without retry policy
+    GET_ID_RETRY_DELAY = 0.2      # between two get_id attempts without retry policy
+    FRC_DELAY = 0.2               # between forced recalibration command and its result
+    MEASUREMENT_INTERVAL = 1.0    # sampling interval of continuous measurement
+    WAKEUP_DELAY = 0.005          # shortest wait between wakeup and the next command
+    SINGLE_SHOT_DELAY = 0.5       # shortest wait between single_measurement and its result
+    POLL_INTERVAL = 0.01          # between two reads while waiting for a new sample
+    
+    # CRC-8 parameters (Sensirion: polynomial x^8 + x^5 + x^4 + 1, init 0xFF)
+    CRC8_POLYNOMIAL = 0x31
+    CRC8_INIT = 0xFF
+    _CRC8_TABLE = _crc8_table(CRC8_POLYNOMIAL)
  
     def __init__(self):
         """Constructor"""
@@ -51,32 +415,57 @@ class DFRobot_STCC4:
         :param data: List or tuple of 16-bit integers
         :return: Calculated CRC value
         """
-        crc = 0xFF
+        table = self._CRC8_TABLE
+        crc = self.CRC8_INIT
         
         for value in data:
-            high_byte = (value >> 8) & 0xFF
-            low_byte = value & 0xFF
-            
-            # Process high byte
-            crc ^= high_byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ 0x31
-                else:
-                    crc <<= 1
-                crc &= 0xFF  # Keep it as 8-bit
-            
-            # Process low byte
-            crc ^= low_byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ 0x31
-                else:
-                    crc <<= 1
-                crc &= 0xFF  # Keep it as 8-bit
+            crc = table[crc ^ ((value >> 8) & 0xFF)]
+            crc = table[crc ^ (value & 0xFF)]
         
         return crc
  
+    def check_crc_frame(self, frame: Union[bytes, bytearray, memoryview, list], length: Optional[int] = None) -> int:
+        """
+        Check every word/CRC triplet of a raw frame in one call
+        :param frame: Raw bytes read from the sensor, laid out as [MSB, LSB, CRC] * n
+        :param length: Number of leading bytes of frame to check, the whole frame if None
+        :return: Pass/fail mask, bit i is set if the CRC of word i matches.
+        A frame of n words is fully valid when the mask equals (1 << n) - 1.
+        """
+        table = self._CRC8_TABLE
+        init = self.CRC8_INIT
+        mask = 0
+        bit = 1
+        if length is None:
+            length = len(frame)
+        
+        # A while loop rather than range(): no range object or iterator is allocated per call
+        i = 0
+        end = length - 2
+        while i < end:
+            if table[table[init ^ frame[i]] ^ frame[i + 1]] == frame[i + 2]:
+                mask |= bit
+            bit <<= 1
+            i += 3
+        
+        return mask
+ 
+    def begin(self, temperature: Optional[float] = None, humidity: Optional[float] = None,
+              pressure: Optional[int] = None, start: bool = True, verify: bool = True, deadline: float = 1.0) -> int:
+        """
+        Bring the sensor up without fixed sleeps: wakeup, get_id polled until the sensor answers, compensation,
+        then start continuous measurement without waiting (reads are refused until the first sample is ready)
+        :param temperature: Temperature compensation, not set if None (needs humidity too)
+        :param humidity: Humidity compensation, not set if None (needs temperature too)
+        :param pressure: Pressure compensation, not set if None
+        :param start: Start continuous measurement
+        :param verify: Check the product ID; False skips it (get_id can be called later, before starting)
+        :param deadline: Longest time in seconds to wait for the sensor to answer get_id
+        :return: ERR_OK, ERR_IC_VERSION if no valid ID was read before the deadline,
+        ERR_DATA_WRITE if a compensation or the start command failed
+        """
+        raise NotImplementedError
+ 
     def get_id(self) -> Optional[bytes]:
         """
         Get the sensor ID
@@ -106,7 +495,45 @@ class DFRobot_STCC4:
         temperature : Temperature
         humidity : Humidity
         sensor_status : Sensor status
-        None : error
+        None : error, last_error tells a bus error (ERR_DATA_READ) from a corrupted frame (ERR_CRC)
+        or an open circuit breaker (ERR_CIRCUIT_OPEN)
+        """
+        raise NotImplementedError
+ 
+    def read_measurement(self, record: Optional[STCC4Measurement] = None) -> int:
+        """
+        Read measurement data into a preallocated record, checking the CRC of every word
+        :param record: Record to decode into, the driver's own last_measurement record if None
+        :return: ERR_OK if successful, ERR_DATA_READ on bus error, ERR_CRC if the frame is corrupted,
+        ERR_CIRCUIT_OPEN if the circuit breaker of the sensor is open. The record is left untouched unless ERR_OK is returned.
+        """
+        raise NotImplementedError
+ 
+    def is_sample_ready(self) -> bool:
+        """
+        Tell without any bus transaction whether a sample not read yet should be available,
+        from the time the measurement was started or triggered and the cadence of the samples read since
+        :return: True if a sample is due, False if not yet or if no measurement was started by this driver
+        """
+        raise NotImplementedError
+ 
+    def wait_for_sample(self, timeout: Optional[float] = None) -> Optional[Tuple[int, float, float, int]]:
+        """
+        Wait for the next sample of continuous or single shot measurement and read it as soon as it is available
+        Sleeps until the sample is due, then reads again only while the read is refused (NACK) or returns
+        the previous, stale frame, at most POLL_INTERVAL apart.
+        :param timeout: Longest wait in seconds, 3 sampling intervals if None
+        :return: Tuple of (co2_concentration, temperature, humidity, sensor_status), None on timeout
+        """
+        raise NotImplementedError
+ 
+    def stream(self, timeout: Optional[float] = None) -> Iterator[Optional[Tuple[int, float, float, int]]]:
+        """
+        Start continuous measurement and yield every new sample as soon as the sensor has it
+        Stale frames are skipped, and the measurement is stopped when the generator is closed.
+        :param timeout: Seconds without a new sample after which None is yielded, 3 sampling intervals if None
+        :return: Generator of (co2_concentration, temperature, humidity, sensor_status), None on timeout.
+        The read time of each sample is last_measurement.timestamp.
         """
         raise NotImplementedError
  
@@ -115,7 +542,7 @@ class DFRobot_STCC4:
         Set temperature and humidity compensation
         :param temperature: Temperature compensation value, range of 10 to 40 degrees Celsius.
         :param humidity: Humidity compensation value, range of 20 to 80 percent relative humidity.
-        :return: True if successful, False otherwise
+        :return: True if successful or if the sensor already has this compensation, False otherwise
         """
         raise NotImplementedError
  
@@ -123,7 +550,15 @@ class DFRobot_STCC4:
         """
         Set pressure compensation
         :param pressure: Pressure compensation value, range of 400 to 1100 hPa
-        :return: True if successful, False otherwise
+        :return: True if successful or if the sensor already has this compensation, False otherwise
+        """
+        raise NotImplementedError
+ 
+    def rht_compensation_raw(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Raw (temp_raw, hum_raw) RHT compensation words the sensor may be applying, as far as the driver knows
+        :return: One pair when known: the last written, or DEFAULT_RHT_RAW after a reset or sleep; several pairs
+        when a write failed (the sensor may or may not have taken it) or after invalidate_compensation()
         """
         raise NotImplementedError
  
@@ -191,85 +626,231 @@ class DFRobot_STCC4_I2C(DFRobot_STCC4):
     DEFAULT_I2C_ADDR = 0x64
     I2C_BUS = 1  # Raspberry Pi uses bus 1 for I2C
  
-    def __init__(self, addr: int = DEFAULT_I2C_ADDR):
+    def __init__(self, addr: int = DEFAULT_I2C_ADDR, bus=I2C_BUS):
         """
         Constructor for I2C implementation
         :param addr: I2C address of the sensor
+        :param bus: I2C bus number to open, an STCC4Bus, or an already opened smbus2.SMBus handle to share with other sensors
         """
         super().__init__()
         self._device_addr = addr
+        # Preallocated transfer buffers: command + up to two data words, longest response
+        self._tx_buf = bytearray(8)
+        self._rx_buf = bytearray(18)
+        self.last_measurement = STCC4Measurement()
+        self.last_error = self.ERR_OK
+        self._last_frame = bytearray(12)
+        # View of the frame of a measurement read, compared and copied without slicing a new bytearray
+        self._rx_frame = memoryview(self._rx_buf)[:12]
+        self._bus_error = None
+        # Compensation command -> raw words last written, and -> largest change of each word that is not written
+        self._compensation = {}
+        self._compensation_hysteresis = {}
+        # RHT compensation words the sensor may be applying, kept apart from the cache of the writes to skip
+        self._rht_raw = (self.DEFAULT_RHT_RAW,)
+        self._history = None
+        # Read schedule of the measurement started by this driver, None if none
+        self._schedule = None
+        # time.monotonic() of the last sample read, refused reads after it are expected for a while
+        self._last_sample = 0.0
+        self.set_metrics(None)
+        self.set_retry_policy(None)
+        if isinstance(bus, STCC4Bus):
+            self._bus = bus
+            return
         try:
-            self._bus = smbus2.SMBus(self.I2C_BUS)
+            self._bus = SMBus2Bus(bus)
         except Exception as e:
             self._bus = None
  
-    def _write_cmd16(self, cmd: int) -> bool:
+    def set_metrics(self, metrics, name: Optional[str] = None):
         """
-        Write a 16-bit command to the sensor
-        :param cmd: Command to write
-        :return: True if successful, False otherwise
+        Record the bus transactions of this sensor, see DFRobot_STCC4_metrics.STCC4Metrics
+        :param metrics: Metrics collector shared by any number of sensors, None to stop recording
+        :param name: Name of the sensor in the metrics, its I2C address if None
+        """
+        self._metrics = metrics
+        self._metrics_name = name if name is not None else "0x%02X" % self._device_addr
+ 
+    def set_history(self, history):
+        """
+        Record every sample read by read_measurement/measurement/stream
+        :param history: DFRobot_STCC4_history.STCC4History, None to stop recording
+        """
+        self._history = history
+ 
+    def set_compensation_hysteresis(self, temperature: float = 0.0, humidity: float = 0.0, pressure: float = 0.0):
+        """
+        Skip compensation writes whose value is this close to the one last written
+        With the default 0, a write is only skipped when the raw value sent to the sensor would not change.
+        :param temperature: Hysteresis of set_rht_compensation temperature, in degrees Celsius
+        :param humidity: Hysteresis of set_rht_compensation humidity, in percent relative humidity
+        :param pressure: Hysteresis of set_pressure_compensation, in hPa
+        """
+        self._compensation_hysteresis = {
+            self.STCC4_SET_RHT_COMPENSATION: (int(temperature * 65535 / 175), int(humidity * 65535 / 125)),
+            self.STCC4_SET_PRESSURE_COMPENSATION: (int(pressure * 50),),
+        }
+ 
+    def invalidate_compensation(self):
+        """
+        Forget the compensation last written, so the next set_*_compensation is always sent
+        The sensor may also have been power cycled, so its defaults are one more candidate of rht_compensation_raw().
+        """
+        self._compensation.clear()
+        if self.DEFAULT_RHT_RAW not in self._rht_raw:
+            self._rht_raw += (self.DEFAULT_RHT_RAW,)
+
+    def rht_compensation_raw(self) -> Tuple[Tuple[int, int], ...]:
+        """RHT compensation words the sensor may be applying"""
+        return self._rht_raw
+ 
+    def set_retry_policy(self, policy: Optional[RetryPolicy], breaker: Optional[CircuitBreaker] = None):
+        """
+        Retry the failed bus transactions of this sensor and stop talking to it while it keeps failing
+        :param policy: RetryPolicy applied to every transaction, None to try each transaction once
+        (get_id then keeps its own GET_ID_RETRIES attempts)
+        :param breaker: CircuitBreaker of the bus, shared with the other sensors on it, None for no breaker
+        """
+        self._retry_policy = policy
+        self._breaker = breaker
+ 
+    def _transfer(self, cmd: int, buf: bytearray, wlength: int, rlength: int = 0, crc_words: int = 0,
+                  retry: bool = True, refusable: bool = False) -> int:
+        """
+        Run one bus transaction: write wlength bytes of buf, then read rlength bytes into the receive buffer if rlength
+        The transaction is retried under the retry policy and skipped while the circuit breaker is open.
+        :param cmd: Command of the transaction, for the metrics
+        :param crc_words: Number of leading words of the response whose CRC must match
+        :param retry: False for a transaction expected to fail (wakeup of a sleeping sensor): no retry, no breaker
+        :param refusable: True for the measurement read, which the sensor refuses until a new sample is ready:
+        while a sample is not overdue such a refusal is neither retried nor counted by the circuit breaker
+        :return: ERR_OK if successful, ERR_DATA_WRITE / ERR_DATA_READ on bus error, ERR_CRC on a corrupted
+        response, ERR_CIRCUIT_OPEN if the transaction was skipped
         """
         if self._bus is None:
+            return self.ERR_DATA_READ if rlength else self.ERR_DATA_WRITE
+        if not retry:
+            return self._attempt(cmd, buf, wlength, rlength, crc_words)
+        
+        breaker = self._breaker
+        if breaker is not None and not breaker.allow(self._device_addr):
+            return self.ERR_CIRCUIT_OPEN
+        error = self._attempt(cmd, buf, wlength, rlength, crc_words)
+        if error == self.ERR_DATA_READ and refusable and self._refusal_expected():
+            if breaker is not None:
+                breaker.record(self._device_addr, None)
+            return error
+        policy = self._retry_policy
+        if error != self.ERR_OK and policy is not None:
+            start = time.monotonic()
+            attempt = 1
+            while (error != self.ERR_OK and attempt < policy.max_attempts
+                   and policy.retryable(None if error == self.ERR_CRC else self._bus_error)):
+                delay = policy.backoff(attempt)
+                if policy.deadline is not None and time.monotonic() + delay - start > policy.deadline:
+                    break
+                time.sleep(delay)
+                if self._metrics is not None:
+                    self._metrics.retry(self._metrics_name, cmd)
+                attempt += 1
+                error = self._attempt(cmd, buf, wlength, rlength, crc_words)
+        if breaker is not None:
+            breaker.record(self._device_addr, error == self.ERR_OK)
+        return error
+ 
+    def _refusal_expected(self) -> bool:
+        """
+        :return: True if a refused measurement read means no new sample yet: a measurement is running
+        and no sample is overdue (none for the timeout of its schedule)
+        """
+        schedule = self._schedule
+        if schedule is None:
             return False
-            
+        return time.monotonic() - max(schedule.last_new, self._last_sample) < schedule.timeout
+ 
+    def _attempt(self, cmd: int, buf: bytearray, wlength: int, rlength: int, crc_words: int) -> int:
+        """
+        One try of _transfer, the exception raised by the bus is kept in _bus_error
+        :return: ERR_OK, ERR_DATA_WRITE / ERR_DATA_READ or ERR_CRC
+        """
+        bus = self._bus
+        metrics = self._metrics
+        start = time.perf_counter() if metrics is not None else 0.0
         try:
-            # Split 16-bit command into two bytes (big endian)
-            bytes_to_send = [(cmd >> 8) & 0xFF, cmd & 0xFF]
-            self._bus.write_i2c_block_data(self._device_addr, bytes_to_send[0], [bytes_to_send[1]])
-            return True
+            if rlength:
+                bus.write_read(self._device_addr, buf, wlength, self._rx_buf, rlength)
+            else:
+                bus.write(self._device_addr, buf, wlength)
         except Exception as e:
-            return False
+            self._bus_error = e
+            if metrics is not None:
+                metrics.transaction(self._metrics_name, cmd, wlength + rlength, time.perf_counter() - start, e)
+            return self.ERR_DATA_READ if rlength else self.ERR_DATA_WRITE
+        if metrics is not None:
+            metrics.transaction(self._metrics_name, cmd, wlength + rlength, time.perf_counter() - start)
+        
+        if crc_words and self.check_crc_frame(self._rx_buf, 3 * crc_words) != (1 << crc_words) - 1:
+            self._bus_error = None
+            if metrics is not None:
+                metrics.crc_failure(self._metrics_name, cmd)
+            return self.ERR_CRC
+        return self.ERR_OK
  
-    def _write_cmd8(self, cmd: int) -> bool:
+    def _write_cmd16(self, cmd: int) -> bool:
+        """
+        Write a 16-bit command to the sensor
+        :param cmd: Command to write
+        :return: True if successful, False otherwise
+        """
+        # Split 16-bit command into two bytes (big endian)
+        self._tx_buf[0] = (cmd >> 8) & 0xFF
+        self._tx_buf[1] = cmd & 0xFF
+        return self._transfer(cmd, self._tx_buf, 2) == self.ERR_OK
+ 
+    def _write_cmd8(self, cmd: int, retry: bool = True) -> bool:
         """
         Write an 8-bit command to the sensor
         :param cmd: Command to write
+        :param retry: False if the command is expected not to be acknowledged
         :return: True if successful, False otherwise
         """
-        if self._bus is None:
-            return False
-            
-        try:
-            self._bus.write_byte(self._device_addr, cmd)
-            return True
-        except Exception as e:
-            return False
+        self._tx_buf[0] = cmd & 0xFF
+        return self._transfer(cmd, self._tx_buf, 1, retry=retry) == self.ERR_OK
  
     def _write_data(self, cmd: int, data: Union[list, tuple]) -> bool:
         """
-        Write data to the sensor
+        Write a command followed by its data words in a single I2C transaction
         :param cmd: Command to write before data
         :param data: List or tuple of 16-bit integers to write
         :return: True if successful, False otherwise
         """
-        if not self._write_cmd16(cmd):
-            return False
-            
-        try:
-            for value in data:
-                # Split value into two bytes
-                high_byte = (value >> 8) & 0xFF
-                low_byte = value & 0xFF
-                
-                # Calculate CRC for this value
-                crc = self.calculation_crc([value])
-                
-                # Write data bytes and CRC
-
-                # self._bus.write_i2c_block_data(
-                #     self._device_addr, 
-                #     high_byte, 
-                #     [low_byte, crc]
-                # )
-                self._bus.write_byte(self._device_addr, high_byte)
-                self._bus.write_byte(self._device_addr, low_byte)
-                self._bus.write_byte(self._device_addr, crc)
-                # Small delay between writes
-                time.sleep(0.01)
-            
-            return True
-        except Exception as e:
-            return False
+        # Command (big endian), then each value as [MSB, LSB, CRC]
+        length = 2 + 3 * len(data)
+        payload = self._tx_buf if length <= len(self._tx_buf) else bytearray(length)
+        payload[0] = (cmd >> 8) & 0xFF
+        payload[1] = cmd & 0xFF
+        i = 2
+        for value in data:
+            payload[i] = (value >> 8) & 0xFF
+            payload[i + 1] = value & 0xFF
+            payload[i + 2] = self.calculation_crc([value])
+            i += 3
+        return self._transfer(cmd, payload, length) == self.ERR_OK
+ 
+    def _read_into(self, cmd: int, length: int, crc_words: int = 0, refusable: bool = False) -> int:
+        """
+        Read data from the sensor into the receive buffer
+        :param cmd: Command to write before reading
+        :param length: Number of bytes to read, at most len(self._rx_buf)
+        :param crc_words: Number of leading words whose CRC must match
+        :param refusable: True if the sensor refuses the read while it has no new data, see _transfer
+        :return: ERR_OK if successful, an error code of _transfer otherwise
+        """
+        # Command write and data read in one transaction (repeated start, no register byte)
+        self._tx_buf[0] = (cmd >> 8) & 0xFF
+        self._tx_buf[1] = cmd & 0xFF
+        return self._transfer(cmd, self._tx_buf, 2, length, crc_words, refusable=refusable)
  
     def _read_data(self, cmd: int, length: int) -> Optional[bytes]:
         """
@@ -278,15 +859,71 @@ class DFRobot_STCC4_I2C(DFRobot_STCC4):
         :param length: Number of bytes to read
         :return: Read bytes if successful, None otherwise
         """
-        if not self._write_cmd16(cmd):
-            return None
-            
-        try:
-            # Read the data
-            data = self._bus.read_i2c_block_data(self._device_addr, 0, length)
-            return bytes(data)
-        except Exception as e:
+        if self._read_into(cmd, length) != self.ERR_OK:
             return None
+        return bytes(self._rx_buf[:length])
+ 
+    def begin(self, temperature: Optional[float] = None, humidity: Optional[float] = None,
+              pressure: Optional[int] = None, start: bool = True, verify: bool = True, deadline: float = 1.0) -> int:
+        """Bring the sensor up"""
+        return self.begin_many([self], temperature, humidity, pressure, start, verify, deadline)[0]
+ 
+    @staticmethod
+    def begin_many(sensors: Sequence["DFRobot_STCC4_I2C"], temperature: Optional[float] = None,
+                   humidity: Optional[float] = None, pressure: Optional[int] = None, start: bool = True,
+                   verify: bool = True, deadline: float = 1.0) -> List[int]:
+        """
+        Bring up sensors sharing a bus as begin() does, one step at a time across all of them,
+        so the waits overlap and the whole bring-up takes about as long as one sensor's
+        :param sensors: Driver instances, the caller must hold the lock of their bus if it is shared with other threads
+        :return: List of the begin() error codes, in the order of sensors
+        """
+        results = [DFRobot_STCC4.ERR_OK] * len(sensors)
+        if not sensors:
+            return results
+        end = time.monotonic() + deadline
+        
+        def configure(i: int):
+            sensor = sensors[i]
+            # Nothing is known of the state of a sensor being brought up
+            sensor.invalidate_compensation()
+            ok = True
+            if temperature is not None and humidity is not None:
+                ok = sensor.set_rht_compensation(temperature, humidity) and ok
+            if pressure is not None:
+                ok = sensor.set_pressure_compensation(pressure) and ok
+            if start:
+                # No START_STOP_DELAY: reads are refused until the first sample is ready anyway
+                ok = sensor._start_continuous() and ok
+            if not ok:
+                results[i] = DFRobot_STCC4.ERR_DATA_WRITE
+        
+        for sensor in sensors:
+            sensor.wakeup()
+        time.sleep(max(sensor.WAKEUP_DELAY for sensor in sensors))
+        
+        if not verify:
+            for i in range(len(sensors)):
+                configure(i)
+            return results
+        
+        # Poll the sensors which did not answer yet instead of sleeping a fixed time between attempts,
+        # and configure each one as soon as it answers
+        pending = list(range(len(sensors)))
+        while True:
+            waiting = []
+            for i in pending:
+                if sensors[i]._read_id() is None:
+                    waiting.append(i)
+                else:
+                    configure(i)
+            pending = waiting
+            if not pending or time.monotonic() >= end:
+                break
+            time.sleep(sensors[pending[0]].POLL_INTERVAL)
+        for i in pending:
+            results[i] = DFRobot_STCC4.ERR_IC_VERSION
+        return results
  
     def get_id(self):
         """
@@ -294,104 +931,281 @@ class DFRobot_STCC4_I2C(DFRobot_STCC4):
         Returns:
             int: 32-bit sensor ID
         """
-        for i in range(5):
-            r_buf = self._read_data(self.STCC4_GET_ID, 18)
-            if r_buf is None or len(r_buf) < 18:
-                time.sleep(0.2)
-                continue
-                
-            # Extract data pairs and their CRCs
-            data1 = (r_buf[0] << 8) | r_buf[1]
-            data2 = (r_buf[3] << 8) | r_buf[4]
-            crc1 = r_buf[2]
-            crc2 = r_buf[5]
-            
-            # Calculate CRCs
-            calculated_crc1 = self.calculation_crc([data1])
-            calculated_crc2 = self.calculation_crc([data2])
-            
-            # Check CRCs
-            if crc1 == calculated_crc1 and crc2 == calculated_crc2:
-                id_value = (r_buf[0] << 24) | (r_buf[1] << 16) | (r_buf[3] << 8) | r_buf[4]
-                if id_value == 0x901018A:
-                    return id_value
-                    
-            time.sleep(0.2)
+        for i in range(self._get_id_attempts()):
+            if i and self._metrics is not None:
+                self._metrics.retry(self._metrics_name, self.STCC4_GET_ID)
+            id_value = self._read_id()
+            if id_value is not None:
+                return id_value
+            time.sleep(self.GET_ID_RETRY_DELAY)
 
         return 0
  
+    def _get_id_attempts(self) -> int:
+        """Attempts of get_id: a retry policy already retries each transaction"""
+        return self.GET_ID_RETRIES if self._retry_policy is None else 1
+ 
+    def _read_id(self) -> Optional[int]:
+        """
+        One attempt of get_id
+        :return: 32-bit sensor ID if it was read and matches STCC4_PRODUCT_ID, None otherwise
+        """
+        # Read with the CRCs of the two ID words checked
+        if self._read_into(self.STCC4_GET_ID, 18, 2) != self.ERR_OK:
+            return None
+            
+        r_buf = self._rx_buf
+        id_value = (r_buf[0] << 24) | (r_buf[1] << 16) | (r_buf[3] << 8) | r_buf[4]
+        if id_value != self.STCC4_PRODUCT_ID:
+            return None
+        return id_value
+ 
     def start_measurement(self) -> bool:
         """Start continuous measurement"""
+        if not self._start_continuous():
+            return False
+        time.sleep(self.START_STOP_DELAY)
+        return True
+ 
+    def _start_continuous(self) -> bool:
+        """
+        Send the start command without waiting, and plan the first read one sampling interval later
+        :return: True if successful, False otherwise
+        """
         if not self._write_cmd16(self.STCC4_START_CONT_MEASURE):
             return False
-        time.sleep(1)
+        self._schedule = _SampleSchedule(self.MEASUREMENT_INTERVAL, self.POLL_INTERVAL, start=time.monotonic())
         return True
  
     def stop_measurement(self) -> bool:
         """Stop continuous measurement"""
-        if not self._write_cmd16(self.STCC4_STOP_CONT_MEASURE):
+        if not self._stop_continuous():
             return False
-        time.sleep(1)
+        time.sleep(self.START_STOP_DELAY)
         return True
  
+    def _stop_continuous(self) -> bool:
+        """
+        Send the stop command without waiting; the sensor takes START_STOP_DELAY to accept idle-mode commands
+        :return: True if successful, False otherwise
+        """
+        self._schedule = None
+        return self._write_cmd16(self.STCC4_STOP_CONT_MEASURE)
+ 
     def measurement(self) -> Optional[Tuple[int, float, float, int]]:
         """Read measurement data"""
-        raw_data = self._read_data(self.STCC4_READ_MEASURE, 12)
-        if raw_data is None or len(raw_data) < 12:
+        if self.read_measurement() != self.ERR_OK:
             return None
+        return self.last_measurement.as_tuple()
+ 
+    def read_measurement(self, record: Optional[STCC4Measurement] = None) -> int:
+        """Read measurement data into a preallocated record"""
+        error = self._decode_measurement(record)
+        # Whoever reads the sample, the next one is only due one interval later
+        schedule = self._schedule
+        if schedule is not None:
+            self._track_sample(schedule, error)
+        return error
+
+    def _decode_measurement(self, record: Optional[STCC4Measurement] = None) -> int:
+        """
+        Read measurement data into a preallocated record, without accounting for it in the read schedule
+        :return: ERR_OK, or the error of the read
+        """
+        error = self._read_into(self.STCC4_READ_MEASURE, 12, 4, refusable=True)
+        if error != self.ERR_OK:
+            self.last_error = error
+            return self.last_error
+        
+        raw_data = self._rx_buf
+        if record is None:
+            record = self.last_measurement
             
         # Parse CO2 concentration
-        co2_concentration = (raw_data[0] << 8) | raw_data[1]
+        record.co2_concentration = (raw_data[0] << 8) | raw_data[1]
         
         # Parse temperature (raw value to °C)
         temp_raw = (raw_data[3] << 8) | raw_data[4]
-        temperature = -45.0 + ((175.0 * temp_raw) / 65535.0)
+        record.temp_raw = temp_raw
+        record.temperature = -45.0 + ((175.0 * temp_raw) / 65535.0)
         
         # Parse humidity (raw value to %RH)
         hum_raw = (raw_data[6] << 8) | raw_data[7]
-        humidity = -6.0 + ((125.0 * hum_raw) / 65535.0)
+        record.hum_raw = hum_raw
+        record.humidity = -6.0 + ((125.0 * hum_raw) / 65535.0)
         
         # Parse sensor status
-        sensor_status = (raw_data[9] << 8) | raw_data[10]
+        record.sensor_status = (raw_data[9] << 8) | raw_data[10]
+        record.timestamp = self._last_sample = time.monotonic()
+        if self._history is not None:
+            self._history.append_measurement(record)
         
-        return (co2_concentration, temperature, humidity, sensor_status)
+        self.last_error = self.ERR_OK
+        return self.last_error
+ 
+    def is_sample_ready(self) -> bool:
+        """Tell whether a sample not read yet should be available"""
+        schedule = self._schedule
+        return schedule is not None and time.monotonic() >= schedule.due
+ 
+    def wait_for_sample(self, timeout: Optional[float] = None) -> Optional[Tuple[int, float, float, int]]:
+        """Wait for the next sample and read it as soon as it is available"""
+        schedule = self._schedule
+        if schedule is None:
+            # Measurement started elsewhere: read at once, then follow the sensor
+            schedule = self._schedule = _SampleSchedule(self.MEASUREMENT_INTERVAL, self.POLL_INTERVAL)
+        end = time.monotonic() + (timeout if timeout is not None else schedule.timeout)
+        while True:
+            delay = min(schedule.next_read, end) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            state, sample = self._poll_sample(schedule)
+            if state == schedule.NEW:
+                return sample
+            if time.monotonic() >= end:
+                return None
+ 
+    def stream(self, timeout: Optional[float] = None) -> Iterator[Optional[Tuple[int, float, float, int]]]:
+        """Yield every new sample of continuous measurement"""
+        # No START_STOP_DELAY: wait_for_sample reads the first sample as soon as it is ready
+        if not self._start_continuous():
+            return
+        try:
+            while True:
+                yield self.wait_for_sample(timeout)
+        finally:
+            self.stop_measurement()
+ 
+    def _poll_sample(self, schedule: _SampleSchedule) -> Tuple[int, Optional[Tuple[int, float, float, int]]]:
+        """
+        One read of stream()
+        :param schedule: Read schedule of the stream
+        :return: (state, sample), state is one of schedule.NONE/NEW/TIMEOUT and sample is only set for NEW
+        """
+        state = self._track_sample(schedule, self._decode_measurement())
+        if state != schedule.NEW:
+            return state, None
+        return state, self.last_measurement.as_tuple()
+
+    def _track_sample(self, schedule: _SampleSchedule, error: int) -> int:
+        """
+        Account for one measurement read in a read schedule
+        :param schedule: Read schedule of the measurement
+        :param error: Result of the read
+        :return: schedule.NONE/NEW/TIMEOUT
+        """
+        read_ok = error == self.ERR_OK
+        same_frame = read_ok and self._rx_frame == self._last_frame
+        state = schedule.update(time.monotonic(), read_ok, same_frame, error == self.ERR_DATA_READ)
+        if state == schedule.NEW:
+            self._last_frame[:] = self._rx_frame
+        return state
  
     def set_rht_compensation(self, temperature: float, humidity: float) -> bool:
         """Set temperature and humidity compensation"""
-        if temperature < 10 or temperature > 40 or humidity < 20 or humidity > 80:
+        words = self._rht_words(temperature, humidity)
+        if words is None:
             return False
+        return self._write_compensation(self.STCC4_SET_RHT_COMPENSATION, words)
+ 
+    @staticmethod
+    def _rht_words(temperature: float, humidity: float) -> Optional[list]:
+        """
+        Check and convert a temperature and humidity compensation to raw words
+        :return: [temp_raw, hum_raw], None if out of range
+        """
+        if temperature < 10 or temperature > 40 or humidity < 20 or humidity > 80:
+            return None
         # Convert temperature to raw value
         temp_raw = int((temperature + 45) * 65535 / 175)
         # Convert humidity to raw value
         hum_raw = int((humidity + 6) * 65535 / 125)
-        
-        return self._write_data(self.STCC4_SET_RHT_COMPENSATION, [temp_raw, hum_raw])
+        return [temp_raw, hum_raw]
  
     def set_pressure_compensation(self, pressure: int) -> bool:
         """Set pressure compensation"""
+        words = self._pressure_words(pressure)
+        if words is None:
+            return False
+        return self._write_compensation(self.STCC4_SET_PRESSURE_COMPENSATION, words)
+ 
+    @staticmethod
+    def _pressure_words(pressure: int) -> Optional[list]:
+        """
+        Check and convert a pressure compensation to raw words
+        :return: [pressure_raw], None if out of range
+        """
         if pressure < 400 or pressure > 1100:
+            return None
+        return [pressure * 50]
+ 
+    def _compensation_pending(self, cmd: int, words: list) -> bool:
+        """
+        :param cmd: Compensation command
+        :param words: Raw words to write
+        :return: False if the words last written are within the hysteresis of words, so the write can be skipped
+        """
+        last = self._compensation.get(cmd)
+        if last is None:
+            return True
+        hysteresis = self._compensation_hysteresis.get(cmd)
+        if hysteresis is None:
+            return last != words
+        for old, new, band in zip(last, words, hysteresis):
+            if abs(new - old) > band:
+                return True
+        return False
+ 
+    def _write_compensation(self, cmd: int, words: list) -> bool:
+        """
+        Write a compensation unless the sensor already has it
+        :return: True if successful or skipped, False otherwise
+        """
+        if not self._compensation_pending(cmd, words):
+            return True
+        if not self._write_data(cmd, words):
+            # The sensor may or may not have taken it
+            self._compensation.pop(cmd, None)
+            if cmd == self.STCC4_SET_RHT_COMPENSATION and tuple(words) not in self._rht_raw:
+                self._rht_raw += (tuple(words),)
             return False
-        pressure_raw = pressure * 50
-        return self._write_data(self.STCC4_SET_PRESSURE_COMPENSATION, [pressure_raw])
+        self._compensation[cmd] = words
+        if cmd == self.STCC4_SET_RHT_COMPENSATION:
+            self._rht_raw = (tuple(words),)
+        return True
  
     def single_measurement(self) -> bool:
         """Perform single shot measurement"""
-        return self._write_cmd16(self.STCC4_SINGLE_SHOT)
+        if not self._write_cmd16(self.STCC4_SINGLE_SHOT):
+            return False
+        # The result is due one measurement time after the trigger
+        self._schedule = _SampleSchedule(self.SINGLE_SHOT_DELAY, self.POLL_INTERVAL, start=time.monotonic())
+        return True
 
     def fall_asleep(self) -> bool:
         """Put sensor to sleep"""
+        # The compensation is not kept across sleep
+        self._compensation.clear()
+        self._rht_raw = (self.DEFAULT_RHT_RAW,)
+        self._schedule = None
         return self._write_cmd16(self.STCC4_SLEEP)
  
     def wakeup(self) -> bool:
         """Wake up sensor"""
-        return self._write_cmd8(self.STCC4_WAKEUP)
+        # A sleeping sensor does not acknowledge its wake-up command
+        return self._write_cmd8(self.STCC4_WAKEUP, retry=False)
  
     def soft_reset(self) -> bool:
         """Perform soft reset"""
+        self._compensation.clear()
+        self._rht_raw = (self.DEFAULT_RHT_RAW,)
+        self._schedule = None
         return self._write_cmd8(self.STCC4_SOFT_RESET)
  
     def factory_reset(self) -> bool:
         """Perform factory reset"""
+        self._compensation.clear()
+        self._rht_raw = (self.DEFAULT_RHT_RAW,)
         if not self._write_cmd16(self.STCC4_FACTORY_RESET):
             return False
             
@@ -412,13 +1226,28 @@ class DFRobot_STCC4_I2C(DFRobot_STCC4):
  
     def forced_recalibration(self, target_ppm: int) -> Optional[int]:
         """Perform forced recalibration"""
-        if  target_ppm > 32000:
-            return None
-        if not self._write_data(self.STCC4_FORC_CALIBRATION, [target_ppm]):
+        if not self._write_frc(target_ppm):
             return None
             
-        time.sleep(0.2)  # 200ms delay
+        time.sleep(self.FRC_DELAY)  # 200ms delay
         
+        return self._read_frc_correction()
+ 
+    def _write_frc(self, target_ppm: int) -> bool:
+        """
+        Send the forced recalibration command without waiting for its result
+        :param target_ppm: Target PPM value for recalibration, must be between 0 and 32000 ppm.
+        :return: True if successful, False otherwise
+        """
+        if  target_ppm > 32000:
+            return False
+        return self._write_data(self.STCC4_FORC_CALIBRATION, [target_ppm])
+ 
+    def _read_frc_correction(self) -> Optional[int]:
+        """
+        Read the result of a forced recalibration
+        :return: Correction value if successful, None otherwise
+        """
         raw_data = self._read_data(self.STCC4_FORC_CALIBRATION, 3)
         if raw_data is None or len(raw_data) < 3:
             return None
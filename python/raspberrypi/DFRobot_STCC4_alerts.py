@@ -0,0 +1,418 @@
+"""!
+    * @file DFRobot_STCC4_alerts.py
+    * @brief Event-driven alerting on the samples of STCC4 sensors
+    * @n Rules are evaluated incrementally as the samples come: thresholds with hysteresis, rate of change over a
+    * @n running window (least squares on running sums), bits of the status word, and sensors that stopped
+    * @n delivering samples. Each rule keeps a small state per sensor and costs O(1) per sample, and a sample
+    * @n only visits the rules of its own sensor, so the cost per sample does not grow with the number of rules
+    * @n of the building. Events are only emitted on transitions (raised or cleared), to callbacks and/or a queue.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+
+# Index of each field in the (co2_concentration, temperature, humidity, sensor_status) tuple of measurement()
+FIELDS = {"co2": 0, "temperature": 1, "humidity": 2, "status": 3}
+
+
+class STCC4Alert:
+    """
+    Transition of one rule on one sensor
+    sensor : Name of the sensor
+    rule : Name of the rule
+    active : True when the alert is raised, False when it is cleared
+    timestamp : time.monotonic() of the sample (or of the check) that caused the transition
+    value : Value that caused the transition: the field for a threshold, the slope in units per minute,
+            the masked status bits, or the seconds since the last sample of a stale sensor
+    """
+
+    __slots__ = ("sensor", "rule", "active", "timestamp", "value")
+
+    def __init__(self, sensor: Hashable, rule: str, active: bool, timestamp: float, value):
+        self.sensor = sensor
+        self.rule = rule
+        self.active = active
+        self.timestamp = timestamp
+        self.value = value
+
+    def __repr__(self) -> str:
+        return "STCC4Alert(%r, %r, %s, %.3f, %r)" % (self.sensor, self.rule, "raised" if self.active else "cleared",
+                                                     self.timestamp, self.value)
+
+
+class _State:
+    """State of one rule on one sensor; the window fields are only used by SlopeRule"""
+
+    __slots__ = ("active", "points", "base", "n", "st", "sy", "stt", "sty")
+
+    def __init__(self):
+        self.active = False
+        self.points = None
+        self.base = 0.0
+        self.n = 0
+        self.st = self.sy = self.stt = self.sty = 0.0
+
+
+class ThresholdRule:
+    """Alert while a field is beyond a threshold, with hysteresis"""
+
+    def __init__(self, name: str, raise_at: float, clear_at: float, field: str = "co2"):
+        """
+        Constructor
+        :param name: Name of the rule, reported in the alerts
+        :param raise_at: The alert is raised when the field reaches this value
+        :param clear_at: The alert is cleared when the field comes back to this value; above raise_at for a low
+        threshold (e.g. raise_at=10, clear_at=12 for a temperature below 10), below it for a high threshold
+        :param field: "co2", "temperature" or "humidity"
+        """
+        if raise_at == clear_at:
+            raise ValueError("raise_at and clear_at must differ")
+        self.name = name
+        self.raise_at = raise_at
+        self.clear_at = clear_at
+        self.rising = raise_at > clear_at
+        self._index = FIELDS[field]
+
+    def evaluate(self, state: _State, timestamp: float, sample: tuple):
+        """
+        :return: Value causing a transition (state.active tells which), None if there is none
+        """
+        value = sample[self._index]
+        if state.active:
+            if (value <= self.clear_at) if self.rising else (value >= self.clear_at):
+                state.active = False
+                return value
+        elif (value >= self.raise_at) if self.rising else (value <= self.raise_at):
+            state.active = True
+            return value
+        return None
+
+
+class SlopeRule:
+    """Alert while a field changes faster than a rate, measured over a running time window"""
+
+    def __init__(self, name: str, rate: float, window: float = 300.0, clear_rate: Optional[float] = None,
+                 field: str = "co2", min_samples: int = 3):
+        """
+        Constructor
+        :param name: Name of the rule, reported in the alerts
+        :param rate: Slope raising the alert, in units per minute (e.g. ppm/min); negative for a falling field
+        :param window: Seconds of samples the slope is fitted on
+        :param clear_rate: Slope clearing the alert, rate / 2 if None
+        :param field: "co2", "temperature" or "humidity"
+        :param min_samples: Samples needed in the window before the slope is judged
+        """
+        if rate == 0:
+            raise ValueError("rate must not be 0")
+        self.name = name
+        self.rate = rate
+        self.clear_rate = clear_rate if clear_rate is not None else rate / 2
+        self.window = window
+        self.min_samples = max(2, min_samples)
+        self._index = FIELDS[field]
+
+    def evaluate(self, state: _State, timestamp: float, sample: tuple):
+        """
+        :return: Slope causing a transition (state.active tells which), None if there is none
+        """
+        y = sample[self._index]
+        points = state.points
+        if points is None:
+            points = state.points = deque()
+        if not points:
+            state.base = timestamp
+        t = timestamp - state.base
+        if t > 16 * self.window:
+            # Times are kept relative to a recent base so the running sums keep their precision: rebase
+            # and resum once every 16 windows, O(1) per sample on average
+            shift = points[0][0]
+            state.base += shift
+            t -= shift
+            points = state.points = deque((pt - shift, py) for pt, py in points)
+            state.n = len(points)
+            state.st = sum(pt for pt, _ in points)
+            state.sy = sum(py for _, py in points)
+            state.stt = sum(pt * pt for pt, _ in points)
+            state.sty = sum(pt * py for pt, py in points)
+        points.append((t, y))
+        state.n += 1
+        state.st += t
+        state.sy += y
+        state.stt += t * t
+        state.sty += t * y
+        horizon = t - self.window
+        while points[0][0] < horizon:
+            old_t, old_y = points.popleft()
+            state.n -= 1
+            state.st -= old_t
+            state.sy -= old_y
+            state.stt -= old_t * old_t
+            state.sty -= old_t * old_y
+        n = state.n
+        if n < self.min_samples:
+            return None
+        sxx = state.stt - state.st * state.st / n
+        if sxx <= 0:
+            return None
+        slope = (state.sty - state.st * state.sy / n) / sxx * 60.0
+        rising = self.rate > 0
+        if state.active:
+            if (slope <= self.clear_rate) if rising else (slope >= self.clear_rate):
+                state.active = False
+                return slope
+        elif (slope >= self.rate) if rising else (slope <= self.rate):
+            state.active = True
+            return slope
+        return None
+
+
+class StatusRule:
+    """Alert while some bits of the status word are set"""
+
+    def __init__(self, name: str, mask: int):
+        """
+        Constructor
+        :param name: Name of the rule, reported in the alerts
+        :param mask: Bits of sensor_status watched, e.g. 0x4000 for testing mode
+        """
+        self.name = name
+        self.mask = mask
+
+    def evaluate(self, state: _State, timestamp: float, sample: tuple):
+        """
+        :return: Masked status bits causing a transition (state.active tells which), None if there is none
+        """
+        bits = sample[3] & self.mask
+        if (bits != 0) != state.active:
+            state.active = bits != 0
+            return bits
+        return None
+
+
+class StaleRule:
+    """Alert while a sensor has delivered no sample for a timeout, checked by STCC4AlertEngine.check()"""
+
+    def __init__(self, name: str, timeout: float):
+        """
+        Constructor
+        :param name: Name of the rule, reported in the alerts; one rule for every sensor is cheaper to check
+        than one rule per sensor
+        :param timeout: Seconds without a sample before the alert is raised; it is cleared by the next sample
+        """
+        self.name = name
+        self.timeout = timeout
+        # Sensor -> time of its last sample, oldest first, and the same for the sensors whose alert is raised
+        self._last = OrderedDict()
+        self._stale = {}
+
+    def seen(self, sensor: Hashable, timestamp: float):
+        """
+        Record a sample of a sensor
+        :return: Seconds since the previous sample if the sensor was stale, None otherwise
+        """
+        last = self._last
+        previous = self._stale.pop(sensor, None)
+        last[sensor] = timestamp
+        last.move_to_end(sensor)
+        if previous is None:
+            return None
+        return timestamp - previous
+
+    def expire(self, now: float) -> List[Tuple[Hashable, float]]:
+        """
+        Move the sensors whose last sample is older than the timeout to the stale ones
+        :return: List of (sensor, seconds since its last sample) of the sensors that became stale
+        """
+        last = self._last
+        expired = []
+        while last:
+            sensor, timestamp = next(iter(last.items()))
+            if now - timestamp < self.timeout:
+                break
+            del last[sensor]
+            self._stale[sensor] = timestamp
+            expired.append((sensor, now - timestamp))
+        return expired
+
+
+class STCC4AlertEngine:
+    """Evaluates alert rules on the samples of many sensors"""
+
+    def __init__(self, callback: Optional[Callable[[STCC4Alert], object]] = None, queue=None):
+        """
+        Constructor
+        :param callback: Called with every STCC4Alert, None for no callback (more can be added with add_callback)
+        :param queue: queue.Queue (or any object with put_nowait) every STCC4Alert is put into, None for no queue
+        """
+        self._callbacks = [callback] if callback is not None else []
+        self._queue = queue
+        # Rules of every sensor, and rules of given sensors
+        self._common = []
+        self._own = {}
+        # Sensor -> (list of (rule, state) evaluated on its samples, list of its StaleRules)
+        self._evaluators = {}
+        self._stale_rules = []
+        self._active = {}
+        # Transitions not delivered yet, in the order they happened, and whether a thread is delivering them
+        self._pending = deque()
+        self._delivering = False
+        # Last exception raised by a callback or the queue, None if there was none
+        self.delivery_error = None
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[STCC4Alert], object]):
+        """
+        :param callback: Called with every STCC4Alert, in the order of the transitions, from a thread that fed
+        a sample or ran check(), without the lock of the engine held, so it may call the engine. An exception
+        it raises is kept in delivery_error and does not stop the delivery of the alert to the other callbacks.
+        """
+        self._callbacks.append(callback)
+
+    def add_rule(self, rule, sensors: Optional[Iterable[Hashable]] = None):
+        """
+        Add a rule
+        :param rule: ThresholdRule, SlopeRule, StatusRule or StaleRule
+        :param sensors: Names of the sensors the rule applies to, every sensor (also those seen later) if None.
+        The stale timeout of the given sensors starts now, so a sensor that never delivers a sample is reported too.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if isinstance(rule, StaleRule):
+                self._stale_rules.append(rule)
+            if sensors is None:
+                self._common.append(rule)
+                sensors = list(self._evaluators)
+            else:
+                sensors = list(sensors)
+                for sensor in sensors:
+                    self._own.setdefault(sensor, []).append(rule)
+            for sensor in sensors:
+                if isinstance(rule, StaleRule):
+                    rule.seen(sensor, now)
+                if sensor in self._evaluators:
+                    self._add_evaluator(self._evaluators[sensor], rule)
+
+    def feed(self, sensor: Hashable, sample: Optional[Tuple[int, float, float, int]], timestamp: Optional[float] = None):
+        """
+        Evaluate the rules of a sensor on one of its samples
+        :param sensor: Name of the sensor
+        :param sample: (co2_concentration, temperature, humidity, sensor_status) as returned by measurement(),
+        None (a failed read) is ignored, so a sensor failing all its reads becomes stale
+        :param timestamp: time.monotonic() of the sample, now if None
+        """
+        if sample is None:
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+        alerts = []
+        with self._lock:
+            entry = self._evaluators.get(sensor)
+            if entry is None:
+                entry = self._evaluators[sensor] = ([], [])
+                for rule in self._common + self._own.get(sensor, []):
+                    self._add_evaluator(entry, rule)
+            evaluators, stale_rules = entry
+            for rule, state in evaluators:
+                value = rule.evaluate(state, timestamp, sample)
+                if value is not None:
+                    alerts.append(self._transition(sensor, rule.name, state.active, timestamp, value))
+            for rule in stale_rules:
+                age = rule.seen(sensor, timestamp)
+                if age is not None:
+                    alerts.append(self._transition(sensor, rule.name, False, timestamp, age))
+        if alerts:
+            self._emit()
+
+    def feed_batch(self, batch):
+        """
+        Evaluate the samples of a poll, usable as the callback of STCC4Poller.run()
+        :param batch: DFRobot_STCC4_poller.STCC4Batch
+        """
+        for sensor, sample in batch.samples.items():
+            self.feed(sensor, sample, batch.timestamp)
+
+    def check(self, now: Optional[float] = None) -> int:
+        """
+        Raise the alerts of the sensors that stopped delivering samples; call it periodically.
+        Only the sensors that became stale are visited, the others cost nothing.
+        :param now: time.monotonic() of the check, now if None
+        :return: Number of alerts raised
+        """
+        if now is None:
+            now = time.monotonic()
+        alerts = []
+        with self._lock:
+            for rule in self._stale_rules:
+                for sensor, age in rule.expire(now):
+                    alerts.append(self._transition(sensor, rule.name, True, now, age))
+        if alerts:
+            self._emit()
+        return len(alerts)
+
+    def active(self) -> List[STCC4Alert]:
+        """
+        :return: The alerts currently raised, as the STCC4Alert that raised them
+        """
+        with self._lock:
+            return list(self._active.values())
+
+    @staticmethod
+    def _add_evaluator(entry: Tuple[list, list], rule):
+        if isinstance(rule, StaleRule):
+            entry[1].append(rule)
+        else:
+            entry[0].append((rule, _State()))
+
+    def _transition(self, sensor: Hashable, rule: str, active: bool, timestamp: float, value) -> STCC4Alert:
+        """Record a transition in the active alerts and queue it for delivery, called with the lock held"""
+        alert = STCC4Alert(sensor, rule, active, timestamp, value)
+        if active:
+            self._active[(sensor, rule)] = alert
+        else:
+            self._active.pop((sensor, rule), None)
+        self._pending.append(alert)
+        return alert
+
+    def _emit(self):
+        """
+        Deliver the pending alerts, called without the lock so callbacks may use the engine
+        One thread at a time delivers, in the order the transitions were recorded: an alert queued while another
+        thread is delivering is delivered by that thread, after the ones before it.
+        """
+        with self._lock:
+            if self._delivering:
+                return
+            self._delivering = True
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        self._delivering = False
+                        return
+                    alert = self._pending.popleft()
+                self._deliver(alert)
+        except BaseException:
+            with self._lock:
+                self._delivering = False
+            raise
+
+    def _deliver(self, alert: STCC4Alert):
+        queue = self._queue
+        if queue is not None:
+            try:
+                queue.put_nowait(alert)
+            except Exception as e:
+                self.delivery_error = e
+        for callback in self._callbacks:
+            try:
+                callback(alert)
+            except Exception as e:
+                self.delivery_error = e
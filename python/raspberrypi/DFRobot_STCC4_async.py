@@ -0,0 +1,276 @@
+"""!
+    * @file DFRobot_STCC4_async.py
+    * @brief asyncio variant of the DFRobot_STCC4_I2C driver
+    * @n Every method of the driver is mirrored as a coroutine. Bus transactions run in an executor,
+    * @n and the delays between them are awaited with asyncio.sleep, so the event loop is never blocked.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
+
+from DFRobot_STCC4 import DFRobot_STCC4_I2C, STCC4Measurement, _SampleSchedule
+
+
+class AsyncDFRobot_STCC4:
+    """asyncio implementation of DFRobot STCC4 CO2 sensor"""
+
+    def __init__(self, addr: int = DFRobot_STCC4_I2C.DEFAULT_I2C_ADDR, bus=DFRobot_STCC4_I2C.I2C_BUS,
+                 executor: Optional[Executor] = None, bus_lock: Optional[threading.Lock] = None):
+        """
+        Constructor
+        :param addr: I2C address of the sensor
+        :param bus: I2C bus number to open, an STCC4Bus, or an already opened smbus2.SMBus handle to share with other sensors
+        :param executor: Executor running the bus transactions, the default executor of the loop if None
+        :param bus_lock: Lock shared by all sensors of the same bus handle, a private lock if None
+        """
+        self.sensor = DFRobot_STCC4_I2C(addr, bus)
+        self._executor = executor
+        self._bus_lock = bus_lock if bus_lock is not None else threading.Lock()
+        # Multi-transaction commands of one sensor must not interleave
+        self._lock = asyncio.Lock()
+
+    @property
+    def last_error(self) -> int:
+        """Error code of the last read_measurement/measurement"""
+        return self.sensor.last_error
+
+    @property
+    def last_measurement(self) -> STCC4Measurement:
+        """Record decoded by the last successful read_measurement/measurement"""
+        return self.sensor.last_measurement
+
+    def calculation_crc(self, data: Union[list, tuple]) -> int:
+        """
+        Calculate CRC for the data
+        :param data: List or tuple of 16-bit integers
+        :return: Calculated CRC value
+        """
+        return self.sensor.calculation_crc(data)
+
+    def check_crc_frame(self, frame, length: Optional[int] = None) -> int:
+        """
+        Check every word/CRC triplet of a raw frame in one call
+        :return: Pass/fail mask, bit i is set if the CRC of word i matches.
+        """
+        return self.sensor.check_crc_frame(frame, length)
+
+    async def begin(self, temperature: Optional[float] = None, humidity: Optional[float] = None,
+                    pressure: Optional[int] = None, start: bool = True, verify: bool = True,
+                    deadline: float = 1.0) -> int:
+        """
+        Bring the sensor up without fixed sleeps, see DFRobot_STCC4_I2C.begin
+        Each transaction is a separate executor call and the waits between them are awaited,
+        so the bus is free for other sensors while this one starts.
+        :return: ERR_OK, ERR_IC_VERSION or ERR_DATA_WRITE
+        """
+        async with self._lock:
+            sensor = self.sensor
+            end = time.monotonic() + deadline
+            await self._io(sensor.wakeup)
+            await asyncio.sleep(sensor.WAKEUP_DELAY)
+            if verify:
+                # Poll until the sensor answers instead of sleeping a fixed time
+                while await self._io(sensor._read_id) is None:
+                    if time.monotonic() >= end:
+                        return sensor.ERR_IC_VERSION
+                    await asyncio.sleep(sensor.POLL_INTERVAL)
+            # Nothing is known of the state of a sensor being brought up
+            sensor.invalidate_compensation()
+            ok = True
+            if temperature is not None and humidity is not None:
+                words = sensor._rht_words(temperature, humidity)
+                ok = words is not None and await self._write_compensation(sensor.STCC4_SET_RHT_COMPENSATION, words)
+            if pressure is not None:
+                words = sensor._pressure_words(pressure)
+                ok = (words is not None and
+                      await self._write_compensation(sensor.STCC4_SET_PRESSURE_COMPENSATION, words)) and ok
+            if start:
+                # No START_STOP_DELAY: reads are refused until the first sample is ready anyway
+                ok = await self._io(sensor._start_continuous) and ok
+            return sensor.ERR_OK if ok else sensor.ERR_DATA_WRITE
+
+    @staticmethod
+    async def begin_many(sensors: Sequence["AsyncDFRobot_STCC4"], temperature: Optional[float] = None,
+                         humidity: Optional[float] = None, pressure: Optional[int] = None, start: bool = True,
+                         verify: bool = True, deadline: float = 1.0) -> List[int]:
+        """
+        Bring up several sensors as begin() does, concurrently, like DFRobot_STCC4_I2C.begin_many
+        :param sensors: Driver instances, sensors of a shared bus handle must share its bus_lock
+        :return: List of the begin() error codes, in the order of sensors
+        """
+        return list(await asyncio.gather(*(sensor.begin(temperature, humidity, pressure, start, verify, deadline)
+                                           for sensor in sensors)))
+
+    async def get_id(self) -> int:
+        """
+        Get sensor ID with CRC check
+        :return: 32-bit sensor ID, 0 if it could not be read
+        """
+        async with self._lock:
+            sensor = self.sensor
+            for i in range(sensor._get_id_attempts()):
+                id_value = await self._io(sensor._read_id)
+                if id_value is not None:
+                    return id_value
+                await asyncio.sleep(sensor.GET_ID_RETRY_DELAY)
+            return 0
+
+    async def start_measurement(self) -> bool:
+        """Start continuous measurement"""
+        async with self._lock:
+            if not await self._io(self.sensor._start_continuous):
+                return False
+            await asyncio.sleep(self.sensor.START_STOP_DELAY)
+            return True
+
+    async def stop_measurement(self) -> bool:
+        """Stop continuous measurement"""
+        async with self._lock:
+            if not await self._io(self.sensor._stop_continuous):
+                return False
+            await asyncio.sleep(self.sensor.START_STOP_DELAY)
+            return True
+
+    async def measurement(self) -> Optional[Tuple[int, float, float, int]]:
+        """
+        Read measurement data
+        :return: Tuple of (co2_concentration, temperature, humidity, sensor_status), None on error
+        """
+        async with self._lock:
+            return await self._io(self.sensor.measurement)
+
+    async def read_measurement(self, record: Optional[STCC4Measurement] = None) -> int:
+        """
+        Read measurement data into a preallocated record, checking the CRC of every word
+        :return: ERR_OK if successful, ERR_DATA_READ on bus error, ERR_CRC if the frame is corrupted.
+        """
+        async with self._lock:
+            return await self._io(self.sensor.read_measurement, record)
+
+    def is_sample_ready(self) -> bool:
+        """
+        Tell without any bus transaction whether a sample not read yet should be available
+        :return: True if a sample is due, False if not yet or if no measurement was started by this driver
+        """
+        return self.sensor.is_sample_ready()
+
+    async def wait_for_sample(self, timeout: Optional[float] = None) -> Optional[Tuple[int, float, float, int]]:
+        """
+        Wait for the next sample and read it as soon as it is available, the waits are awaited
+        :param timeout: Longest wait in seconds, 3 sampling intervals if None
+        :return: Tuple of (co2_concentration, temperature, humidity, sensor_status), None on timeout
+        """
+        sensor = self.sensor
+        schedule = sensor._schedule
+        if schedule is None:
+            schedule = sensor._schedule = _SampleSchedule(sensor.MEASUREMENT_INTERVAL, sensor.POLL_INTERVAL)
+        end = time.monotonic() + (timeout if timeout is not None else schedule.timeout)
+        while True:
+            delay = min(schedule.next_read, end) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with self._lock:
+                state, sample = await self._io(sensor._poll_sample, schedule)
+            if state == schedule.NEW:
+                return sample
+            if time.monotonic() >= end:
+                return None
+
+    async def stream(self, timeout: Optional[float] = None) -> AsyncIterator[Optional[Tuple[int, float, float, int]]]:
+        """
+        Start continuous measurement and yield every new sample as soon as the sensor has it
+        Stale frames are skipped, and the measurement is stopped when the generator is closed
+        (use contextlib.aclosing to close it as soon as the loop is left).
+        :param timeout: Seconds without a new sample after which None is yielded, 3 sampling intervals if None
+        :return: Async generator of (co2_concentration, temperature, humidity, sensor_status), None on timeout
+        """
+        async with self._lock:
+            if not await self._io(self.sensor._start_continuous):
+                return
+        try:
+            while True:
+                yield await self.wait_for_sample(timeout)
+        finally:
+            await self.stop_measurement()
+
+    async def set_rht_compensation(self, temperature: float, humidity: float) -> bool:
+        """Set temperature and humidity compensation"""
+        async with self._lock:
+            words = self.sensor._rht_words(temperature, humidity)
+            if words is None:
+                return False
+            return await self._write_compensation(self.sensor.STCC4_SET_RHT_COMPENSATION, words)
+
+    async def set_pressure_compensation(self, pressure: int) -> bool:
+        """Set pressure compensation"""
+        async with self._lock:
+            words = self.sensor._pressure_words(pressure)
+            if words is None:
+                return False
+            return await self._write_compensation(self.sensor.STCC4_SET_PRESSURE_COMPENSATION, words)
+
+    async def single_measurement(self) -> bool:
+        """Perform single shot measurement"""
+        async with self._lock:
+            return await self._io(self.sensor.single_measurement)
+
+    async def fall_asleep(self) -> bool:
+        """Put sensor to sleep"""
+        async with self._lock:
+            return await self._io(self.sensor.fall_asleep)
+
+    async def wakeup(self) -> bool:
+        """Wake up sensor"""
+        async with self._lock:
+            return await self._io(self.sensor.wakeup)
+
+    async def soft_reset(self) -> bool:
+        """Perform soft reset"""
+        async with self._lock:
+            return await self._io(self.sensor.soft_reset)
+
+    async def factory_reset(self) -> bool:
+        """Perform factory reset"""
+        async with self._lock:
+            return await self._io(self.sensor.factory_reset)
+
+    async def enable_testing_mode(self) -> bool:
+        """Enable testing mode"""
+        async with self._lock:
+            return await self._io(self.sensor.enable_testing_mode)
+
+    async def disable_testing_mode(self) -> bool:
+        """Disable testing mode"""
+        async with self._lock:
+            return await self._io(self.sensor.disable_testing_mode)
+
+    async def forced_recalibration(self, target_ppm: int) -> Optional[int]:
+        """Perform forced recalibration"""
+        async with self._lock:
+            if not await self._io(self.sensor._write_frc, target_ppm):
+                return None
+            await asyncio.sleep(self.sensor.FRC_DELAY)
+            return await self._io(self.sensor._read_frc_correction)
+
+    async def _write_compensation(self, cmd: int, words: list) -> bool:
+        """Write a compensation unless the sensor already has it, without leaving the loop if so"""
+        if not self.sensor._compensation_pending(cmd, words):
+            return True
+        return await self._io(self.sensor._write_compensation, cmd, words)
+
+    def _locked(self, func, *args):
+        with self._bus_lock:
+            return func(*args)
+
+    def _io(self, func, *args):
+        """Run one bus transaction of the driver in the executor"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, self._locked, func, *args)
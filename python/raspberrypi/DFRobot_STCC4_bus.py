@@ -0,0 +1,196 @@
+"""!
+    * @file DFRobot_STCC4_bus.py
+    * @brief Bus backends of the STCC4 driver besides smbus2: raw Linux i2c-dev, and TCA9548A multiplexer channels
+    * @n LinuxI2CBus talks to /dev/i2c-N through the I2C_RDWR ioctl directly. Its i2c_msg array and ioctl
+    * @n argument are ctypes structures allocated once; a transaction fills them in and makes one system call,
+    * @n and smbus2 is not needed. The only objects made per transaction are the small c_char views giving the
+    * @n address of the caller's buffers, which are not kept so the buffers are not pinned after the call.
+    * @n TCA9548A puts sensors behind a TCA9548A-style I2C multiplexer, so many STCC4 can share address 0x64.
+    * @n Each channel is an STCC4Bus; the multiplexer remembers the channel it last selected and only writes its
+    * @n control byte when a transaction is for another channel.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import ctypes
+import fcntl
+import os
+import threading
+from typing import Optional, Union
+
+from DFRobot_STCC4 import I2C_M_RD, STCC4Bus
+
+I2C_RDWR = 0x0707  # ioctl of combined transactions (linux/i2c-dev.h)
+
+
+class _I2CMsg(ctypes.Structure):
+    """struct i2c_msg (linux/i2c.h)"""
+    _fields_ = [("addr", ctypes.c_uint16), ("flags", ctypes.c_uint16), ("len", ctypes.c_uint16),
+                ("buf", ctypes.c_void_p)]
+
+
+class _I2CRdwrData(ctypes.Structure):
+    """struct i2c_rdwr_ioctl_data (linux/i2c-dev.h)"""
+    _fields_ = [("msgs", ctypes.POINTER(_I2CMsg)), ("nmsgs", ctypes.c_uint32)]
+
+
+class LinuxI2CBus(STCC4Bus):
+    """STCC4Bus on a Linux i2c-dev device, every transaction is a single I2C_RDWR ioctl"""
+
+    def __init__(self, bus: Union[int, str] = 1):
+        """
+        Constructor
+        :param bus: I2C bus number, or the path of the device (e.g. "/dev/i2c-1")
+        :raise OSError: if the device cannot be opened
+        """
+        self.path = "/dev/i2c-%d" % bus if isinstance(bus, int) else bus
+        self._fd = os.open(self.path, os.O_RDWR)
+        self._msgs = (_I2CMsg * 2)()
+        # Kept so that no wrapper object is created per transaction
+        self._write_msg = self._msgs[0]
+        self._read_msg = self._msgs[1]
+        self._read_msg.flags = I2C_M_RD
+        self._data = _I2CRdwrData(ctypes.cast(self._msgs, ctypes.POINTER(_I2CMsg)), 0)
+        # The shared structures are filled in and passed to the ioctl as one step: the bus may be used directly
+        # and as the parent of a TCA9548A, whose channels are serialized by another lock
+        self._lock = threading.Lock()
+
+    def write(self, addr: int, buf: bytearray, length: int) -> None:
+        # A c_char view of the first byte gives the address of buf without making an array type per call;
+        # it pins buf during the call only, nothing is kept of the caller's buffers
+        view = ctypes.c_char.from_buffer(buf)
+        with self._lock:
+            msg = self._write_msg
+            msg.addr = addr
+            msg.len = length
+            msg.buf = ctypes.addressof(view)
+            self._data.nmsgs = 1
+            fcntl.ioctl(self._fd, I2C_RDWR, self._data)
+
+    def write_read(self, addr: int, wbuf: bytearray, wlength: int, rbuf: bytearray, rlength: int) -> None:
+        wview = ctypes.c_char.from_buffer(wbuf)
+        rview = ctypes.c_char.from_buffer(rbuf)
+        with self._lock:
+            msg = self._write_msg
+            msg.addr = addr
+            msg.len = wlength
+            msg.buf = ctypes.addressof(wview)
+            msg = self._read_msg
+            msg.addr = addr
+            msg.len = rlength
+            msg.buf = ctypes.addressof(rview)
+            self._data.nmsgs = 2
+            fcntl.ioctl(self._fd, I2C_RDWR, self._data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class TCA9548AChannel(STCC4Bus):
+    """
+    One downstream channel of a TCA9548A, made by TCA9548A.channel()
+    lock : Lock of the multiplexer, shared by all its channels; STCC4Poller serializes the channels with it,
+           so they are served one after the other and each poll selects every channel only once
+    """
+
+    def __init__(self, mux: "TCA9548A", index: int):
+        self.mux = mux
+        self.index = index
+        self.lock = mux.lock
+
+    def write(self, addr: int, buf: bytearray, length: int) -> None:
+        mux = self.mux
+        with mux.lock:
+            # An error of the sensor itself (e.g. the NACK of a sample not ready yet) keeps the channel selected,
+            # only a failed control write of the multiplexer makes select() write it again
+            mux.select(self.index)
+            mux.parent.write(addr, buf, length)
+
+    def write_read(self, addr: int, wbuf: bytearray, wlength: int, rbuf: bytearray, rlength: int) -> None:
+        mux = self.mux
+        with mux.lock:
+            mux.select(self.index)
+            mux.parent.write_read(addr, wbuf, wlength, rbuf, rlength)
+
+    def close(self) -> None:
+        """The bus is released by the multiplexer"""
+        pass
+
+    def __repr__(self) -> str:
+        return "TCA9548AChannel(0x%02X, %d)" % (self.mux.addr, self.index)
+
+
+class TCA9548A:
+    """TCA9548A-style I2C multiplexer: 8 downstream channels, one connected at a time"""
+
+    DEFAULT_ADDR = 0x70
+    CHANNELS = 8
+
+    def __init__(self, parent: STCC4Bus, addr: int = DEFAULT_ADDR, owned: bool = False):
+        """
+        Constructor
+        :param parent: Upstream bus of the multiplexer, e.g. LinuxI2CBus(1) or SMBus2Bus(1)
+        :param addr: I2C address of the multiplexer (0x70 - 0x77)
+        :param owned: Close the parent bus in close()
+        """
+        self.parent = parent
+        self.addr = addr
+        self.owned = owned
+        # Reentrant, so a poller holding it can run the transactions of a channel
+        self.lock = threading.RLock()
+        # Number of control byte writes, to check that the cache saves them
+        self.selects = 0
+        self._selected = None
+        self._control = bytearray(1)
+        self._channels = [TCA9548AChannel(self, index) for index in range(self.CHANNELS)]
+
+    def channel(self, index: int) -> TCA9548AChannel:
+        """
+        :param index: Channel index, 0 - 7
+        :return: The channel as an STCC4Bus, to give to DFRobot_STCC4_I2C or STCC4Poller.add_sensor
+        """
+        return self._channels[index]
+
+    @property
+    def selected(self) -> Optional[int]:
+        """Channel the multiplexer is known to have connected, None if unknown"""
+        return self._selected
+
+    def select(self, index: Optional[int]):
+        """
+        Connect a channel, unless it is the one already connected
+        :param index: Channel index, None to disconnect all channels
+        :raise OSError: if the multiplexer does not acknowledge
+        """
+        if index == self._selected and index is not None:
+            return
+        with self.lock:
+            self._control[0] = 0 if index is None else 1 << index
+            try:
+                self.parent.write(self.addr, self._control, 1)
+            except OSError:
+                self._selected = None
+                raise
+            self._selected = index
+            self.selects += 1
+
+    def invalidate(self):
+        """Forget the connected channel, e.g. after the multiplexer was reset, so the next transaction selects it"""
+        self._selected = None
+
+    def close(self):
+        """Disconnect all channels, and close the parent bus if owned"""
+        with self.lock:
+            try:
+                self.select(None)
+            except OSError:
+                pass
+            if self.owned:
+                self.parent.close()
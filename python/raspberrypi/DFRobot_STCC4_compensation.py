@@ -0,0 +1,240 @@
+"""!
+    * @file DFRobot_STCC4_compensation.py
+    * @brief Automatic temperature, humidity and pressure compensation of STCC4 sensors from external sources
+    * @n Each quantity is read from pluggable source callables (another sensor, a file, a queue fed by a message
+    * @n client...), smoothed with an exponential moving average and clamped to the range accepted by the sensor.
+    * @n The smoothed values are pushed to all registered sensors in one batch at a fixed rate, through the
+    * @n compensation cache of the driver, so a value that did not change costs no bus transaction.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+from DFRobot_STCC4 import DFRobot_STCC4_I2C
+
+TEMPERATURE = "temperature"
+HUMIDITY = "humidity"
+PRESSURE = "pressure"
+
+# Range accepted by the sensor for each quantity
+RANGES = {
+    TEMPERATURE: (10.0, 40.0),
+    HUMIDITY: (20.0, 80.0),
+    PRESSURE: (400.0, 1100.0),
+}
+
+
+def file_source(path: str) -> Callable[[], Optional[float]]:
+    """
+    Source reading a number from a text file, e.g. a sysfs attribute or a file written by another process
+    :param path: Path of the file
+    :return: Source callable, returning None while the file is missing or does not hold a number
+    """
+    def read() -> Optional[float]:
+        try:
+            with open(path) as f:
+                return float(f.read().strip())
+        except (OSError, ValueError):
+            return None
+    return read
+
+
+def queue_source(q: queue.Queue) -> Callable[[], Optional[float]]:
+    """
+    Source taking the values put into a queue, e.g. by a message client thread
+    :param q: Queue of numbers
+    :return: Source callable, returning the newest value of the queue, None if it is empty
+    """
+    def read() -> Optional[float]:
+        value = None
+        while True:
+            try:
+                value = q.get_nowait()
+            except queue.Empty:
+                return value
+    return read
+
+
+class _Channel:
+    """Sources, smoothed value and range of one quantity"""
+
+    __slots__ = ("sources", "low", "high", "alpha", "value", "error")
+
+    def __init__(self, low: float, high: float, alpha: float):
+        self.sources = []
+        self.low = low
+        self.high = high
+        self.alpha = alpha
+        self.value = None
+        # Exception raised by a source at the last sample, None if none raised
+        self.error = None
+
+    def sample(self) -> Optional[float]:
+        """Read the sources and fold their mean into the moving average"""
+        readings = []
+        self.error = None
+        for source in self.sources:
+            try:
+                reading = source()
+            except Exception as e:
+                self.error = e
+                reading = None
+            if reading is not None:
+                readings.append(float(reading))
+        if readings:
+            mean = sum(readings) / len(readings)
+            if self.value is None:
+                self.value = mean
+            else:
+                self.value += self.alpha * (mean - self.value)
+        return self.value
+
+    def clamped(self) -> Optional[float]:
+        if self.value is None:
+            return None
+        return min(self.high, max(self.low, self.value))
+
+
+class STCC4CompensationPipeline:
+    """Compensation pipeline feeding any number of STCC4 sensors"""
+
+    def __init__(self, push_interval: float = 60.0, sample_interval: Optional[float] = None, alpha: float = 0.3):
+        """
+        Constructor
+        :param push_interval: Time in seconds between two pushes to the sensors
+        :param sample_interval: Time in seconds between two reads of the sources, push_interval if None
+        :param alpha: Weight of a new reading in the moving average (0 to 1), 1 disables the smoothing
+        """
+        self.push_interval = push_interval
+        self.sample_interval = sample_interval if sample_interval is not None else push_interval
+        self._channels = {name: _Channel(low, high, alpha) for name, (low, high) in RANGES.items()}
+        self._sensors = []
+        self._pollers = []
+        self.last_push = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def add_source(self, quantity: str, source: Callable[[], Optional[float]]):
+        """
+        Add a source of one quantity, the readings of all sources of a quantity are averaged
+        :param quantity: TEMPERATURE (degrees Celsius), HUMIDITY (%RH) or PRESSURE (hPa)
+        :param source: Callable returning the current value, or None if it has none (its exceptions skip the
+        reading and are kept in errors)
+        """
+        if quantity not in self._channels:
+            raise ValueError("unknown quantity %r" % (quantity,))
+        self._channels[quantity].sources.append(source)
+
+    def add_sensor(self, sensor: DFRobot_STCC4_I2C, name: Optional[Hashable] = None):
+        """
+        Push the compensation to a sensor
+        A sensor also read from another thread must be added through its poller with add_poller instead.
+        :param sensor: Driver instance of the sensor
+        :param name: Key of the sensor in last_push, its index if None
+        """
+        if name is None:
+            name = len(self._sensors)
+        self._sensors.append((name, sensor))
+
+    def add_poller(self, poller):
+        """
+        Push the compensation to every sensor of a DFRobot_STCC4_poller.STCC4Poller,
+        holding the lock of each bus and serving the buses in parallel
+        :param poller: The poller, sensors added to it later are included
+        """
+        self._pollers.append(poller)
+
+    def value(self, quantity: str) -> Optional[float]:
+        """
+        :param quantity: TEMPERATURE, HUMIDITY or PRESSURE
+        :return: Smoothed and clamped value pushed for the quantity, None while no source gave a value
+        """
+        return self._channels[quantity].clamped()
+
+    @property
+    def errors(self) -> Dict[str, Exception]:
+        """Quantity -> exception raised by one of its sources at the last sample, for the quantities whose sources raised"""
+        return {name: channel.error for name, channel in self._channels.items() if channel.error is not None}
+
+    def sample(self):
+        """Read all sources once"""
+        for channel in self._channels.values():
+            channel.sample()
+
+    def push(self) -> Dict[Hashable, bool]:
+        """
+        Write the current compensation to all sensors; unchanged values are skipped by the driver
+        :return: Dict of sensor name -> True if every compensation was written (or already set), also kept in last_push
+        """
+        temperature = self.value(TEMPERATURE)
+        humidity = self.value(HUMIDITY)
+        pressure = self.value(PRESSURE)
+        if pressure is not None:
+            pressure = int(round(pressure))
+
+        def apply(sensor: DFRobot_STCC4_I2C) -> bool:
+            ok = True
+            if temperature is not None and humidity is not None:
+                ok = sensor.set_rht_compensation(temperature, humidity) and ok
+            if pressure is not None:
+                ok = sensor.set_pressure_compensation(pressure) and ok
+            return ok
+
+        results = {}
+        for name, sensor in self._sensors:
+            results[name] = apply(sensor)
+        for poller in self._pollers:
+            results.update(poller.broadcast(apply))
+        self.last_push = results
+        return results
+
+    def run(self, count: Optional[int] = None):
+        """
+        Sample the sources every sample_interval and push every push_interval, on a drift-free monotonic schedule
+        The first push happens after the first sample.
+        :param count: Number of pushes, until stop() if None
+        """
+        now = time.monotonic()
+        next_sample = next_push = now
+        done = 0
+        while (count is None or done < count) and not self._stop.is_set():
+            now = time.monotonic()
+            if now >= next_sample:
+                self.sample()
+                next_sample += self.sample_interval
+                if next_sample < now:
+                    next_sample = now
+            if now >= next_push:
+                self.push()
+                done += 1
+                if done == count:
+                    break
+                next_push += self.push_interval
+                if next_push < now:
+                    next_push = now
+            delay = min(next_sample, next_push) - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+
+    def start(self):
+        """Run the pipeline in a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="stcc4-compensation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread started by start()"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
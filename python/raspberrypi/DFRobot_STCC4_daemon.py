@@ -0,0 +1,355 @@
+"""!
+    * @file DFRobot_STCC4_daemon.py
+    * @brief Sensor daemon publishing STCC4 samples to other processes through shared memory
+    * @n STCC4Daemon owns the sensors: it brings them up once, polls them, and writes each new sample into a
+    * @n multiprocessing.shared_memory block, one slot per sensor guarded by a seqlock and a CRC-32 of the sample
+    * @n (Python has no memory barrier to order the stores for another process). STCC4Client reads a slot
+    * @n lock-free with the same measurement() as the driver, so any number of local processes can read the
+    * @n latest samples at any rate without a single bus transaction and without fighting over the sensors.
+    * @n Run as a script to start the daemon: python3 DFRobot_STCC4_daemon.py --sensor 1:0x64 --sensor 1:0x65
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import argparse
+import os
+import struct
+import time
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C, STCC4Measurement
+from DFRobot_STCC4_poller import STCC4Batch, STCC4Poller
+
+DEFAULT_NAME = "stcc4"
+
+MAGIC = b"STCC4SHM"
+VERSION = 2
+
+# magic, version, number of slots, pid of the daemon, heartbeat (time.monotonic() of its last poll), poll period
+_HEADER = struct.Struct("<8sHHIdd")
+_HEARTBEAT = struct.Struct("<d")
+HEARTBEAT_OFFSET = 16
+HEADER_SIZE = 64
+
+# A block whose daemon has not polled for this long (or 3 poll periods if longer) may be reclaimed
+STALE_AFTER = 10.0
+
+# Slot: sensor name, then the seqlock counter and the sample
+NAME_SIZE = 32
+_SEQ = struct.Struct("<I")
+# seq, CRC-32 of the payload seeded with seq, then the payload:
+# timestamp, temperature, humidity, co2, status, temp_raw, hum_raw, error, valid
+_DATA = struct.Struct("<IIdddHHHHHH")
+_PAYLOAD = struct.Struct("<dddHHHHHH")
+PAYLOAD_OFFSET = 8
+SLOT_SIZE = 96
+
+# Reads of a slot retried while the daemon is writing it
+READ_RETRIES = 1000
+
+
+# Blocks created by this process: registered with its resource tracker until they are unlinked
+_created = set()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block as a reader: only the daemon that created a block registers it with
+    its resource tracker and unlinks it
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block too; undo that, unless this process created it
+        shm = shared_memory.SharedMemory(name=name)
+        if shm._name not in _created:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _owner_alive(shm: shared_memory.SharedMemory) -> bool:
+    """
+    :return: True if the daemon of the block still runs: its process exists and it polled recently
+    """
+    magic, version, _, pid, heartbeat, interval = _HEADER.unpack_from(shm.buf, 0)
+    if magic != MAGIC:
+        raise FileExistsError("shared memory block %r exists and is not an STCC4 daemon block" % shm.name)
+    if pid == 0 or time.monotonic() - heartbeat > max(STALE_AFTER, 3 * interval):
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class STCC4Daemon:
+    """Owner of the sensors, publishing their samples to shared memory"""
+
+    def __init__(self, shm_name: str = DEFAULT_NAME, interval: float = DFRobot_STCC4.MEASUREMENT_INTERVAL / 2,
+                 poller: Optional[STCC4Poller] = None):
+        """
+        Constructor
+        :param shm_name: Name of the shared memory block, the clients attach to it by this name
+        :param interval: Poll period in seconds; below the sampling interval so each new sample is published quickly
+        :param poller: STCC4Poller holding the sensors, a new one if None
+        """
+        self.shm_name = shm_name
+        self.interval = interval
+        self.poller = poller if poller is not None else STCC4Poller()
+        self._shm = None
+        self._slots = {}
+        self._bus_labels = {}
+
+    def add_sensor(self, bus=DFRobot_STCC4_I2C.I2C_BUS, addr: int = DFRobot_STCC4_I2C.DEFAULT_I2C_ADDR,
+                   name: Optional[Hashable] = None) -> DFRobot_STCC4_I2C:
+        """
+        Add a sensor, before start()
+        :param bus: I2C bus number, or an already opened STCC4Bus or smbus2.SMBus handle
+        :param addr: I2C address of the sensor
+        :param name: Name of the sensor, its str() is what clients select; "bus:0xaddr" if None, the bus part telling apart
+        the buses and multiplexer channels of same-address sensors
+        :return: The driver instance of the sensor
+        """
+        if name is None:
+            name = "%s:0x%02X" % (self._bus_label(bus), addr)
+        return self.poller.add_sensor(bus, addr, name)
+
+    def _bus_label(self, bus) -> str:
+        """
+        Bus part of a default sensor name, so same-address sensors of different buses or channels get different names
+        :return: The bus number, the device path of a LinuxI2CBus, "parent/0xmux.channel" for a TCA9548A channel,
+        or "busN" for other handles, numbered in the order they are first used
+        """
+        if isinstance(bus, int):
+            return str(bus)
+        mux = getattr(bus, "mux", None)
+        if mux is not None:
+            return "%s/0x%02X.%d" % (self._bus_label(mux.parent), mux.addr, bus.index)
+        path = getattr(bus, "path", None)
+        if isinstance(path, str):
+            return path
+        label = self._bus_labels.get(bus)
+        if label is None:
+            label = self._bus_labels[bus] = "bus%d" % len(self._bus_labels)
+        return label
+
+    def start(self) -> Dict[Hashable, bool]:
+        """
+        Create the shared memory block and bring every sensor up: wakeup, get_id, start_measurement
+        A block of the same name left behind by a daemon that did not exit cleanly is reclaimed.
+        :return: Dict of sensor name -> True if the sensor answered with the right ID and started
+        :raise ValueError: if a sensor name is longer than NAME_SIZE bytes in UTF-8, or two names are the same
+        :raise FileExistsError: if a running daemon owns a block of the same name
+        """
+        names = self.poller.names
+        encoded_names = [str(name).encode() for name in names]
+        for name, encoded in zip(names, encoded_names):
+            if len(encoded) > NAME_SIZE:
+                raise ValueError("sensor name %r is longer than %d bytes" % (str(name), NAME_SIZE))
+        if len(set(encoded_names)) != len(encoded_names):
+            raise ValueError("sensor names are not unique: %r" % [str(name) for name in names])
+        size = HEADER_SIZE + SLOT_SIZE * len(names)
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.shm_name, create=True, size=size)
+        except FileExistsError:
+            existing = _attach(self.shm_name)
+            try:
+                alive = _owner_alive(existing)
+            finally:
+                existing.close()
+            if alive:
+                raise FileExistsError("shared memory block %r is owned by a running daemon" % self.shm_name)
+            # Reclaimed by this process: tracked while it unlinks the block, as its creator would
+            stale = shared_memory.SharedMemory(name=self.shm_name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=self.shm_name, create=True, size=size)
+        _created.add(self._shm._name)
+        buf = self._shm.buf
+        buf[:size] = bytes(size)
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, len(names), os.getpid(), time.monotonic(), self.interval)
+        for index, encoded in enumerate(encoded_names):
+            offset = HEADER_SIZE + index * SLOT_SIZE
+            buf[offset:offset + len(encoded)] = encoded
+            self._slots[names[index]] = offset + NAME_SIZE
+
+        return {name: code == DFRobot_STCC4.ERR_OK for name, code in self.poller.begin().items()}
+
+    def publish(self, batch: STCC4Batch):
+        """
+        Write a poll into the slots: new samples replace the previous ones, failed reads only update the error
+        A read refused only because the next sample is not ready yet leaves the slot as it is, so polling faster
+        than the sensor samples does not make the published error flicker between samples.
+        :param batch: Result of STCC4Poller.poll()
+        """
+        buf = self._shm.buf
+        for name, sample in batch.samples.items():
+            offset = self._slots[name]
+            seq = _SEQ.unpack_from(buf, offset)[0]
+            if sample is None:
+                error = batch.errors.get(name, DFRobot_STCC4.ERR_DATA_READ)
+                if error == DFRobot_STCC4.ERR_DATA_READ and self.poller.sensor(name)._refusal_expected():
+                    continue
+                current = _DATA.unpack_from(buf, offset)
+                values = current[2:9] + (error, current[10])
+            else:
+                record = self.poller.sensor(name).last_measurement
+                values = (record.timestamp, record.temperature, record.humidity, record.co2_concentration,
+                          record.sensor_status, record.temp_raw, record.hum_raw, DFRobot_STCC4.ERR_OK, 1)
+            # Odd while writing, so readers retry. Python gives no memory barrier between the stores, and another
+            # process on a weakly ordered CPU (ARM) may see them out of order: the CRC of the payload, seeded
+            # with the sequence number, lets the reader reject a slot whose stores it has not all seen.
+            seq = (seq + 2) & 0xFFFFFFFF
+            _SEQ.pack_into(buf, offset, (seq - 1) & 0xFFFFFFFF)
+            _DATA.pack_into(buf, offset, (seq - 1) & 0xFFFFFFFF, zlib.crc32(_PAYLOAD.pack(*values), seq), *values)
+            _SEQ.pack_into(buf, offset, seq)
+        _HEARTBEAT.pack_into(buf, HEARTBEAT_OFFSET, time.monotonic())
+
+    def run(self, count: Optional[int] = None):
+        """
+        Poll and publish every interval seconds
+        :param count: Number of polls, forever if None
+        """
+        self.poller.run(self.interval, self.publish, count)
+
+    def close(self):
+        """Stop the measurement of all sensors, remove the shared memory block and close the buses"""
+        if self._shm is not None:
+            self.poller.broadcast(lambda sensor: sensor.stop_measurement())
+            self._shm.close()
+            self._shm.unlink()
+            _created.discard(self._shm._name)
+            self._shm = None
+        self.poller.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class STCC4Client:
+    """Lock-free reader of one sensor published by STCC4Daemon"""
+
+    def __init__(self, sensor: Union[int, str] = 0, shm_name: str = DEFAULT_NAME, max_age: Optional[float] = None):
+        """
+        Constructor
+        :param sensor: Index of the sensor in the daemon, or its name
+        :param shm_name: Name of the shared memory block of the daemon
+        :param max_age: Samples older than this many seconds are not returned, no limit if None
+        :raise FileNotFoundError: if the daemon is not running
+        :raise KeyError: if the daemon has no such sensor
+        """
+        self.max_age = max_age
+        self.last_error = DFRobot_STCC4.ERR_OK
+        self.last_measurement = STCC4Measurement()
+        self._shm = _attach(shm_name)
+        buf = self._shm.buf
+        magic, version, slots = _HEADER.unpack_from(buf, 0)[:3]
+        if magic != MAGIC or version != VERSION:
+            self._shm.close()
+            raise ValueError("%r is not an STCC4 daemon block" % shm_name)
+        self.names = [bytes(buf[HEADER_SIZE + i * SLOT_SIZE:HEADER_SIZE + i * SLOT_SIZE + NAME_SIZE]).rstrip(b"\0").decode()
+                      for i in range(slots)]
+        if isinstance(sensor, str):
+            if sensor not in self.names:
+                raise KeyError(sensor)
+            sensor = self.names.index(sensor)
+        elif not 0 <= sensor < slots:
+            raise KeyError(sensor)
+        self._offset = HEADER_SIZE + sensor * SLOT_SIZE + NAME_SIZE
+
+    def read_measurement(self, record: Optional[STCC4Measurement] = None) -> int:
+        """
+        Copy the latest published sample into a record
+        :param record: Record to fill, last_measurement if None
+        :return: ERR_OK, or the error of the daemon's last read if no sample was published (or it is older than max_age).
+        The record is left untouched unless ERR_OK is returned.
+        """
+        buf = self._shm.buf
+        offset = self._offset
+        for _ in range(READ_RETRIES):
+            seq = _SEQ.unpack_from(buf, offset)[0]
+            if seq & 1:
+                continue
+            values = _DATA.unpack_from(buf, offset)
+            if (values[0] == seq and _SEQ.unpack_from(buf, offset)[0] == seq and
+                    zlib.crc32(buf[offset + PAYLOAD_OFFSET:offset + PAYLOAD_OFFSET + _PAYLOAD.size], seq) == values[1]):
+                break
+        else:
+            self.last_error = DFRobot_STCC4.ERR_DATA_READ
+            return self.last_error
+
+        _, _, timestamp, temperature, humidity, co2, status, temp_raw, hum_raw, error, valid = values
+        if not valid or (self.max_age is not None and time.monotonic() - timestamp > self.max_age):
+            self.last_error = error if error != DFRobot_STCC4.ERR_OK else DFRobot_STCC4.ERR_DATA_READ
+            return self.last_error
+        if record is None:
+            record = self.last_measurement
+        record.co2_concentration = co2
+        record.temperature = temperature
+        record.humidity = humidity
+        record.sensor_status = status
+        record.temp_raw = temp_raw
+        record.hum_raw = hum_raw
+        record.timestamp = timestamp
+        self.last_error = DFRobot_STCC4.ERR_OK
+        return self.last_error
+
+    def measurement(self) -> Optional[Tuple[int, float, float, int]]:
+        """
+        Latest published sample, like DFRobot_STCC4_I2C.measurement()
+        :return: Tuple of (co2_concentration, temperature, humidity, sensor_status), None if there is none
+        """
+        if self.read_measurement() != DFRobot_STCC4.ERR_OK:
+            return None
+        return self.last_measurement.as_tuple()
+
+    def close(self):
+        """Detach from the daemon's block"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="STCC4 daemon publishing the samples to shared memory")
+    parser.add_argument("--sensor", action="append", metavar="BUS:ADDR",
+                        help="sensor to own, e.g. 1:0x64 (repeatable, 1:0x64 if none)")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="name of the shared memory block")
+    parser.add_argument("--interval", type=float, default=DFRobot_STCC4.MEASUREMENT_INTERVAL / 2,
+                        help="poll period in seconds")
+    args = parser.parse_args(argv)
+
+    daemon = STCC4Daemon(args.name, args.interval)
+    for spec in args.sensor or ["1:0x64"]:
+        bus, addr = spec.split(":")
+        daemon.add_sensor(int(bus), int(addr, 0))
+    try:
+        for name, ok in daemon.start().items():
+            print("%s: %s" % (name, "started" if ok else "not answering"))
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""!
+    * @file DFRobot_STCC4_frames.py
+    * @brief Vectorized decoding of archived STCC4 measurement frames with NumPy
+    * @n decode_frames takes N concatenated 12-byte STCC4_READ_MEASURE frames (bytes, memoryview, NumPy array
+    * @n or np.memmap of an archive file) and decodes them all at once into a structured array, with the CRC of
+    * @n every word checked. It gives the same values as measurement(), millions of frames per second.
+    * @n NumPy is only needed by this module, the driver itself does not use it.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+from typing import Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from DFRobot_STCC4 import DFRobot_STCC4
+
+FRAME_SIZE = 12
+# Mask of a frame whose four words all have a valid CRC
+FRAME_VALID = 0x0F
+
+if np is not None:
+    # Layout of one raw frame: [MSB, LSB, CRC] per word
+    RAW_DTYPE = np.dtype([
+        ("co2", ">u2"), ("co2_crc", "u1"),
+        ("temp_raw", ">u2"), ("temp_crc", "u1"),
+        ("hum_raw", ">u2"), ("hum_crc", "u1"),
+        ("status", ">u2"), ("status_crc", "u1"),
+    ])
+
+    # One decoded frame, as measurement() plus the raw words and the CRC mask of check_crc_frame()
+    FRAME_DTYPE = np.dtype([
+        ("co2_concentration", "u2"),
+        ("temperature", "f8"),
+        ("humidity", "f8"),
+        ("sensor_status", "u2"),
+        ("temp_raw", "u2"),
+        ("hum_raw", "u2"),
+        ("crc_mask", "u1"),
+    ])
+
+_word_crc_table = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("decode_frames needs NumPy: pip install numpy")
+
+
+def _word_crc():
+    """CRC of every 16-bit word, built once from the byte table of the driver (64 KiB)"""
+    global _word_crc_table
+    if _word_crc_table is None:
+        table = np.frombuffer(DFRobot_STCC4._CRC8_TABLE, dtype=np.uint8)
+        words = np.arange(0x10000, dtype=np.uint32)
+        _word_crc_table = table[table[(words >> 8) ^ DFRobot_STCC4.CRC8_INIT] ^ (words & 0xFF)]
+    return _word_crc_table
+
+
+def raw_frames(buffer: Union[bytes, bytearray, memoryview, "np.ndarray"]) -> "np.ndarray":
+    """
+    View a buffer of concatenated frames as raw records, without copying
+    :param buffer: N * 12 bytes
+    :return: Array of N RAW_DTYPE records
+    :raise ValueError: if the length of buffer is not a multiple of 12
+    """
+    _require_numpy()
+    if isinstance(buffer, np.ndarray):
+        data = np.ascontiguousarray(buffer).reshape(-1).view(np.uint8)
+    else:
+        data = np.frombuffer(buffer, dtype=np.uint8)
+    if data.size % FRAME_SIZE:
+        raise ValueError("buffer length %d is not a multiple of %d" % (data.size, FRAME_SIZE))
+    return data.view(RAW_DTYPE)
+
+
+def crc_masks(buffer: Union[bytes, bytearray, memoryview, "np.ndarray"]) -> "np.ndarray":
+    """
+    Check the CRC of every word of every frame
+    :param buffer: N * 12 bytes
+    :return: uint8 array of N masks, bit i is set if the CRC of word i matches (FRAME_VALID if all do)
+    """
+    raw = raw_frames(buffer)
+    table = _word_crc()
+    mask = np.zeros(raw.size, dtype=np.uint8)
+    for bit, (word, crc) in enumerate((("co2", "co2_crc"), ("temp_raw", "temp_crc"),
+                                       ("hum_raw", "hum_crc"), ("status", "status_crc"))):
+        mask |= (table[raw[word]] == raw[crc]).astype(np.uint8) << bit
+    return mask
+
+
+def decode_frames(buffer: Union[bytes, bytearray, memoryview, "np.ndarray"], valid_only: bool = False) -> "np.ndarray":
+    """
+    Decode concatenated STCC4_READ_MEASURE frames
+    :param buffer: N * 12 bytes, e.g. an archive file opened with np.memmap(path, dtype=np.uint8, mode="r")
+    :param valid_only: Drop the frames with a wrong CRC instead of returning them with their crc_mask
+    :return: Array of FRAME_DTYPE records: co2_concentration, temperature, humidity, sensor_status,
+    temp_raw, hum_raw and crc_mask (FRAME_VALID if the frame is intact)
+    :raise ValueError: if the length of buffer is not a multiple of 12
+    """
+    raw = raw_frames(buffer)
+    mask = crc_masks(raw)
+    if valid_only:
+        raw = raw[mask == FRAME_VALID]
+        mask = mask[mask == FRAME_VALID]
+
+    out = np.empty(raw.size, dtype=FRAME_DTYPE)
+    out["co2_concentration"] = raw["co2"]
+    out["temp_raw"] = raw["temp_raw"]
+    out["hum_raw"] = raw["hum_raw"]
+    out["sensor_status"] = raw["status"]
+    out["crc_mask"] = mask
+    # Same formulas and operation order as the driver, so the values are bit-identical
+    out["temperature"] = -45.0 + ((175.0 * raw["temp_raw"]) / 65535.0)
+    out["humidity"] = -6.0 + ((125.0 * raw["hum_raw"]) / 65535.0)
+    return out
@@ -0,0 +1,187 @@
+"""!
+    * @file DFRobot_STCC4_history.py
+    * @brief Compact fixed-capacity history of STCC4 samples
+    * @n Samples are kept in preallocated typed arrays (one per field, 16 bytes per sample: timestamp f64,
+    * @n co2, raw temperature, raw humidity and status u16) used as a ring buffer, instead of lists of tuples.
+    * @n Append is O(1) and never allocates, the last N samples can be viewed without copying, and
+    * @n min/max/mean over the last N samples run at C speed on those views.
+    * @n Attach a history to a driver with set_history() to record every sample it reads.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+from array import array
+from typing import Optional, Tuple
+
+from DFRobot_STCC4 import STCC4Measurement
+
+FIELDS = ("timestamp", "co2", "temp_raw", "hum_raw", "status")
+
+# Fields derived from a raw one by the linear conversion of the driver: (raw field, scale, offset)
+_DERIVED = {
+    "temperature": ("temp_raw", 175.0 / 65535.0, -45.0),
+    "humidity": ("hum_raw", 125.0 / 65535.0, -6.0),
+}
+
+
+class STCC4History:
+    """Ring buffer of STCC4 samples, oldest first"""
+
+    BYTES_PER_SAMPLE = 16
+
+    def __init__(self, capacity: int):
+        """
+        Constructor
+        :param capacity: Number of samples kept, the oldest are overwritten when it is full
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._arrays = {
+            "timestamp": array("d", bytes(8 * capacity)),
+            "co2": array("H", bytes(2 * capacity)),
+            "temp_raw": array("H", bytes(2 * capacity)),
+            "hum_raw": array("H", bytes(2 * capacity)),
+            "status": array("H", bytes(2 * capacity)),
+        }
+        self._timestamp = self._arrays["timestamp"]
+        self._co2 = self._arrays["co2"]
+        self._temp = self._arrays["temp_raw"]
+        self._hum = self._arrays["hum_raw"]
+        self._status = self._arrays["status"]
+        # Index of the next write and number of samples held
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Forget all samples"""
+        self._head = 0
+        self._size = 0
+
+    def append(self, timestamp: float, co2: int, temp_raw: int, hum_raw: int, status: int):
+        """
+        Add a sample, overwriting the oldest one if the history is full
+        :param timestamp: time.monotonic() of the sample
+        :param co2: CO2 concentration in ppm
+        :param temp_raw: Raw 16-bit temperature word
+        :param hum_raw: Raw 16-bit humidity word
+        :param status: Sensor status word
+        """
+        i = self._head
+        self._timestamp[i] = timestamp
+        self._co2[i] = co2
+        self._temp[i] = temp_raw
+        self._hum[i] = hum_raw
+        self._status[i] = status
+        i += 1
+        self._head = 0 if i == self.capacity else i
+        if self._size < self.capacity:
+            self._size += 1
+
+    def append_measurement(self, record: STCC4Measurement):
+        """
+        Add the sample held by a driver record, e.g. sensor.last_measurement
+        :param record: Decoded measurement
+        """
+        self.append(record.timestamp, record.co2_concentration, record.temp_raw, record.hum_raw, record.sensor_status)
+
+    def __getitem__(self, index: int) -> Tuple[float, int, float, float, int]:
+        """
+        :param index: 0 for the oldest sample, -1 for the newest
+        :return: (timestamp, co2_concentration, temperature, humidity, sensor_status)
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        i = (self._head - self._size + index) % self.capacity
+        return (self._timestamp[i], self._co2[i],
+                -45.0 + ((175.0 * self._temp[i]) / 65535.0),
+                -6.0 + ((125.0 * self._hum[i]) / 65535.0),
+                self._status[i])
+
+    def views(self, field: str, last: Optional[int] = None) -> Tuple[memoryview, ...]:
+        """
+        Zero-copy views of the last samples of one field
+        :param field: One of FIELDS
+        :param last: Number of newest samples, all samples if None
+        :return: One or two memoryviews (two when the window wraps around the ring), oldest first
+        """
+        data = self._arrays[field]
+        n = self._window(last)
+        start = self._head - n
+        view = memoryview(data)
+        if start >= 0:
+            return (view[start:self._head],)
+        return (view[start + self.capacity:], view[:self._head])
+
+    def min(self, field: str, last: Optional[int] = None):
+        """
+        :param field: One of FIELDS, "temperature" or "humidity"
+        :param last: Number of newest samples, all samples if None
+        :return: Smallest value of the window, None if the history is empty
+        """
+        return self._extreme(min, field, last)
+
+    def max(self, field: str, last: Optional[int] = None):
+        """
+        :param field: One of FIELDS, "temperature" or "humidity"
+        :param last: Number of newest samples, all samples if None
+        :return: Largest value of the window, None if the history is empty
+        """
+        return self._extreme(max, field, last)
+
+    def mean(self, field: str, last: Optional[int] = None) -> Optional[float]:
+        """
+        :param field: One of FIELDS, "temperature" or "humidity"
+        :param last: Number of newest samples, all samples if None
+        :return: Mean value of the window, None if the history is empty
+        """
+        raw, scale, offset = _DERIVED.get(field, (field, 1.0, 0.0))
+        n = self._window(last)
+        if n == 0:
+            return None
+        total = 0
+        for view in self.views(raw, n):
+            total += sum(view)
+        return offset + scale * total / n
+
+    def count_since(self, timestamp: float) -> int:
+        """
+        Number of newest samples taken at or after a time, for time windows: history.mean("co2", history.count_since(t))
+        :param timestamp: time.monotonic() of the start of the window
+        :return: Number of samples, found by binary search
+        """
+        lo, hi = 0, self._size
+        base = self._head - self._size
+        capacity = self.capacity
+        ts = self._timestamp
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ts[(base + mid) % capacity] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._size - lo
+
+    def _window(self, last: Optional[int]) -> int:
+        if last is None or last > self._size:
+            return self._size
+        return max(0, last)
+
+    def _extreme(self, func, field: str, last: Optional[int]):
+        raw, scale, offset = _DERIVED.get(field, (field, None, None))
+        values = [func(view) for view in self.views(raw, last) if len(view)]
+        if not values:
+            return None
+        value = func(values)
+        if scale is None:
+            return value
+        return offset + scale * value
@@ -0,0 +1,337 @@
+"""!
+    * @file DFRobot_STCC4_log.py
+    * @brief Durable append-only log of STCC4 samples in memory-mapped segment files
+    * @n Each sample is a fixed-size 24-byte record (timestamp, sensor, co2, raw temperature, raw humidity, status)
+    * @n protected by a CRC-32 that doubles as its commit marker. Records are written straight into a memory-mapped,
+    * @n preallocated segment file, so an append is one struct.pack_into; the file is synced every sync_every records.
+    * @n Timestamps never decrease, so a time range is found by binary search on the fixed-size records; the segment
+    * @n table (first and last timestamp of each segment) is the sparse index selecting the segments to search.
+    * @n After a power loss, each segment is recovered on open from its last synced count plus a binary search for the
+    * @n end of the records written after it. Full segments are rotated, and old ones dropped or compacted.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from DFRobot_STCC4 import STCC4Measurement
+
+MAGIC = b"STCC4LOG"
+VERSION = 1
+
+# magic, version, record size, capacity, synced record count, first timestamp
+_HEADER = struct.Struct("<8sHHIIq")
+HEADER_SIZE = 64
+_COUNT_OFFSET = 16
+_FIRST_TS_OFFSET = 20
+
+# timestamp (ns), sensor, co2, temp_raw, hum_raw, status, reserved, then the CRC-32 of those 20 bytes
+_RECORD = struct.Struct("<qHHHHHH")
+_CRC = struct.Struct("<I")
+RECORD_SIZE = 24
+_TS = struct.Struct("<q")
+
+SEGMENT_SUFFIX = ".stcc4log"
+
+
+class _Segment:
+    """One segment file of the log"""
+
+    __slots__ = ("path", "seq", "capacity", "count", "first_ts", "last_ts")
+
+    def __init__(self, path: str, seq: int, capacity: int):
+        self.path = path
+        self.seq = seq
+        self.capacity = capacity
+        self.count = 0
+        self.first_ts = 0
+        self.last_ts = 0
+
+
+def _record_valid(mm, index: int) -> bool:
+    offset = HEADER_SIZE + index * RECORD_SIZE
+    return zlib.crc32(mm[offset:offset + 20]) == _CRC.unpack_from(mm, offset + 20)[0]
+
+
+def _record_ts(mm, index: int) -> int:
+    return _TS.unpack_from(mm, HEADER_SIZE + index * RECORD_SIZE)[0]
+
+
+class STCC4Log:
+    """Append-only sample log stored as a directory of segment files"""
+
+    def __init__(self, directory: str, segment_records: int = 65536, max_segments: Optional[int] = None,
+                 sync_every: int = 64, clock: Callable[[], int] = time.monotonic_ns):
+        """
+        Constructor, opens the log and recovers it if it was not closed properly
+        :param directory: Directory of the segment files, created if missing
+        :param segment_records: Records per segment file (24 bytes each)
+        :param max_segments: Number of segments kept, the oldest ones are deleted on rotation; all if None
+        :param sync_every: Records between two syncs of the segment to storage, at most this many are lost on power loss
+        :param clock: Time source in nanoseconds. A clock restarting from 0 at boot (the default time.monotonic_ns)
+        is offset so the logged timestamps keep increasing across restarts.
+        """
+        self.directory = directory
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        self.sync_every = sync_every
+        self.clock = clock
+        os.makedirs(directory, exist_ok=True)
+
+        self._segments = []
+        self._file = None
+        self._mm = None
+        self._unsynced = 0
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(SEGMENT_SUFFIX):
+                segment = self._recover(os.path.join(directory, name), int(name[:-len(SEGMENT_SUFFIX)]))
+                if segment is not None:
+                    self._segments.append(segment)
+        self._segments.sort(key=lambda segment: segment.seq)
+
+        last_ts = self._segments[-1].last_ts if self._segments and self._segments[-1].count else 0
+        self._last_ts = last_ts
+        self._offset = max(0, last_ts - clock())
+        if self._segments and self._segments[-1].count < self._segments[-1].capacity:
+            self._map(self._segments[-1])
+        else:
+            self._rotate()
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self._segments)
+
+    @property
+    def segments(self) -> List[Tuple[str, int, int, int]]:
+        """Sparse index of the log: list of (path, record count, first timestamp, last timestamp), oldest first"""
+        return [(segment.path, segment.count, segment.first_ts, segment.last_ts) for segment in self._segments]
+
+    def append(self, co2: int, temp_raw: int, hum_raw: int, status: int, sensor: int = 0) -> int:
+        """
+        Append one sample, stamped with the clock of the log
+        :param co2: CO2 concentration in ppm
+        :param temp_raw: Raw 16-bit temperature word
+        :param hum_raw: Raw 16-bit humidity word
+        :param status: Sensor status word
+        :param sensor: Number of the sensor, 0 to 65535
+        :return: Timestamp of the record in nanoseconds
+        :raise ValueError: if the log is closed
+        """
+        if self._mm is None:
+            raise ValueError("log is closed")
+        segment = self._segments[-1]
+        if segment.count == segment.capacity:
+            self._rotate()
+            segment = self._segments[-1]
+        ts = self.clock() + self._offset
+        if ts < self._last_ts:
+            ts = self._last_ts
+        mm = self._mm
+        offset = HEADER_SIZE + segment.count * RECORD_SIZE
+        _RECORD.pack_into(mm, offset, ts, sensor, co2, temp_raw, hum_raw, status, 0)
+        _CRC.pack_into(mm, offset + 20, zlib.crc32(mm[offset:offset + 20]))
+        if segment.count == 0:
+            segment.first_ts = ts
+            _TS.pack_into(mm, _FIRST_TS_OFFSET, ts)
+        segment.count += 1
+        segment.last_ts = self._last_ts = ts
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        return ts
+
+    def append_measurement(self, record: STCC4Measurement, sensor: int = 0) -> int:
+        """
+        Append the sample held by a driver record, e.g. sensor.last_measurement
+        :param record: Decoded measurement
+        :param sensor: Number of the sensor
+        :return: Timestamp of the record in nanoseconds
+        """
+        return self.append(record.co2_concentration, record.temp_raw, record.hum_raw, record.sensor_status, sensor)
+
+    def sync(self):
+        """Write the appended records to storage, then the record count that marks them as committed"""
+        if self._mm is None:
+            return
+        segment = self._segments[-1]
+        self._mm.flush()
+        struct.pack_into("<I", self._mm, _COUNT_OFFSET, segment.count)
+        self._mm.flush(0, min(mmap.PAGESIZE, len(self._mm)))
+        self._unsynced = 0
+
+    def query(self, start: Optional[int] = None, end: Optional[int] = None,
+              sensor: Optional[int] = None) -> Iterator[Tuple[int, int, int, int, int, int]]:
+        """
+        Records with start <= timestamp <= end, read from the segments one at a time without loading them
+        :param start: First timestamp in nanoseconds, from the oldest record if None
+        :param end: Last timestamp in nanoseconds, up to the newest record if None
+        :param sensor: Only the records of this sensor, all sensors if None
+        :return: Iterator of (timestamp, sensor, co2, temp_raw, hum_raw, status), oldest first
+        """
+        for segment in list(self._segments):
+            if not segment.count:
+                continue
+            if (start is not None and segment.last_ts < start) or (end is not None and segment.first_ts > end):
+                continue
+            active = segment is self._segments[-1] and self._mm is not None
+            if active:
+                mm, f = self._mm, None
+            else:
+                f = open(segment.path, "rb")
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                index = 0 if start is None else self._lower_bound(mm, segment.count, start)
+                count = segment.count
+                while index < count:
+                    ts, sensor_id, co2, temp_raw, hum_raw, status, _ = _RECORD.unpack_from(
+                        mm, HEADER_SIZE + index * RECORD_SIZE)
+                    if end is not None and ts > end:
+                        return
+                    if sensor is None or sensor_id == sensor:
+                        yield (ts, sensor_id, co2, temp_raw, hum_raw, status)
+                    index += 1
+            finally:
+                if not active:
+                    mm.close()
+                    f.close()
+
+    def compact(self, before: int):
+        """
+        Drop the records older than a timestamp: whole segments are deleted, and the segment holding the
+        timestamp is rewritten with its newer records only (through a new file renamed over the old one)
+        The segment being appended to is never rewritten.
+        :param before: Timestamp in nanoseconds
+        """
+        kept = []
+        for segment in self._segments:
+            active = segment is self._segments[-1]
+            if not active and segment.count and segment.last_ts < before:
+                os.remove(segment.path)
+                continue
+            if not active and segment.count and segment.first_ts < before:
+                self._rewrite(segment, before)
+            kept.append(segment)
+        self._segments = kept
+
+    def close(self):
+        """Sync and close the log"""
+        if self._mm is not None:
+            self.sync()
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _rotate(self):
+        """Close the current segment and start a new one"""
+        if self._mm is not None:
+            self.close()
+        seq = self._segments[-1].seq + 1 if self._segments else 0
+        path = os.path.join(self.directory, "%010d%s" % (seq, SEGMENT_SUFFIX))
+        self._create(path, self.segment_records)
+        segment = _Segment(path, seq, self.segment_records)
+        self._segments.append(segment)
+        self._map(segment)
+        if self.max_segments is not None:
+            while len(self._segments) > self.max_segments:
+                os.remove(self._segments.pop(0).path)
+
+    @staticmethod
+    def _create(path: str, capacity: int, first_ts: int = 0, count: int = 0) -> None:
+        with open(path, "wb") as f:
+            f.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+            f.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE, capacity, count, first_ts))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _map(self, segment: _Segment):
+        self._file = open(segment.path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._unsynced = 0
+
+    def _recover(self, path: str, seq: int) -> Optional[_Segment]:
+        """
+        Find the records of a segment: the synced count is trusted, the end of the records written after it
+        is found by binary search, then those few records are checked one by one
+        :return: The segment, None if the file is not a segment of this log
+        """
+        with open(path, "r+b") as f:
+            if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                return None
+            mm = mmap.mmap(f.fileno(), 0)
+            try:
+                magic, version, record_size, capacity, count, first_ts = _HEADER.unpack_from(mm, 0)
+                if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+                    return None
+                capacity = min(capacity, (len(mm) - HEADER_SIZE) // RECORD_SIZE)
+                count = min(count, capacity)
+                lo, hi = count, capacity
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if _record_valid(mm, mid):
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                end = lo
+                while count < end and _record_valid(mm, count) and (
+                        count == 0 or _record_ts(mm, count) >= _record_ts(mm, count - 1)):
+                    count += 1
+                if count < end:
+                    # Records after a torn write: erase them so they can never be taken for committed ones
+                    mm[HEADER_SIZE + count * RECORD_SIZE:HEADER_SIZE + end * RECORD_SIZE] = bytes((end - count) * RECORD_SIZE)
+                struct.pack_into("<I", mm, _COUNT_OFFSET, count)
+                mm.flush()
+                segment = _Segment(path, seq, capacity)
+                segment.count = count
+                if count:
+                    segment.first_ts = _record_ts(mm, 0)
+                    segment.last_ts = _record_ts(mm, count - 1)
+                return segment
+            finally:
+                mm.close()
+
+    @staticmethod
+    def _lower_bound(mm, count: int, ts: int) -> int:
+        """Index of the first record with a timestamp >= ts"""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _record_ts(mm, mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _rewrite(self, segment: _Segment, before: int):
+        with open(segment.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                first = self._lower_bound(mm, segment.count, before)
+                data = mm[HEADER_SIZE + first * RECORD_SIZE:HEADER_SIZE + segment.count * RECORD_SIZE]
+            finally:
+                mm.close()
+        count = segment.count - first
+        tmp = segment.path + ".tmp"
+        self._create(tmp, count, _TS.unpack_from(data, 0)[0], count)
+        with open(tmp, "r+b") as f:
+            f.seek(HEADER_SIZE)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, segment.path)
+        segment.capacity = segment.count = count
+        segment.first_ts = _TS.unpack_from(data, 0)[0]
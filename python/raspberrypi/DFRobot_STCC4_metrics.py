@@ -0,0 +1,180 @@
+"""!
+    * @file DFRobot_STCC4_metrics.py
+    * @brief Opt-in bus transaction metrics of STCC4 sensors
+    * @n Records, per sensor and per command: transaction count, bytes moved, errors by exception type,
+    * @n CRC failures, retries and a latency histogram. Attach a collector to a driver with set_metrics();
+    * @n a driver without collector only pays one attribute test per transaction.
+    * @n The collected data is exported as a snapshot dict or in the Prometheus text exposition format.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import bisect
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+from DFRobot_STCC4 import DFRobot_STCC4
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Command code -> name, e.g. 0xEC05 -> "READ_MEASURE"
+COMMAND_NAMES = {value: name[len("STCC4_"):] for name, value in vars(DFRobot_STCC4).items()
+                 if name.startswith("STCC4_") and name != "STCC4_PRODUCT_ID"}
+
+
+def command_name(cmd: int) -> str:
+    """
+    :param cmd: Command code
+    :return: Name of the command, its hexadecimal code if unknown
+    """
+    return COMMAND_NAMES.get(cmd, "0x%04X" % cmd)
+
+
+class _CommandMetrics:
+    """Counters of one command of one sensor"""
+
+    __slots__ = ("transactions", "bytes", "errors", "crc_failures", "retries", "buckets", "latency_sum")
+
+    def __init__(self, nbuckets: int):
+        self.transactions = 0
+        self.bytes = 0
+        self.errors = {}
+        self.crc_failures = 0
+        self.retries = 0
+        # One more bucket for the latencies above the last bound
+        self.buckets = [0] * (nbuckets + 1)
+        self.latency_sum = 0.0
+
+
+class STCC4Metrics:
+    """Thread-safe collector of STCC4 bus transaction metrics"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Constructor
+        :param buckets: Increasing upper bounds of the latency histogram buckets, in seconds
+        """
+        self.bounds = tuple(buckets)
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, sensor: str, cmd: int) -> _CommandMetrics:
+        entry = self._data.get((sensor, cmd))
+        if entry is None:
+            entry = self._data[(sensor, cmd)] = _CommandMetrics(len(self.bounds))
+        return entry
+
+    def transaction(self, sensor: str, cmd: int, nbytes: int, latency: float, error: Optional[BaseException] = None):
+        """
+        Record one bus transaction
+        :param sensor: Name of the sensor
+        :param cmd: Command code
+        :param nbytes: Bytes written and read
+        :param latency: Duration in seconds
+        :param error: Exception raised by the bus, None if the transaction succeeded
+        """
+        index = bisect.bisect_left(self.bounds, latency)
+        with self._lock:
+            entry = self._entry(sensor, cmd)
+            entry.transactions += 1
+            entry.latency_sum += latency
+            entry.buckets[index] += 1
+            if error is None:
+                entry.bytes += nbytes
+            else:
+                name = type(error).__name__
+                entry.errors[name] = entry.errors.get(name, 0) + 1
+
+    def crc_failure(self, sensor: str, cmd: int):
+        """Record a frame received with a wrong CRC"""
+        with self._lock:
+            self._entry(sensor, cmd).crc_failures += 1
+
+    def retry(self, sensor: str, cmd: int):
+        """Record a retried operation"""
+        with self._lock:
+            self._entry(sensor, cmd).retries += 1
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._data.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """
+        :return: Dict of sensor name -> command name -> counters:
+        transactions, bytes, errors (dict of exception type -> count), crc_failures, retries,
+        latency_sum and latency_buckets (list of (upper bound, count), not cumulative, the last bound is inf)
+        """
+        bounds = self.bounds + (float("inf"),)
+        result = {}
+        with self._lock:
+            for (sensor, cmd), entry in sorted(self._data.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+                result.setdefault(sensor, {})[command_name(cmd)] = {
+                    "transactions": entry.transactions,
+                    "bytes": entry.bytes,
+                    "errors": dict(entry.errors),
+                    "crc_failures": entry.crc_failures,
+                    "retries": entry.retries,
+                    "latency_sum": entry.latency_sum,
+                    "latency_buckets": list(zip(bounds, entry.buckets)),
+                }
+        return result
+
+    def prometheus(self, prefix: str = "stcc4") -> str:
+        """
+        :param prefix: Prefix of the metric names
+        :return: The metrics in the Prometheus text exposition format
+        """
+        snapshot = self.snapshot()
+        counters = (
+            ("transactions", "Bus transactions"),
+            ("bytes", "Bytes moved by successful transactions"),
+            ("crc_failures", "Frames received with a wrong CRC"),
+            ("retries", "Retried operations"),
+        )
+        lines = []
+        for key, help_text in counters:
+            lines.append("# HELP %s_%s_total %s" % (prefix, key, help_text))
+            lines.append("# TYPE %s_%s_total counter" % (prefix, key))
+            for sensor, commands in snapshot.items():
+                for command, data in commands.items():
+                    lines.append('%s_%s_total{%s} %d' % (prefix, key, _labels(sensor, command), data[key]))
+
+        lines.append("# HELP %s_errors_total Failed bus transactions by exception type" % prefix)
+        lines.append("# TYPE %s_errors_total counter" % prefix)
+        for sensor, commands in snapshot.items():
+            for command, data in commands.items():
+                for error, count in sorted(data["errors"].items()):
+                    lines.append('%s_errors_total{%s} %d' % (prefix, _labels(sensor, command, ("type", error)), count))
+
+        lines.append("# HELP %s_transaction_seconds Bus transaction latency" % prefix)
+        lines.append("# TYPE %s_transaction_seconds histogram" % prefix)
+        for sensor, commands in snapshot.items():
+            for command, data in commands.items():
+                cumulative = 0
+                for bound, count in data["latency_buckets"]:
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append('%s_transaction_seconds_bucket{%s} %d'
+                                 % (prefix, _labels(sensor, command, ("le", le)), cumulative))
+                lines.append('%s_transaction_seconds_sum{%s} %r' % (prefix, _labels(sensor, command), data["latency_sum"]))
+                lines.append('%s_transaction_seconds_count{%s} %d' % (prefix, _labels(sensor, command), data["transactions"]))
+        return "\n".join(lines) + "\n"
+
+
+def _labels(sensor: str, command: str, extra: Optional[Tuple[str, str]] = None) -> str:
+    labels = [("sensor", str(sensor)), ("command", command)]
+    if extra is not None:
+        labels.append(extra)
+    return ",".join('%s="%s"' % (key, _escape(value)) for key, value in labels)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value: backslash, double quote and line feed"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,279 @@
+"""!
+    * @file DFRobot_STCC4_poller.py
+    * @brief Poll many STCC4 sensors spread over several I2C buses
+    * @n One bus handle is opened and shared per bus, and every transaction on a bus is serialized by a lock.
+    * @n The buses are served in parallel by a thread pool, so the time of one poll is that of the busiest bus.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from DFRobot_STCC4 import CircuitBreaker, DFRobot_STCC4, DFRobot_STCC4_I2C, RetryPolicy, SMBus2Bus, STCC4Bus
+from DFRobot_STCC4_status import STCC4Status, sample_status
+
+
+class STCC4Batch:
+    """
+    Measurements of all sensors taken in one poll
+    timestamp : time.monotonic() at the start of the poll, shared by all samples of the batch
+    duration : Time in seconds the poll took
+    samples : Dict of sensor name -> (co2_concentration, temperature, humidity, sensor_status), or None on error
+    errors : Dict of sensor name -> error code (last_error of the driver) for the sensors that failed,
+             ERR_CIRCUIT_OPEN for the sensors skipped by the circuit breaker of their bus,
+             ERR_STATUS for the samples left out for their status flags
+    status : Dict of sensor name -> STCC4Status flags of every sample read, the left out ones included
+    """
+
+    __slots__ = ("timestamp", "duration", "samples", "errors", "status")
+
+    def __init__(self, timestamp: float):
+        self.timestamp = timestamp
+        self.duration = 0.0
+        self.samples = {}
+        self.errors = {}
+        self.status = {}
+
+
+class _Bus:
+    """One shared bus handle, its lock and the sensors attached to it"""
+
+    __slots__ = ("key", "handle", "owned", "lock", "sensors", "breaker")
+
+    def __init__(self, key: Hashable, handle, owned: bool, breaker: Optional[CircuitBreaker] = None, lock=None):
+        self.key = key
+        self.handle = handle
+        self.owned = owned
+        # A bus sharing its wires with others (e.g. a multiplexer channel) brings the lock they share
+        self.lock = lock if lock is not None else threading.Lock()
+        self.sensors = []
+        self.breaker = breaker
+
+
+class STCC4Poller:
+    """Multi-bus, multi-sensor STCC4 poller"""
+
+    def __init__(self, max_workers: Optional[int] = None, metrics=None, retry_policy: Optional[RetryPolicy] = None,
+                 breaker_factory: Optional[Callable[[], CircuitBreaker]] = None, reject_status: int = 0):
+        """
+        Constructor
+        :param max_workers: Number of pool threads, one per bus if None
+        :param metrics: DFRobot_STCC4_metrics.STCC4Metrics recording the transactions of all sensors, None to record nothing
+        :param retry_policy: RetryPolicy of all sensors, None to try each transaction once
+        :param breaker_factory: Called once per bus to make its CircuitBreaker (e.g. CircuitBreaker), None for no breaker
+        :param reject_status: STCC4Status flags that leave a sample out of the batches (e.g. DFRobot_STCC4_status.BAD_SAMPLE:
+        testing mode or no SHT4x), 0 to keep every sample; the flags of all samples are in STCC4Batch.status either way
+        """
+        self.reject_status = reject_status
+        self._max_workers = max_workers
+        self._metrics = metrics
+        self._retry_policy = retry_policy
+        self._breaker_factory = breaker_factory
+        self._buses = {}
+        self._sensors = {}
+        self._executor = None
+
+    def add_sensor(self, bus=DFRobot_STCC4_I2C.I2C_BUS, addr: int = DFRobot_STCC4_I2C.DEFAULT_I2C_ADDR,
+                   name: Optional[Hashable] = None) -> DFRobot_STCC4_I2C:
+        """
+        Attach a sensor to the poller
+        :param bus: I2C bus number, or an already opened STCC4Bus or smbus2.SMBus handle; the channels of one
+        DFRobot_STCC4_bus.TCA9548A are served one after the other, as they share the upstream bus
+        :param addr: I2C address of the sensor
+        :param name: Key of the sensor in the batches, (bus, addr) if None
+        :return: The driver instance of the sensor
+        """
+        if name is None:
+            name = (bus, addr)
+        if name in self._sensors:
+            raise ValueError("sensor %r already added" % (name,))
+        entry = self._buses.get(bus)
+        if entry is None:
+            breaker = self._breaker_factory() if self._breaker_factory is not None else None
+            if isinstance(bus, STCC4Bus):
+                entry = _Bus(bus, bus, False, breaker, getattr(bus, "lock", None))
+            else:
+                entry = _Bus(bus, SMBus2Bus(bus), isinstance(bus, int), breaker)
+            self._buses[bus] = entry
+            self._reset_executor()
+        sensor = DFRobot_STCC4_I2C(addr, entry.handle)
+        if self._metrics is not None:
+            sensor.set_metrics(self._metrics, str(name))
+        if self._retry_policy is not None or entry.breaker is not None:
+            sensor.set_retry_policy(self._retry_policy, entry.breaker)
+        entry.sensors.append((name, sensor))
+        self._sensors[name] = (entry, sensor)
+        return sensor
+
+    def begin(self, temperature: Optional[float] = None, humidity: Optional[float] = None,
+              pressure: Optional[int] = None, start: bool = True, verify: bool = True,
+              deadline: float = 1.0) -> Dict[Hashable, int]:
+        """
+        Bring all sensors up concurrently, see DFRobot_STCC4_I2C.begin: the buses in parallel,
+        and the sensors of each bus step by step together, so it takes about as long as one sensor
+        :return: Dict of sensor name -> error code of begin (ERR_OK if the sensor is up)
+        """
+        def begin_bus(sensors: List[Tuple[Hashable, DFRobot_STCC4_I2C]]) -> Dict[Hashable, int]:
+            codes = DFRobot_STCC4_I2C.begin_many([sensor for _, sensor in sensors], temperature, humidity,
+                                                 pressure, start, verify, deadline)
+            return {name: code for (name, _), code in zip(sensors, codes)}
+
+        return self.per_bus(begin_bus)
+
+    def sensor(self, name: Hashable) -> DFRobot_STCC4_I2C:
+        """
+        :param name: Name of the sensor
+        :return: The driver instance of the sensor
+        """
+        return self._sensors[name][1]
+
+    @property
+    def names(self) -> List[Hashable]:
+        """Names of all sensors, in the order they were added"""
+        return list(self._sensors)
+
+    def call(self, name: Hashable, func: Callable[[DFRobot_STCC4_I2C], object]):
+        """
+        Run func(sensor) on one sensor while holding the lock of its bus
+        :param name: Name of the sensor
+        :param func: Callable taking the driver instance
+        :return: Result of func
+        """
+        entry, sensor = self._sensors[name]
+        with entry.lock:
+            return func(sensor)
+
+    def broadcast(self, func: Callable[[DFRobot_STCC4_I2C], object]) -> Dict[Hashable, object]:
+        """
+        Run func(sensor) on every sensor, the sensors of a bus one after another and the buses in parallel
+        :param func: Callable taking the driver instance
+        :return: Dict of sensor name -> result of func
+        """
+        results = {}
+        for part in self._map_buses(lambda entry: self._run_bus(entry, func)):
+            results.update(part)
+        return results
+
+    def bus_lock(self, name: Hashable):
+        """
+        :param name: Name of the sensor
+        :return: Lock of the bus of the sensor, to hold around each transaction of a job run by per_bus(hold_lock=False)
+        """
+        return self._sensors[name][0].lock
+
+    def per_bus(self, func: Callable[[List[Tuple[Hashable, DFRobot_STCC4_I2C]]], Dict[Hashable, object]],
+                hold_lock: bool = True) -> Dict[Hashable, object]:
+        """
+        Run func once per bus, the buses in parallel, for jobs that interleave the sensors of a bus
+        instead of serving them one after another
+        :param func: Callable taking the list of (name, sensor) of one bus and returning a dict of sensor name -> result
+        :param hold_lock: Hold the lock of the bus while func runs; False for long jobs, which then take
+        bus_lock() around each of their transactions so the other users of the bus are not blocked meanwhile
+        :return: The dicts returned for all buses, merged
+        """
+        def run(entry: _Bus) -> Dict[Hashable, object]:
+            if not hold_lock:
+                return func(list(entry.sensors))
+            with entry.lock:
+                return func(list(entry.sensors))
+
+        results = {}
+        for part in self._map_buses(run):
+            results.update(part)
+        return results
+
+    def poll(self) -> STCC4Batch:
+        """
+        Read one measurement from every sensor
+        :return: STCC4Batch holding the samples of all sensors
+        """
+        batch = STCC4Batch(time.monotonic())
+        reject = self.reject_status
+        for part in self._map_buses(self._poll_bus):
+            for name, sample, error, status in part:
+                if sample is None:
+                    batch.samples[name] = None
+                    batch.errors[name] = error
+                    continue
+                batch.status[name] = status
+                if status & reject:
+                    batch.samples[name] = None
+                    batch.errors[name] = DFRobot_STCC4.ERR_STATUS
+                else:
+                    batch.samples[name] = sample
+        batch.duration = time.monotonic() - batch.timestamp
+        return batch
+
+    def run(self, interval: float, callback: Callable[[STCC4Batch], object], count: Optional[int] = None):
+        """
+        Poll all sensors at a fixed rate
+        :param interval: Poll period in seconds, the schedule is kept on the monotonic clock so it does not drift
+        :param callback: Called with every STCC4Batch
+        :param count: Number of polls, forever if None
+        """
+        next_poll = time.monotonic()
+        done = 0
+        while count is None or done < count:
+            callback(self.poll())
+            done += 1
+            if done == count:
+                break
+            next_poll += interval
+            delay = next_poll - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_poll = time.monotonic()
+
+    def close(self):
+        """Stop the thread pool and close the bus handles opened by the poller"""
+        self._reset_executor()
+        for entry in self._buses.values():
+            if entry.owned:
+                entry.handle.close()
+        self._buses.clear()
+        self._sensors.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _poll_bus(self, entry: _Bus) -> List[Tuple[Hashable, Optional[tuple], int, Optional[STCC4Status]]]:
+        result = []
+        with entry.lock:
+            for name, sensor in entry.sensors:
+                sample = sensor.measurement()
+                status = sample_status(sensor) if sample is not None else None
+                result.append((name, sample, sensor.last_error, status))
+        return result
+
+    @staticmethod
+    def _run_bus(entry: _Bus, func) -> Dict[Hashable, object]:
+        result = {}
+        with entry.lock:
+            for name, sensor in entry.sensors:
+                result[name] = func(sensor)
+        return result
+
+    def _map_buses(self, func) -> list:
+        entries = list(self._buses.values())
+        if len(entries) <= 1:
+            return [func(entry) for entry in entries]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers or len(entries),
+                                                thread_name_prefix="stcc4-bus")
+        return list(self._executor.map(func, entries))
+
+    def _reset_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
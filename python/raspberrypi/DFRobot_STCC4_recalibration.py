@@ -0,0 +1,220 @@
+"""!
+    * @file DFRobot_STCC4_recalibration.py
+    * @brief Forced recalibration of a whole fleet of STCC4 sensors at once
+    * @n Every bus of an STCC4Poller is served by its own thread. On each bus, the readings of all sensors are
+    * @n followed together until every one of them is stable, judged on a sliding window of samples (standard
+    * @n deviation and least-squares drift) instead of a fixed count. The stable sensors of the bus are then
+    * @n stopped and recalibrated together, sharing the stop and FRC delays, and the failed recalibrations are
+    * @n retried a bounded number of times. Calibrating the fleet takes about as long as calibrating one sensor.
+    * @n The lock of a bus is only held for each transaction, so the other users of the bus (a daemon, a scheduler)
+    * @n keep their access during the minutes the readings take to settle.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import math
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from DFRobot_STCC4 import DFRobot_STCC4_I2C, _SampleSchedule
+
+# Correction value the sensor returns when the recalibration failed (datasheet: 0xFFFF). Any other value is
+# the correction plus 0x8000, so 0x0000 is a valid, if extreme, correction of -32768 ppm and not a failure.
+FRC_FAILED = 0xFFFF
+
+
+class STCC4Calibration:
+    """
+    Outcome of the recalibration of one sensor
+    stable : True if the readings settled before the timeout; unstable sensors are not recalibrated and keep measuring
+    settle_time : Seconds from the start of the run to the sample that made the readings stable
+    samples : Number of samples read while settling
+    mean : Mean CO2 concentration in ppm over the last window
+    std : Standard deviation of the CO2 concentration in ppm over the last window
+    drift : Change of the CO2 concentration in ppm across the last window, from the least-squares slope
+    attempts : Number of forced recalibration commands sent
+    correction : FRC correction value returned by the sensor, None if the sensor was not recalibrated
+    """
+
+    __slots__ = ("stable", "settle_time", "samples", "mean", "std", "drift", "attempts", "correction", "_times",
+                 "_values")
+
+    def __init__(self, window: int):
+        self.stable = False
+        self.settle_time = None
+        self.samples = 0
+        self.mean = None
+        self.std = None
+        self.drift = None
+        self.attempts = 0
+        self.correction = None
+        self._times = deque(maxlen=window)
+        self._values = deque(maxlen=window)
+
+    @property
+    def ok(self) -> bool:
+        """True if the sensor was recalibrated"""
+        return self.correction is not None
+
+    def add(self, timestamp: float, co2: int) -> bool:
+        """
+        Add a sample to the window and update its statistics
+        :return: True once the window is full
+        """
+        self.samples += 1
+        self._times.append(timestamp)
+        self._values.append(co2)
+        n = len(self._values)
+        if n < 2:
+            return False
+        t0 = self._times[0]
+        mean_t = sum(self._times) / n - t0
+        mean = sum(self._values) / n
+        sxx = sxy = syy = 0.0
+        for t, y in zip(self._times, self._values):
+            dt = t - t0 - mean_t
+            dy = y - mean
+            sxx += dt * dt
+            sxy += dt * dy
+            syy += dy * dy
+        self.mean = mean
+        self.std = math.sqrt(syy / (n - 1))
+        self.drift = sxy / sxx * (self._times[-1] - t0) if sxx > 0 else 0.0
+        return n == self._values.maxlen
+
+
+class STCC4Recalibrator:
+    """Forced recalibration of all sensors of an STCC4Poller, the buses in parallel"""
+
+    def __init__(self, poller, window: int = 30, max_std: float = 15.0, max_drift: float = 20.0,
+                 settle_timeout: float = 600.0, frc_attempts: int = 5, retry_delay: float = 1.0):
+        """
+        Constructor
+        :param poller: DFRobot_STCC4_poller.STCC4Poller holding the sensors, in continuous measurement (e.g. after begin())
+        :param window: Number of newest samples the stability is judged on
+        :param max_std: Largest standard deviation in ppm of a stable window
+        :param max_drift: Largest change in ppm across a stable window, from the least-squares slope
+        :param settle_timeout: Longest time in seconds to wait for the readings of a sensor to settle
+        :param frc_attempts: Attempts of the forced recalibration of a sensor before giving up
+        :param retry_delay: Wait in seconds before the forced recalibration is retried
+        """
+        if window < 2:
+            raise ValueError("window must hold at least 2 samples")
+        if frc_attempts < 1:
+            raise ValueError("frc_attempts must be positive")
+        self.poller = poller
+        self.window = window
+        self.max_std = max_std
+        self.max_drift = max_drift
+        self.settle_timeout = settle_timeout
+        self.frc_attempts = frc_attempts
+        self.retry_delay = retry_delay
+
+    def run(self, target: Union[int, Dict[Hashable, int]],
+            callback: Optional[Callable[[Hashable, Tuple[int, float, float, int]], object]] = None,
+            restart: bool = True) -> Dict[Hashable, STCC4Calibration]:
+        """
+        Wait for the readings of every sensor to settle, then recalibrate the stable sensors
+        :param target: CO2 concentration of the reference atmosphere in ppm (0 - 32000), or a dict of sensor name -> ppm;
+        the sensors missing from the dict are left alone
+        :param callback: Called with (name, sample) for every sample read while settling, from the thread of its bus
+        :param restart: Restart continuous measurement on the recalibrated sensors
+        :return: Dict of sensor name -> STCC4Calibration
+        """
+        names = self.poller.names
+        targets = dict(target) if isinstance(target, dict) else {name: target for name in names}
+        for name, ppm in targets.items():
+            if name not in names:
+                raise KeyError(name)
+            if not 0 <= ppm <= 32000:
+                raise ValueError("target of %r out of range: %r ppm" % (name, ppm))
+        start = time.monotonic()
+
+        def run_bus(sensors: List[Tuple[Hashable, DFRobot_STCC4_I2C]]) -> Dict[Hashable, STCC4Calibration]:
+            sensors = [(name, sensor) for name, sensor in sensors if name in targets]
+            results = self._settle(sensors, start, callback)
+            stable = [(name, sensor) for name, sensor in sensors if results[name].stable]
+            if stable:
+                self._recalibrate(stable, targets, results)
+                if restart:
+                    for name, sensor in stable:
+                        self._io(name, sensor._start_continuous)
+            return results
+
+        return self.poller.per_bus(run_bus, hold_lock=False)
+
+    def _io(self, name: Hashable, func: Callable, *args):
+        """Run one transaction of a sensor while holding the lock of its bus"""
+        with self.poller.bus_lock(name):
+            return func(*args)
+
+    def _settle(self, sensors: List[Tuple[Hashable, DFRobot_STCC4_I2C]], start: float,
+                callback) -> Dict[Hashable, STCC4Calibration]:
+        """
+        Read the sensors of one bus as their samples come, until all are stable or the timeout
+        :return: Dict of sensor name -> STCC4Calibration with the settling statistics
+        """
+        results = {name: STCC4Calibration(self.window) for name, _ in sensors}
+        pending = []
+        for name, sensor in sensors:
+            if sensor._schedule is None:
+                # Measurement started elsewhere: read at once, then follow the sensor
+                sensor._schedule = _SampleSchedule(sensor.MEASUREMENT_INTERVAL, sensor.POLL_INTERVAL)
+            pending.append((name, sensor))
+        end = start + self.settle_timeout
+        while pending:
+            # Serve the sensor whose read is due first
+            name, sensor = min(pending, key=lambda item: item[1]._schedule.next_read)
+            schedule = sensor._schedule
+            delay = min(schedule.next_read, end) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if time.monotonic() >= end:
+                break
+            state, sample = self._io(name, sensor._poll_sample, schedule)
+            if state != schedule.NEW:
+                continue
+            result = results[name]
+            if callback is not None:
+                callback(name, sample)
+            if (result.add(sensor.last_measurement.timestamp, sample[0]) and result.std <= self.max_std
+                    and abs(result.drift) <= self.max_drift):
+                result.stable = True
+                result.settle_time = time.monotonic() - start
+                pending.remove((name, sensor))
+        return results
+
+    def _recalibrate(self, sensors: List[Tuple[Hashable, DFRobot_STCC4_I2C]], targets: Dict[Hashable, int],
+                     results: Dict[Hashable, STCC4Calibration]):
+        """
+        Stop the stable sensors of one bus and recalibrate them together, retrying the failed ones
+        """
+        for name, sensor in sensors:
+            self._io(name, sensor._stop_continuous)
+        time.sleep(sensors[0][1].START_STOP_DELAY)
+        pending = sensors
+        for attempt in range(self.frc_attempts):
+            if attempt:
+                time.sleep(self.retry_delay)
+            sent = []
+            for name, sensor in pending:
+                results[name].attempts += 1
+                if self._io(name, sensor._write_frc, targets[name]):
+                    sent.append((name, sensor))
+            if sent:
+                time.sleep(sensors[0][1].FRC_DELAY)
+            failed = [item for item in pending if item not in sent]
+            for name, sensor in sent:
+                correction = self._io(name, sensor._read_frc_correction)
+                if correction is None or correction == FRC_FAILED:
+                    failed.append((name, sensor))
+                else:
+                    results[name].correction = correction
+            pending = failed
+            if not pending:
+                break
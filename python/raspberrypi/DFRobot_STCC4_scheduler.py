@@ -0,0 +1,137 @@
+"""!
+    * @file DFRobot_STCC4_scheduler.py
+    * @brief Power-aware single shot measurement of one or more STCC4 sensors
+    * @n Every cycle wakes all sensors, triggers a single shot measurement, reads it and puts the sensors back
+    * @n to sleep, using the shortest legal waits. All sensors share one wake window per cycle, so the awake
+    * @n time per sample does not grow with the number of sensors, and the duty cycle is reported.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from DFRobot_STCC4 import DFRobot_STCC4_I2C
+
+
+class STCC4SingleShotScheduler:
+    """Single shot scheduler sharing one wake window between all sensors"""
+
+    def __init__(self, interval: float, sensors: Optional[List[DFRobot_STCC4_I2C]] = None, deadline: float = 1.0):
+        """
+        Constructor
+        :param interval: Target sampling interval in seconds
+        :param sensors: Sensors to measure, named by their index; more can be added with add_sensor
+        :param deadline: Longest time in seconds a sensor may take to accept the trigger or deliver its result
+        """
+        self.interval = interval
+        self.deadline = deadline
+        self._sensors = []
+        self.last_awake_time = 0.0
+        self._awake_total = 0.0
+        self._cycles = 0
+        for sensor in sensors or []:
+            self.add_sensor(sensor)
+
+    def add_sensor(self, sensor: DFRobot_STCC4_I2C, name: Optional[Hashable] = None):
+        """
+        Add a sensor to the wake window
+        :param sensor: Driver instance of the sensor
+        :param name: Key of the sensor in the results, its index if None
+        """
+        if name is None:
+            name = len(self._sensors)
+        self._sensors.append((name, sensor))
+
+    @property
+    def duty_cycle(self) -> float:
+        """Mean fraction of the sampling interval the sensors spent awake, over all cycles run so far"""
+        if self._cycles == 0:
+            return 0.0
+        return self._awake_total / (self._cycles * self.interval)
+
+    def cycle(self) -> Dict[Hashable, Optional[Tuple[int, float, float, int]]]:
+        """
+        Run one wake window: wakeup, single_measurement, measurement and fall_asleep on every sensor
+        :return: Dict of sensor name -> (co2_concentration, temperature, humidity, sensor_status), None on error
+        """
+        if not self._sensors:
+            return {}
+        start = time.monotonic()
+        results = {name: None for name, _ in self._sensors}
+
+        # The wakeup command is not acknowledged by a sleeping sensor, so its result is meaningless.
+        for _, sensor in self._sensors:
+            sensor.wakeup()
+        self._sleep_until(time.monotonic() + max(sensor.WAKEUP_DELAY for _, sensor in self._sensors))
+
+        # Trigger the measurements, retrying sensors which are not awake yet.
+        triggered = self._retry_all(lambda sensor: sensor.single_measurement())
+
+        # Read each result one measurement time after its own trigger, in trigger order.
+        for name, sensor, trigger_time in triggered:
+            self._sleep_until(trigger_time + sensor.SINGLE_SHOT_DELAY)
+            deadline = time.monotonic() + self.deadline
+            while True:
+                results[name] = sensor.measurement()
+                if results[name] is not None or time.monotonic() >= deadline:
+                    break
+                time.sleep(sensor.POLL_INTERVAL)
+
+        for _, sensor in self._sensors:
+            sensor.fall_asleep()
+
+        self.last_awake_time = time.monotonic() - start
+        self._awake_total += self.last_awake_time
+        self._cycles += 1
+        return results
+
+    def run(self, callback: Callable[[Dict[Hashable, Optional[Tuple[int, float, float, int]]]], object],
+            count: Optional[int] = None):
+        """
+        Run a cycle every interval seconds, on a drift-free monotonic schedule
+        :param callback: Called with the results of every cycle
+        :param count: Number of cycles, forever if None
+        """
+        next_cycle = time.monotonic()
+        done = 0
+        while count is None or done < count:
+            callback(self.cycle())
+            done += 1
+            if done == count:
+                break
+            next_cycle += self.interval
+            if next_cycle < time.monotonic():
+                next_cycle = time.monotonic()
+            self._sleep_until(next_cycle)
+
+    def _retry_all(self, func: Callable[[DFRobot_STCC4_I2C], bool]) -> List[Tuple[Hashable, DFRobot_STCC4_I2C, float]]:
+        """
+        Run func on every sensor, retrying the failed ones every POLL_INTERVAL until the deadline
+        :return: List of (name, sensor, time of success) of the sensors on which func succeeded
+        """
+        done = []
+        pending = list(self._sensors)
+        deadline = time.monotonic() + self.deadline
+        while pending:
+            failed = []
+            for name, sensor in pending:
+                if func(sensor):
+                    done.append((name, sensor, time.monotonic()))
+                else:
+                    failed.append((name, sensor))
+            pending = failed
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(pending[0][1].POLL_INTERVAL)
+        return done
+
+    @staticmethod
+    def _sleep_until(target: float):
+        delay = target - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
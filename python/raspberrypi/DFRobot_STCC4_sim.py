@@ -0,0 +1,313 @@
+"""!
+    * @file DFRobot_STCC4_sim.py
+    * @brief In-process STCC4 simulator for testing and benchmarking without hardware
+    * @n STCC4SimBus is an STCC4Bus hosting any number of SimulatedSTCC4 devices. It answers every command of the
+    * @n driver with correctly CRC-protected frames, follows the measurement timing of the sensor, and can add
+    * @n latency and inject faults (NACKs, corrupted CRCs), so drivers and pollers can run at high rates in CI.
+    * @n SimulatedTCA9548A puts same-address devices behind a multiplexer.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import errno
+import random
+import threading
+import time
+from typing import Callable, Optional, Union
+
+from DFRobot_STCC4 import DFRobot_STCC4, STCC4Bus
+
+_CMD = DFRobot_STCC4
+
+
+class SimulatedSTCC4:
+    """Command level model of one STCC4"""
+
+    STATUS_TESTING_MODE = 0x4000
+    FRC_FAILED = 0xFFFF
+
+    def __init__(self, co2: Union[int, Callable[[float], float]] = 400, temperature: Optional[float] = None,
+                 humidity: Optional[float] = None, serial: int = 0x0000000012345678,
+                 measurement_interval: float = 1.0, single_shot_time: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Constructor
+        :param co2: CO2 concentration in ppm, or a callable returning it for a time of clock
+        :param temperature: Temperature of the attached SHT4x in degrees Celsius, None if no SHT4x is attached
+        :param humidity: Humidity of the attached SHT4x in percent, None if no SHT4x is attached
+        :param serial: 64-bit serial number returned after the product ID by get_id
+        :param measurement_interval: Sampling interval of continuous measurement in seconds
+        :param single_shot_time: Duration of a single shot measurement in seconds
+        :param clock: Time source, time.monotonic by default
+        """
+        self.co2 = co2
+        self.temperature = temperature
+        self.humidity = humidity
+        self.serial = serial
+        self.measurement_interval = measurement_interval
+        self.single_shot_time = single_shot_time
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Return to the power-up state (also done by a soft reset)"""
+        self.sleeping = False
+        self.measuring = False
+        self.testing_mode = False
+        self.temp_raw = 0x6666          # 25 degrees Celsius
+        self.hum_raw = 0x72AF           # 50 %RH
+        self.pressure_raw = 1013 * 50
+        self.frc_offset = 0
+        self.frc_correction = self.FRC_FAILED
+        self._start = 0.0
+        self._read_index = 0
+        self._single_shot_ready = None
+
+    def command(self, cmd: int, words: list):
+        """
+        Execute a written command
+        :param cmd: 8 or 16-bit command
+        :param words: Data words written after the command (CRCs already checked)
+        :raise OSError: if the sensor would not acknowledge the command
+        """
+        now = self.clock()
+        if self.sleeping:
+            if cmd == _CMD.STCC4_WAKEUP:
+                self.sleeping = False
+            # The wake-up command itself is never acknowledged
+            raise OSError(errno.EREMOTEIO, "NACK")
+        if cmd == _CMD.STCC4_WAKEUP:
+            return
+        if cmd == _CMD.STCC4_SOFT_RESET:
+            self.reset()
+        elif cmd == _CMD.STCC4_START_CONT_MEASURE:
+            self.measuring = True
+            self._start = now
+            self._read_index = 0
+        elif cmd == _CMD.STCC4_STOP_CONT_MEASURE:
+            self.measuring = False
+        elif cmd == _CMD.STCC4_SINGLE_SHOT:
+            if self.measuring:
+                raise OSError(errno.EREMOTEIO, "NACK")
+            self._single_shot_ready = now + self.single_shot_time
+        elif cmd == _CMD.STCC4_SLEEP:
+            self.measuring = False
+            self.sleeping = True
+        elif cmd == _CMD.STCC4_SET_RHT_COMPENSATION and len(words) == 2:
+            self.temp_raw, self.hum_raw = words
+        elif cmd == _CMD.STCC4_SET_PRESSURE_COMPENSATION and len(words) == 1:
+            self.pressure_raw = words[0]
+        elif cmd == _CMD.STCC4_ENABLE_TESTING_MODE:
+            self.testing_mode = True
+        elif cmd == _CMD.STCC4_DISABLE_TESTING_MODE:
+            self.testing_mode = False
+        elif cmd == _CMD.STCC4_FORC_CALIBRATION and len(words) == 1:
+            if self.measuring:
+                self.frc_correction = self.FRC_FAILED
+            else:
+                error = words[0] - self._co2_at(now)
+                self.frc_offset += error
+                self.frc_correction = (0x8000 + error) & 0xFFFF
+        elif cmd in (_CMD.STCC4_GET_ID, _CMD.STCC4_READ_MEASURE, _CMD.STCC4_FACTORY_RESET,
+                     _CMD.STCC4_FORC_CALIBRATION):
+            pass
+        else:
+            raise OSError(errno.EREMOTEIO, "NACK")
+
+    def response(self, cmd: int) -> list:
+        """
+        Words returned when reading after a command
+        :param cmd: 16-bit command written before the read
+        :return: List of 16-bit words
+        :raise OSError: if the sensor would not acknowledge the read (e.g. no new measurement yet)
+        """
+        now = self.clock()
+        if self.sleeping:
+            raise OSError(errno.EREMOTEIO, "NACK")
+        if cmd == _CMD.STCC4_GET_ID:
+            serial = self.serial
+            return [_CMD.STCC4_PRODUCT_ID >> 16, _CMD.STCC4_PRODUCT_ID & 0xFFFF,
+                    (serial >> 48) & 0xFFFF, (serial >> 32) & 0xFFFF, (serial >> 16) & 0xFFFF, serial & 0xFFFF]
+        if cmd == _CMD.STCC4_READ_MEASURE:
+            return self._measurement(now)
+        if cmd == _CMD.STCC4_FACTORY_RESET:
+            self.reset()
+            return [0x0000]
+        if cmd == _CMD.STCC4_FORC_CALIBRATION:
+            return [self.frc_correction]
+        raise OSError(errno.EREMOTEIO, "NACK")
+
+    def _measurement(self, now: float) -> list:
+        if self.measuring:
+            index = int((now - self._start) / self.measurement_interval)
+            if index <= self._read_index:
+                raise OSError(errno.EREMOTEIO, "NACK")
+            self._read_index = index
+        elif self._single_shot_ready is not None and now >= self._single_shot_ready:
+            self._single_shot_ready = None
+        else:
+            raise OSError(errno.EREMOTEIO, "NACK")
+        co2 = max(0, min(0xFFFF, self._co2_at(now)))
+        if self.temperature is None or self.humidity is None:
+            temp_raw, hum_raw = self.temp_raw, self.hum_raw
+        else:
+            temp_raw = max(0, min(0xFFFF, int((self.temperature + 45) * 65535 / 175)))
+            hum_raw = max(0, min(0xFFFF, int((self.humidity + 6) * 65535 / 125)))
+        status = self.STATUS_TESTING_MODE if self.testing_mode else 0
+        return [co2, temp_raw, hum_raw, status]
+
+    def _co2_at(self, now: float) -> int:
+        co2 = self.co2(now) if callable(self.co2) else self.co2
+        return int(round(co2)) + self.frc_offset
+
+
+class SimulatedTCA9548A:
+    """
+    Model of a TCA9548A I2C multiplexer, attached to an STCC4SimBus like a device
+    Writing its control byte connects the downstream channels whose bits are set; the transactions of the bus
+    to an address not on the bus itself then reach the devices of the connected channels.
+    """
+
+    def __init__(self, channels: int = 8):
+        """
+        Constructor
+        :param channels: Number of downstream channels
+        """
+        self.channels = [dict() for _ in range(channels)]
+        self.control = 0
+        self.selects = 0
+
+    def attach(self, channel: int, addr: int = 0x64, device: Optional[SimulatedSTCC4] = None) -> SimulatedSTCC4:
+        """
+        Attach a device to a downstream channel
+        :param channel: Channel index
+        :param addr: I2C address of the device
+        :param device: The device, a new SimulatedSTCC4 if None
+        :return: The device
+        """
+        if device is None:
+            device = SimulatedSTCC4()
+        self.channels[channel][addr] = device
+        return device
+
+    def command(self, cmd: int, words: list):
+        """Control byte written to the multiplexer"""
+        if words or cmd >= 1 << len(self.channels):
+            raise OSError(errno.EREMOTEIO, "NACK")
+        self.control = cmd
+        self.selects += 1
+
+    def route(self, addr: int) -> Optional[SimulatedSTCC4]:
+        """
+        :return: Device answering at addr on the connected channels, None if there is none
+        :raise OSError: if devices of several connected channels share the address
+        """
+        found = [devices[addr] for index, devices in enumerate(self.channels)
+                 if self.control >> index & 1 and addr in devices]
+        if len(found) > 1:
+            raise OSError(errno.EREMOTEIO, "address 0x%02X on several connected channels" % addr)
+        return found[0] if found else None
+
+
+class STCC4SimBus(STCC4Bus):
+    """STCC4Bus with simulated STCC4 devices attached"""
+
+    def __init__(self, latency: float = 0.0, nack_rate: float = 0.0, crc_error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Constructor
+        :param latency: Time in seconds every transaction takes
+        :param nack_rate: Probability that a transaction is not acknowledged
+        :param crc_error_rate: Probability that a read returns a frame with a corrupted CRC
+        :param seed: Seed of the fault injection, for reproducible runs
+        """
+        self.latency = latency
+        self.nack_rate = nack_rate
+        self.crc_error_rate = crc_error_rate
+        self.devices = {}
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self._nack_next = 0
+        self._corrupt_next = 0
+        self._random = random.Random(seed)
+        self._crc = DFRobot_STCC4()
+        self._lock = threading.Lock()
+
+    def attach(self, addr: int = 0x64, device: Optional[SimulatedSTCC4] = None) -> SimulatedSTCC4:
+        """
+        Attach a device to the bus
+        :param addr: I2C address of the device
+        :param device: The device (a SimulatedTCA9548A for a multiplexer), a new SimulatedSTCC4 if None
+        :return: The device
+        """
+        if device is None:
+            device = SimulatedSTCC4()
+        self.devices[addr] = device
+        return device
+
+    def fail_next(self, count: int = 1):
+        """Do not acknowledge the next count transactions"""
+        self._nack_next += count
+
+    def corrupt_next(self, count: int = 1):
+        """Corrupt the first CRC of the next count read frames"""
+        self._corrupt_next += count
+
+    def write(self, addr: int, buf: bytearray, length: int) -> None:
+        with self._lock:
+            device = self._begin(addr, length)
+            cmd, words = self._parse(buf, length)
+            device.command(cmd, words)
+
+    def write_read(self, addr: int, wbuf: bytearray, wlength: int, rbuf: bytearray, rlength: int) -> None:
+        with self._lock:
+            device = self._begin(addr, wlength)
+            cmd, words = self._parse(wbuf, wlength)
+            device.command(cmd, words)
+            frame = self._frame(device.response(cmd))
+            if len(frame) < rlength:
+                frame += bytes(rlength - len(frame))
+            if self._corrupt_next or (self.crc_error_rate and self._random.random() < self.crc_error_rate):
+                self._corrupt_next = max(0, self._corrupt_next - 1)
+                frame[2] ^= 0xFF
+            rbuf[:rlength] = frame[:rlength]
+            self.bytes_read += rlength
+
+    def _begin(self, addr: int, length: int) -> SimulatedSTCC4:
+        if self.latency:
+            time.sleep(self.latency)
+        self.transactions += 1
+        device = self.devices.get(addr)
+        if device is None:
+            for mux in self.devices.values():
+                if isinstance(mux, SimulatedTCA9548A):
+                    device = mux.route(addr)
+                    if device is not None:
+                        break
+        if device is None:
+            raise OSError(errno.ENXIO, "no device at address 0x%02X" % addr)
+        if self._nack_next or (self.nack_rate and self._random.random() < self.nack_rate):
+            self._nack_next = max(0, self._nack_next - 1)
+            raise OSError(errno.EREMOTEIO, "NACK")
+        self.bytes_written += length
+        return device
+
+    def _parse(self, buf: bytearray, length: int):
+        """Split a write into its command and CRC-checked data words"""
+        if length == 1:
+            return buf[0], []
+        cmd = (buf[0] << 8) | buf[1]
+        if (length - 2) % 3 or self._crc.check_crc_frame(buf[2:length]) != (1 << ((length - 2) // 3)) - 1:
+            raise OSError(errno.EREMOTEIO, "NACK")
+        return cmd, [(buf[i] << 8) | buf[i + 1] for i in range(2, length, 3)]
+
+    def _frame(self, words: list) -> bytearray:
+        frame = bytearray()
+        for value in words:
+            frame += bytes(((value >> 8) & 0xFF, value & 0xFF, self._crc.calculation_crc([value])))
+        return frame
@@ -0,0 +1,251 @@
+"""!
+    * @file DFRobot_STCC4_stats.py
+    * @brief Streaming statistics and time-bucketed downsampling of STCC4 samples
+    * @n Each sample updates running statistics in O(1) and constant memory per sensor, instead of keeping
+    * @n lists of samples to recompute: count, mean and variance (Welford), min, max and an exponentially
+    * @n weighted moving average. The same statistics are kept per time bucket (e.g. 1 min and 15 min); when a
+    * @n bucket ends, one compact STCC4Rollup record replaces all its samples, to be shipped upstream.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import math
+import struct
+import time
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+# Fields of the (co2_concentration, temperature, humidity, sensor_status) tuple of measurement() with statistics
+FIELDS = ("co2", "temperature", "humidity")
+
+
+class RunningStats:
+    """Running count, mean, variance, min, max and EWMA of a stream of values"""
+
+    __slots__ = ("alpha", "count", "mean", "_m2", "min", "max", "ewma")
+
+    def __init__(self, alpha: Optional[float] = None):
+        """
+        Constructor
+        :param alpha: Weight of a new value in the EWMA (0 - 1), None to keep no EWMA
+        """
+        self.alpha = alpha
+        self.clear()
+
+    def clear(self):
+        """Forget all values"""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.ewma = None
+
+    def add(self, value: float):
+        """
+        Add a value (Welford's algorithm, numerically stable)
+        :param value: New value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.count == 1:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        if self.alpha is not None:
+            self.ewma = value if self.ewma is None else self.ewma + self.alpha * (value - self.ewma)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, 0 below 2 values"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, 0 below 2 values"""
+        return math.sqrt(self.variance)
+
+
+class STCC4Rollup:
+    """
+    Statistics of the samples of one sensor in one time bucket
+    sensor : Name of the sensor
+    start : Start time of the bucket, in seconds of the clock of the aggregator
+    period : Length of the bucket in seconds
+    count : Number of samples in the bucket
+    co2, temperature, humidity : (mean, std, min, max) of each field
+    status : Bitwise OR of the status words of the samples
+    """
+
+    __slots__ = ("sensor", "start", "period", "count", "co2", "temperature", "humidity", "status")
+
+    # start f64, period f32, count u32, status u16, then mean, std, min and max f32 of each field: 66 bytes
+    RECORD = struct.Struct("<dfIH12f")
+
+    def __init__(self, sensor: Hashable, start: float, period: float, count: int, co2: Tuple[float, ...],
+                 temperature: Tuple[float, ...], humidity: Tuple[float, ...], status: int):
+        self.sensor = sensor
+        self.start = start
+        self.period = period
+        self.count = count
+        self.co2 = co2
+        self.temperature = temperature
+        self.humidity = humidity
+        self.status = status
+
+    def pack(self) -> bytes:
+        """
+        :return: The record without the sensor name, as RECORD.size bytes
+        """
+        return self.RECORD.pack(self.start, self.period, self.count, self.status,
+                                *self.co2, *self.temperature, *self.humidity)
+
+    @classmethod
+    def unpack(cls, sensor: Hashable, data: bytes) -> "STCC4Rollup":
+        """
+        :param sensor: Name of the sensor the record belongs to
+        :param data: Bytes returned by pack()
+        :return: The record
+        """
+        values = cls.RECORD.unpack(data)
+        return cls(sensor, values[0], values[1], values[2], values[4:8], values[8:12], values[12:16], values[3])
+
+    def __repr__(self) -> str:
+        return "STCC4Rollup(%r, start=%.0f, period=%g, count=%d, co2=%.1f)" % (
+            self.sensor, self.start, self.period, self.count, self.co2[0])
+
+
+class _Bucket:
+    """Statistics of the current bucket of one period of one sensor"""
+
+    __slots__ = ("index", "floor", "stats", "status")
+
+    def __init__(self):
+        self.index = None
+        # Lowest bucket index a sample may still go to, the buckets below it were already passed or emitted
+        self.floor = -math.inf
+        self.stats = [RunningStats() for _ in FIELDS]
+        self.status = 0
+
+
+class STCC4Aggregator:
+    """Running statistics and rollups of many sensors"""
+
+    def __init__(self, periods: Sequence[float] = (60.0, 900.0), alpha: float = 0.1,
+                 callback: Optional[Callable[[STCC4Rollup], object]] = None, clock: Callable[[], float] = time.time):
+        """
+        Constructor
+        :param periods: Lengths in seconds of the buckets of the rollups, e.g. 1 min and 15 min;
+        buckets are aligned on multiples of their period on the clock
+        :param alpha: Weight of a new sample in the EWMA of the running statistics
+        :param callback: Called with every STCC4Rollup when its bucket ends, None to only keep the running statistics
+        :param clock: Time of the samples fed without a timestamp; wall clock by default, so the rollups can be
+        compared across hosts
+        """
+        self.periods = tuple(periods)
+        self.alpha = alpha
+        self.callback = callback
+        self.clock = clock
+        # Samples left out of the rollups because their bucket was already closed
+        self.late = 0
+        # Sensor -> (running statistics of each field, current bucket of each period)
+        self._sensors = {}
+
+    def feed(self, sensor: Hashable, sample: Optional[Tuple[int, float, float, int]], timestamp: Optional[float] = None):
+        """
+        Add a sample of a sensor, closing the buckets it is past
+        A sample older than the current bucket of a period is left out of that period's rollups (counted in late),
+        so a closed bucket is never emitted twice; it still counts in the running statistics.
+        :param sensor: Name of the sensor
+        :param sample: (co2_concentration, temperature, humidity, sensor_status) as returned by measurement(),
+        None (a failed read) is ignored
+        :param timestamp: Time of the sample on the clock of the aggregator, clock() if None
+        """
+        if sample is None:
+            return
+        if timestamp is None:
+            timestamp = self.clock()
+        entry = self._sensors.get(sensor)
+        if entry is None:
+            entry = self._sensors[sensor] = ([RunningStats(self.alpha) for _ in FIELDS],
+                                             [_Bucket() for _ in self.periods])
+        running, buckets = entry
+        co2, temperature, humidity, status = sample
+        running[0].add(co2)
+        running[1].add(temperature)
+        running[2].add(humidity)
+        late = False
+        for period, bucket in zip(self.periods, buckets):
+            index = int(timestamp // period)
+            if index != bucket.index:
+                if index < bucket.floor:
+                    late = True
+                    continue
+                if bucket.index is not None:
+                    self._close(sensor, period, bucket)
+                bucket.index = bucket.floor = index
+            stats = bucket.stats
+            stats[0].add(co2)
+            stats[1].add(temperature)
+            stats[2].add(humidity)
+            bucket.status |= status
+        if late:
+            self.late += 1
+
+    def feed_batch(self, batch):
+        """
+        Add the samples of a poll, usable as the callback of STCC4Poller.run()
+        :param batch: DFRobot_STCC4_poller.STCC4Batch, its samples are timed by the clock of the aggregator
+        """
+        timestamp = self.clock()
+        for sensor, sample in batch.samples.items():
+            self.feed(sensor, sample, timestamp)
+
+    def stats(self, sensor: Hashable, field: str = "co2") -> Optional[RunningStats]:
+        """
+        :param sensor: Name of the sensor
+        :param field: "co2", "temperature" or "humidity"
+        :return: Running statistics of the field over all samples of the sensor, None if it sent none
+        """
+        entry = self._sensors.get(sensor)
+        if entry is None:
+            return None
+        return entry[0][FIELDS.index(field)]
+
+    def flush(self) -> List[STCC4Rollup]:
+        """
+        Close the current buckets of all sensors early, e.g. before exiting
+        :return: The rollups of the partial buckets, also passed to the callback
+        """
+        rollups = []
+        for sensor, (_, buckets) in self._sensors.items():
+            for period, bucket in zip(self.periods, buckets):
+                if bucket.index is not None:
+                    rollups.append(self._close(sensor, period, bucket))
+        return rollups
+
+    @property
+    def sensors(self) -> List[Hashable]:
+        """Names of the sensors that sent samples"""
+        return list(self._sensors)
+
+    def _close(self, sensor: Hashable, period: float, bucket: _Bucket) -> STCC4Rollup:
+        """Emit the rollup of a bucket and empty it"""
+        co2, temperature, humidity = [(stats.mean, stats.std, stats.min, stats.max) for stats in bucket.stats]
+        rollup = STCC4Rollup(sensor, bucket.index * period, period, bucket.stats[0].count, co2, temperature, humidity,
+                             bucket.status)
+        for stats in bucket.stats:
+            stats.clear()
+        bucket.status = 0
+        bucket.floor = bucket.index + 1
+        bucket.index = None
+        if self.callback is not None:
+            self.callback(rollup)
+        return rollup
@@ -0,0 +1,85 @@
+"""!
+    * @file DFRobot_STCC4_status.py
+    * @brief Named flags of the STCC4 status word
+    * @n The sensor_status word of measurement() is decoded into an STCC4Status IntFlag. Decoded values are cached
+    * @n by status word, so after the first sample decoding is one dict lookup and never builds a new flag.
+    * @n The sensor does not report whether its SHT4x is attached: without it the temperature and humidity words
+    * @n read back are exactly the compensation written (or the power-up defaults), which sample_status() turns
+    * @n into the synthetic NO_RHT_SENSOR flag, above the 16 bits of the status word.
+    * @copyright	Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    * @license The MIT License (MIT)
+    * @author [lbx](liubx8023@gmail.com)
+    * @version V1.0
+    * @date 2025-10-30
+    * @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+from enum import IntFlag
+from typing import Optional
+
+from DFRobot_STCC4 import DFRobot_STCC4_I2C, STCC4Measurement
+
+# Raw temperature and humidity words read without an SHT4x and without compensation: 25 degrees Celsius, 50 %RH
+DEFAULT_RHT_RAW = DFRobot_STCC4_I2C.DEFAULT_RHT_RAW
+
+
+class STCC4Status(IntFlag):
+    """Flags of a sample: the bits of the status word, and NO_RHT_SENSOR derived from the sample"""
+
+    TESTING_MODE = 0x4000       # set while enable_testing_mode() is active
+    NO_RHT_SENSOR = 0x10000     # not in the status word: temperature and humidity are the compensation values
+
+
+# Samples a poller built with reject_status=BAD_SAMPLE leaves out
+BAD_SAMPLE = STCC4Status.TESTING_MODE | STCC4Status.NO_RHT_SENSOR
+
+_CACHE = {}
+
+
+def decode_status(status: int) -> STCC4Status:
+    """
+    :param status: Status word, optionally ORed with the synthetic flags
+    :return: The flags, unknown bits are kept
+    """
+    flags = _CACHE.get(status)
+    if flags is None:
+        flags = _CACHE[status] = STCC4Status(status)
+    return flags
+
+
+def rht_sensor_missing(sensor: DFRobot_STCC4_I2C, record: Optional[STCC4Measurement] = None) -> bool:
+    """
+    Tell from a sample whether the sensor has no SHT4x attached
+    An attached SHT4x reading exactly the compensation values (to the raw word) is reported as missing too:
+    a false positive that lasts until the temperature or humidity changes by one raw step.
+    :param sensor: Driver instance the sample was read with, for the RHT compensation the sensor may be applying
+    :param record: Decoded measurement, the driver's last_measurement if None
+    :return: True if the raw temperature and humidity are one of sensor.rht_compensation_raw()
+    """
+    if record is None:
+        record = sensor.last_measurement
+    return (record.temp_raw, record.hum_raw) in sensor.rht_compensation_raw()
+
+
+def sample_status(sensor: DFRobot_STCC4_I2C, record: Optional[STCC4Measurement] = None) -> STCC4Status:
+    """
+    Flags of a sample, including NO_RHT_SENSOR
+    :param sensor: Driver instance the sample was read with
+    :param record: Decoded measurement, the driver's last_measurement if None
+    :return: The flags
+    """
+    if record is None:
+        record = sensor.last_measurement
+    status = record.sensor_status
+    if rht_sensor_missing(sensor, record):
+        status |= STCC4Status.NO_RHT_SENSOR.value
+    return decode_status(status)
+
+
+def status_text(flags: int) -> str:
+    """
+    :param flags: Flags returned by decode_status() or sample_status()
+    :return: Names of the flags set, e.g. "TESTING_MODE|NO_RHT_SENSOR", "OK" if none
+    """
+    names = [flag.name for flag in STCC4Status if flags & flag]
+    return "|".join(names) if names else "OK"
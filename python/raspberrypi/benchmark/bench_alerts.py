@@ -0,0 +1,56 @@
+"""!
+    @file bench_alerts.py
+    @brief Benchmark of the alert engine: cost of one sample as the number of rules of the building grows.
+    @n Every sensor gets the same 5 rules (2 thresholds, a slope, a status bit and a stale timeout), and the
+    @n samples of all sensors are fed in turn; the cost per sample should not depend on the number of sensors.
+    @details Usage: python3 bench_alerts.py
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+"""
+
+import random
+import sys
+import time
+sys.path.append("./..")
+from DFRobot_STCC4_alerts import STCC4AlertEngine, SlopeRule, StaleRule, StatusRule, ThresholdRule
+
+SAMPLES = 200000
+
+def make_engine(sensors):
+    engine = STCC4AlertEngine(lambda alert: None)
+    names = ["room%d" % i for i in range(sensors)]
+    for name in names:
+        engine.add_rule(ThresholdRule("co2_high", 1500, 1200), [name])
+        engine.add_rule(ThresholdRule("too_cold", 16, 17, "temperature"), [name])
+        engine.add_rule(SlopeRule("co2_rising", 50, window=300), [name])
+        engine.add_rule(StatusRule("testing_mode", 0x4000), [name])
+    engine.add_rule(StaleRule("stale", 60))
+    return engine, names
+
+def main():
+    rng = random.Random(1)
+    samples = [(rng.randrange(400, 2000), rng.uniform(15, 25), rng.uniform(30, 60), rng.choice((0, 0, 0, 0x4000)))
+               for _ in range(1000)]
+    print(f"{'sensors':>8} {'rules':>7} {'us/sample':>10} {'alerts':>8}")
+    for sensors in (10, 100, 1000, 10000):
+        engine, names = make_engine(sensors)
+        alerts = []
+        engine.add_callback(alerts.append)
+        feed = engine.feed
+        timestamp = 0.0
+        start = time.perf_counter()
+        for i in range(SAMPLES):
+            if i % sensors == 0:
+                timestamp += 1.0
+            feed(names[i % sensors], samples[i % 1000], timestamp)
+        elapsed = time.perf_counter() - start
+        engine.check(timestamp)
+        print(f"{sensors:>8} {4 * sensors + 1:>7} {elapsed / SAMPLES * 1e6:>10.2f} {len(alerts):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""!
+    @file bench_crc.py
+    @brief Micro-benchmark of the CRC-8 engine used by the STCC4 driver.
+    @n Compares the table-driven calculation_crc/check_crc_frame against the original bit-by-bit loop,
+    @n on a single word (as used by _write_data) and on the 12-byte measurement and 18-byte ID frames.
+    @details Experimental phenomenon: The timings of each variant will be output in the terminal. No sensor is needed.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+"""
+
+import sys
+import timeit
+sys.path.append("./..")
+from DFRobot_STCC4 import DFRobot_STCC4
+
+# Number of calls per timing run and number of runs (the best run is reported).
+NUMBER = 20000
+REPEAT = 5
+
+def crc_bitwise(data):
+    """Reference implementation: the original bit-by-bit CRC-8 loop."""
+    crc = 0xFF
+    for value in data:
+        for byte in ((value >> 8) & 0xFF, value & 0xFF):
+            crc ^= byte
+            for _ in range(8):
+                if crc & 0x80:
+                    crc = (crc << 1) ^ 0x31
+                else:
+                    crc <<= 1
+                crc &= 0xFF
+    return crc
+
+def frame_bitwise(frame):
+    """Reference frame check: one bit-by-bit CRC per word, as done in get_id."""
+    mask = 0
+    for n, i in enumerate(range(0, len(frame) - 2, 3)):
+        if crc_bitwise([(frame[i] << 8) | frame[i + 1]]) == frame[i + 2]:
+            mask |= 1 << n
+    return mask
+
+def make_frame(words):
+    """Build a raw [MSB, LSB, CRC] * n frame."""
+    frame = bytearray()
+    for value in words:
+        frame += bytes(((value >> 8) & 0xFF, value & 0xFF, crc_bitwise([value])))
+    return bytes(frame)
+
+def bench(label, func):
+    best = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+    ns = best / NUMBER * 1e9
+    print(f"{label:<40} {ns:10.1f} ns/call")
+    return ns
+
+def main():
+    crc = DFRobot_STCC4()
+    measure_frame = make_frame([0x01F4, 0x6666, 0x8000, 0x0000])
+    id_frame = make_frame([0x0901, 0x018A, 0x0000, 0x0000, 0x1234, 0x5678])
+
+    # The table engine must agree with the reference loop on every 16-bit word.
+    for value in range(0x10000):
+        assert crc.calculation_crc([value]) == crc_bitwise([value])
+    assert crc.check_crc_frame(measure_frame) == frame_bitwise(measure_frame) == 0x0F
+    assert crc.check_crc_frame(id_frame) == frame_bitwise(id_frame) == 0x3F
+
+    print(f"CRC-8 benchmark, best of {REPEAT} x {NUMBER} calls\n")
+    a = bench("bitwise  calculation_crc (1 word)", lambda: crc_bitwise([0x6666]))
+    b = bench("table    calculation_crc (1 word)", lambda: crc.calculation_crc([0x6666]))
+    print(f"{'speedup':<40} {a / b:10.1f} x\n")
+    a = bench("bitwise  12-byte measurement frame", lambda: frame_bitwise(measure_frame))
+    b = bench("table    check_crc_frame (12 bytes)", lambda: crc.check_crc_frame(measure_frame))
+    print(f"{'speedup':<40} {a / b:10.1f} x\n")
+    a = bench("bitwise  18-byte ID frame", lambda: frame_bitwise(id_frame))
+    b = bench("table    check_crc_frame (18 bytes)", lambda: crc.check_crc_frame(id_frame))
+    print(f"{'speedup':<40} {a / b:10.1f} x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""!
+    @file bench_decode.py
+    @brief Benchmark of the decoding of archived measurement frames: read_measurement() one frame at a time
+    @n against the vectorized decode_frames() of DFRobot_STCC4_frames (needs NumPy).
+    @n That both decoders give identical values, including on frames with a corrupted CRC, is checked by tests/test_frames.py.
+    @details Usage: python3 bench_decode.py [number of frames, default 1000000]
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+"""
+
+import random
+import sys
+import time
+sys.path.append("./..")
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C, STCC4Bus, STCC4Measurement
+import DFRobot_STCC4_frames
+from DFRobot_STCC4_frames import decode_frames
+
+class ArchiveBus(STCC4Bus):
+    """Answers every read with the next frame of an archive"""
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.offset = 0
+
+    def write_read(self, addr, wbuf, wlength, rbuf, rlength):
+        rbuf[:rlength] = self.archive[self.offset:self.offset + rlength]
+        self.offset += 12
+
+def make_archive(count, corrupt_every=97):
+    crc = DFRobot_STCC4()
+    rng = random.Random(1)
+    archive = bytearray()
+    for i in range(count):
+        frame = bytearray()
+        for value in (rng.randrange(400, 5000), rng.randrange(0x10000), rng.randrange(0x10000), rng.choice((0, 0x4000))):
+            frame += bytes((value >> 8, value & 0xFF, crc.calculation_crc([value])))
+        if i % corrupt_every == 0:
+            frame[3 * (i % 4) + 2] ^= 0x5A
+        archive += frame
+    return bytes(archive)
+
+def decode_python(archive):
+    """Decode through the driver, as a reprocessing script without NumPy would"""
+    sensor = DFRobot_STCC4_I2C(0x64, ArchiveBus(archive))
+    record = STCC4Measurement()
+    results = []
+    for _ in range(len(archive) // 12):
+        if sensor.read_measurement(record) == sensor.ERR_OK:
+            results.append((record.co2_concentration, record.temperature, record.humidity, record.sensor_status))
+        else:
+            results.append(None)
+    return results
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    if DFRobot_STCC4_frames.np is None:
+        sys.exit("bench_decode.py needs NumPy: pip install numpy")
+
+    archive = make_archive(count)
+    start = time.perf_counter()
+    decode_python(archive)
+    python_time = time.perf_counter() - start
+    start = time.perf_counter()
+    decode_frames(archive)
+    numpy_time = time.perf_counter() - start
+    print(f"{count} frames: read_measurement {python_time:.2f} s, decode_frames {numpy_time:.3f} s "
+          f"({python_time / numpy_time:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""!
+    @file bench_driver.py
+    @brief Benchmark suite of the STCC4 driver hot paths, run against the simulated bus (no sensor is needed).
+    @n Covers calculation_crc, measurement() decode, the status flags of a sample, _write_data, a compensation skipped by the cache, get_id with retries and the full init sequence
+    @n (wakeup, get_id, RHT/pressure compensation, start_measurement), reads behind a TCA9548A multiplexer (including reads the sensor refuses), a read of a dead sensor whose
+    @n circuit breaker is open, and an append to the sample log (in a temporary directory). The fixed delays of the driver are set to 0,
+    @n so the figures are the CPU cost of the driver itself. The simulated bus allocates its responses on every
+    @n transaction, which the alloc figures of the cases on it include; read_measurement_replay reads a fixed frame
+    @n instead, and the noop case gives the baseline of the measurement to subtract.
+    @n For each case: ops/s, p50/p99 latency, bytes allocated per call (tracemalloc peak above the baseline) and
+    @n blocks retained per call (sys.getallocatedblocks delta, anything above 0 is a leak).
+    @n Results are written as JSON (to the temporary directory unless --output is given); with --baseline, each case is compared with a previous run and the script exits
+    @n with status 1 if one got slower than --threshold.
+    @details Usage: python3 bench_driver.py [--output results.json] [--baseline old.json] [--threshold 1.2]
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.append("./..")
+from DFRobot_STCC4 import CircuitBreaker, DFRobot_STCC4, DFRobot_STCC4_I2C, RetryPolicy, STCC4Bus
+from DFRobot_STCC4_bus import TCA9548A
+from DFRobot_STCC4_history import STCC4History
+from DFRobot_STCC4_log import STCC4Log
+from DFRobot_STCC4_metrics import STCC4Metrics
+from DFRobot_STCC4_sim import STCC4SimBus, SimulatedSTCC4, SimulatedTCA9548A
+from DFRobot_STCC4_status import sample_status
+
+# Calls per case, and calls used for the allocation figures.
+NUMBER = 5000
+ALLOC_NUMBER = 200
+
+def make_sensor():
+    """Driver on a simulated bus, with all fixed delays removed"""
+    bus = STCC4SimBus()
+    # A new sample is available at every read
+    bus.attach(0x64, SimulatedSTCC4(co2=650, measurement_interval=1e-9))
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    sensor.START_STOP_DELAY = 0
+    sensor.GET_ID_RETRY_DELAY = 0
+    sensor.FRC_DELAY = 0
+    return sensor, bus
+
+class ReplayBus(STCC4Bus):
+    """Answers every read with the same valid frame, so the driver's own allocations are measured without the simulator's"""
+
+    def __init__(self, co2=650):
+        crc = DFRobot_STCC4()
+        self.frame = bytearray()
+        for value in (co2, 0x6666, 0x72AF, 0):
+            self.frame += bytes((value >> 8, value & 0xFF, crc.calculation_crc([value])))
+
+    def write_read(self, addr, wbuf, wlength, rbuf, rlength):
+        rbuf[:rlength] = self.frame
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def run_case(name, func, number=NUMBER):
+    # Warm up, then time every call individually
+    for _ in range(min(100, number)):
+        func()
+    timings = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(number):
+        t = clock()
+        func()
+        timings.append(clock() - t)
+    total = clock() - start
+    timings.sort()
+
+    # Transient allocations: peak traced memory of a call above the memory before it
+    tracemalloc.start()
+    peak = 0
+    for _ in range(ALLOC_NUMBER):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        peak += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    # Retained allocations
+    blocks = sys.getallocatedblocks()
+    for _ in range(ALLOC_NUMBER):
+        func()
+    retained = (sys.getallocatedblocks() - blocks) / ALLOC_NUMBER
+
+    return {
+        "name": name,
+        "calls": number,
+        "ops_per_s": number / (total / 1e9),
+        "p50_us": percentile(timings, 0.50) / 1e3,
+        "p99_us": percentile(timings, 0.99) / 1e3,
+        "alloc_bytes_per_call": peak / ALLOC_NUMBER,
+        "retained_blocks_per_call": retained,
+    }
+
+def cases():
+    sensor, bus = make_sensor()
+    sensor._write_cmd16(sensor.STCC4_START_CONT_MEASURE)
+
+    def measurement():
+        assert sensor.measurement() is not None
+
+    def read_measurement():
+        assert sensor.read_measurement() == sensor.ERR_OK
+
+    # Without the simulator, which builds its response words and frame on every read: what remains is the
+    # float objects of the record (and the baseline of the measurement itself, see the "noop" case)
+    replay_sensor = DFRobot_STCC4_I2C(0x64, ReplayBus())
+
+    def read_measurement_replay():
+        assert replay_sensor.read_measurement() == replay_sensor.ERR_OK
+
+    metrics_sensor, metrics_bus = make_sensor()
+    metrics_sensor.set_metrics(STCC4Metrics())
+    metrics_sensor._write_cmd16(metrics_sensor.STCC4_START_CONT_MEASURE)
+
+    def measurement_metrics():
+        assert metrics_sensor.measurement() is not None
+
+    history_sensor, history_bus = make_sensor()
+    history_sensor.set_history(STCC4History(1000))
+    history_sensor._write_cmd16(history_sensor.STCC4_START_CONT_MEASURE)
+
+    def measurement_history():
+        assert history_sensor.measurement() is not None
+
+    # Two sensors at the same address behind a multiplexer, read in turn: one channel select per read,
+    # and reads on the channel already selected
+    mux_bus = STCC4SimBus()
+    sim_mux = mux_bus.attach(TCA9548A.DEFAULT_ADDR, SimulatedTCA9548A())
+    mux = TCA9548A(mux_bus)
+    mux_sensors = []
+    for channel in range(2):
+        sim_mux.attach(channel, 0x64, SimulatedSTCC4(co2=650, measurement_interval=1e-9))
+        mux_sensor = DFRobot_STCC4_I2C(0x64, mux.channel(channel))
+        mux_sensor._write_cmd16(mux_sensor.STCC4_START_CONT_MEASURE)
+        mux_sensors.append(mux_sensor)
+
+    def measurement_mux_switch():
+        assert mux_sensors[0].measurement() is not None
+        assert mux_sensors[1].measurement() is not None
+
+    def measurement_mux_same():
+        assert mux_sensors[1].measurement() is not None
+
+    # A sensor on a third channel polled faster than it samples, as in practice: its reads are refused (NACK)
+    # and must not make the multiplexer select the channel again
+    sim_mux.attach(2, 0x64, SimulatedSTCC4(co2=650, measurement_interval=3600))
+    nack_sensor = DFRobot_STCC4_I2C(0x64, mux.channel(2))
+    nack_sensor._write_cmd16(nack_sensor.STCC4_START_CONT_MEASURE)
+
+    def measurement_mux_not_ready():
+        assert nack_sensor.measurement() is None
+        assert mux.selected == 2
+
+    log = STCC4Log(tempfile.mkdtemp(prefix="bench_stcc4_log_"), segment_records=1 << 16, max_segments=2)
+
+    def log_append():
+        # Includes the sync to storage every sync_every records
+        log.append_measurement(history_sensor.last_measurement)
+
+    words = sensor._rht_words(25, 50)
+
+    def write_data():
+        assert sensor._write_data(sensor.STCC4_SET_RHT_COMPENSATION, words)
+
+    def rht_compensation_unchanged():
+        # Same value as the previous call: skipped by the compensation cache, no transaction
+        assert sensor.set_rht_compensation(25, 50)
+
+    id_sensor, id_bus = make_sensor()
+
+    def get_id():
+        assert id_sensor.get_id() == id_sensor.STCC4_PRODUCT_ID
+
+    def get_id_retries():
+        # The first two attempts are not acknowledged
+        id_bus.fail_next(2)
+        assert id_sensor.get_id() == id_sensor.STCC4_PRODUCT_ID
+
+    # Nothing answers at 0x65: the circuit opens during the warm-up, after which reads fail without a transaction
+    dead_sensor = DFRobot_STCC4_I2C(0x65, bus)
+    dead_sensor.set_retry_policy(RetryPolicy(base_delay=0), CircuitBreaker())
+
+    def dead_sensor_breaker():
+        assert dead_sensor.measurement() is None
+
+    init_sensor, init_bus = make_sensor()
+
+    def init_sequence():
+        # As after a power cycle: nothing known about the compensation of the sensor
+        init_sensor.invalidate_compensation()
+        init_sensor.wakeup()
+        assert init_sensor.get_id() == init_sensor.STCC4_PRODUCT_ID
+        assert init_sensor.set_rht_compensation(26, 55)
+        assert init_sensor.set_pressure_compensation(950)
+        assert init_sensor.start_measurement()
+        init_sensor._write_cmd16(init_sensor.STCC4_STOP_CONT_MEASURE)
+
+    return [
+        ("noop", lambda: None),
+        ("calculation_crc", lambda: sensor.calculation_crc([0x6666])),
+        ("check_crc_frame_12", lambda: sensor.check_crc_frame(sensor._rx_buf, 12)),
+        ("measurement", measurement),
+        ("read_measurement", read_measurement),
+        ("read_measurement_replay", read_measurement_replay),
+        ("measurement_metrics", measurement_metrics),
+        ("measurement_history", measurement_history),
+        ("sample_status", lambda: sample_status(sensor)),
+        ("measurement_mux_same", measurement_mux_same),
+        ("measurement_mux_2ch", measurement_mux_switch),
+        ("measurement_mux_nack", measurement_mux_not_ready),
+        ("log_append", log_append),
+        ("write_data_rht", write_data),
+        ("rht_comp_cached", rht_compensation_unchanged),
+        ("get_id", get_id),
+        ("get_id_2_retries", get_id_retries),
+        ("dead_sensor_breaker", dead_sensor_breaker),
+        ("init_sequence", init_sequence),
+    ]
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = {case["name"]: case for case in json.load(f)["results"]}
+    regressions = []
+    print(f"\ncompared with {baseline_path} (p50 ratio, > {threshold:.2f} is a regression)")
+    for case in results:
+        old = baseline.get(case["name"])
+        if old is None:
+            continue
+        ratio = case["p50_us"] / old["p50_us"] if old["p50_us"] else 1.0
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"  {case['name']:<20} {ratio:6.2f}{flag}")
+        if flag:
+            regressions.append(case["name"])
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="STCC4 driver benchmark suite")
+    # Not in the source tree by default, where the results would be left as an untracked file
+    parser.add_argument("--output", default=os.path.join(tempfile.gettempdir(), "bench_driver.json"),
+                        help="JSON file the results are written to, bench_driver.json in the temporary directory by default")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="p50 slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'case':<20} {'ops/s':>12} {'p50 us':>9} {'p99 us':>9} {'alloc B':>9} {'retained':>9}")
+    for name, func in cases():
+        case = run_case(name, func)
+        results.append(case)
+        print(f"{name:<20} {case['ops_per_s']:12.0f} {case['p50_us']:9.2f} {case['p99_us']:9.2f} "
+              f"{case['alloc_bytes_per_call']:9.1f} {case['retained_blocks_per_call']:9.2f}")
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
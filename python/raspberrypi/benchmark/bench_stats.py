@@ -0,0 +1,56 @@
+"""!
+    @file bench_stats.py
+    @brief Benchmark of the streaming statistics of DFRobot_STCC4_stats against recomputing them over lists.
+    @n A day of 1 Hz samples of one sensor goes through STCC4Aggregator (1 min and 15 min rollups), and through
+    @n the list approach: keep the samples of the current minute and recompute mean/std/min/max on each sample.
+    @n The bytes shipped upstream are compared too: every sample as text, against the packed rollups.
+    @details Usage: python3 bench_stats.py
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+"""
+
+import random
+import statistics
+import sys
+import time
+sys.path.append("./..")
+from DFRobot_STCC4_stats import STCC4Aggregator, STCC4Rollup
+
+SAMPLES = 86400
+
+def main():
+    rng = random.Random(1)
+    samples = [(rng.randrange(400, 2000), rng.uniform(15, 25), rng.uniform(30, 60), 0) for _ in range(SAMPLES)]
+
+    rollups = []
+    aggregator = STCC4Aggregator(callback = rollups.append)
+    start = time.perf_counter()
+    for i, sample in enumerate(samples):
+        aggregator.feed("room", sample, float(i))
+    aggregator.flush()
+    stream_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    window = []
+    for i, sample in enumerate(samples):
+        if i % 60 == 0:
+            window = []
+        window.append(sample[0])
+        statistics.mean(window), statistics.stdev(window) if len(window) > 1 else 0.0, min(window), max(window)
+    list_time = time.perf_counter() - start
+
+    minute = [rollup for rollup in rollups if rollup.period == 60]
+    raw_bytes = sum(len(f"{t},{s[0]},{s[1]:.2f},{s[2]:.2f},{s[3]}\n") for t, s in enumerate(samples))
+    rollup_bytes = len(rollups) * STCC4Rollup.RECORD.size
+    print(f"{SAMPLES} samples: streaming {stream_time / SAMPLES * 1e6:.2f} us/sample (all fields, 2 periods), "
+          f"lists {list_time / SAMPLES * 1e6:.2f} us/sample (co2 of 1 min only)")
+    print(f"{len(minute)} x 1 min + {len(rollups) - len(minute)} x 15 min rollups: {rollup_bytes} bytes "
+          f"against {raw_bytes} bytes of samples as text ({raw_bytes / rollup_bytes:.0f}x less)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""!
+    @file bench_write.py
+    @brief Time the data write path of the STCC4 driver (set_rht_compensation, set_pressure_compensation).
+    @n The driver is connected to a recording mock bus, and the single-transaction write is timed against the original
+    @n path (one write_byte per byte, 10 ms per word). The byte stream itself is checked by tests/test_write.py.
+    @details Experimental phenomenon: The timings will be output in the terminal. No sensor is needed.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+"""
+
+import sys
+import time
+sys.path.append("./..")
+from DFRobot_STCC4 import DFRobot_STCC4_I2C, STCC4Bus
+
+# Emulated cost of one bus transaction in seconds (about 4 bytes at 100 kHz).
+TRANSACTION_TIME = 0.0004
+
+# Number of writes per timing run.
+NUMBER = 20
+
+class RecordingBus(STCC4Bus):
+    """Mock bus recording every write transaction as (address, bytes)"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.transactions = []
+
+    def write(self, addr, buf, length):
+        if self.latency:
+            time.sleep(self.latency)
+        self.transactions.append((addr, bytes(buf[:length])))
+
+def legacy_write_data(sensor, cmd, data):
+    """Reference implementation: the original _write_data (command, then 3 single-byte writes and 10 ms per word)."""
+    if not sensor._write_cmd16(cmd):
+        return False
+    for value in data:
+        for byte in ((value >> 8) & 0xFF, value & 0xFF, sensor.calculation_crc([value])):
+            sensor._bus.write(sensor._device_addr, bytearray((byte,)), 1)
+        time.sleep(0.01)
+    return True
+
+def bench(label, func, bus):
+    del bus.transactions[:]
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        func()
+    elapsed = (time.perf_counter() - start) / NUMBER
+    print(f"{label:<36} {elapsed * 1000:8.2f} ms/call  {len(bus.transactions) // NUMBER:3d} transactions/call")
+    return elapsed
+
+def main():
+    bus = RecordingBus(TRANSACTION_TIME)
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    words = sensor._rht_words(25, 50)
+    print(f"set_rht_compensation, {TRANSACTION_TIME * 1000:.1f} ms per bus transaction\n")
+    a = bench("legacy   per-byte writes + sleeps", lambda: legacy_write_data(sensor, sensor.STCC4_SET_RHT_COMPENSATION, words), bus)
+    b = bench("current  single transaction", lambda: sensor._write_data(sensor.STCC4_SET_RHT_COMPENSATION, words), bus)
+    print(f"{'speedup':<36} {a / b:8.1f} x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""!
+    @file asyncRead.py
+    @brief This routine continuously reads sensor data with the asyncio variant of the driver.
+    @n The waits of the driver are awaited, so the event loop keeps running other tasks meanwhile.
+    @n If the temperature and humidity sensors are not connected, the obtained temperature and humidity values is the default values.
+    @details Experimental phenomenon: The read data will be output in the terminal.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import asyncio
+import sys
+sys.path.append("./..")
+from DFRobot_STCC4_async import AsyncDFRobot_STCC4
+
+# Temperature (10 - 40℃), humidity (20 - 80%RH) and pressure (400 - 1100 hPa) compensation.
+tCompensation = 26
+hCompensation = 55
+pCompensation = 950
+
+# The sensor can communicate via two specific addresses (0x64 and 0x65).
+ADDR = 0x64
+
+async def main():
+    print("This is a demo of reading sensor data with asyncio.\n")
+    sensor = AsyncDFRobot_STCC4(ADDR)
+
+    await sensor.wakeup()
+    await asyncio.sleep(0.01)
+
+    # The ID values read should all be 0x901018A.
+    print(f"ID: 0x{await sensor.get_id():X}")
+
+    if await sensor.set_rht_compensation(tCompensation, hCompensation):
+        print("Set RHT compensation successful.")
+    else:
+        print("Set RHT compensation error!")
+
+    if await sensor.set_pressure_compensation(pCompensation):
+        print("Set pressure compensation successful.")
+    else:
+        print("Set pressure compensation error!")
+
+    await sensor.start_measurement()
+    try:
+        while True:
+            await asyncio.sleep(2)
+            result = await sensor.measurement()
+            if result is not None:
+                co2Concentration, temperature, humidity, sensorStatus = result
+                print(f"CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {sensorStatus}")
+    finally:
+        await sensor.stop_measurement()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user")
@@ -0,0 +1,82 @@
+"""!
+    @file autoCompensation.py
+    @brief This routine continuously reads several sensors while their compensation follows external readings.
+    @n The temperature and humidity are read from text files (for example written by another sensor's program),
+    @n and the pressure is taken from a queue standing in for a message client. The pipeline smooths the values,
+    @n clamps them to the accepted ranges and pushes them to all sensors once a minute.
+    @details Experimental phenomenon: The read data of every sensor and the compensation in use will be output in the terminal.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import queue
+import sys
+import time
+sys.path.append("./..")
+from DFRobot_STCC4_compensation import (HUMIDITY, PRESSURE, TEMPERATURE, STCC4CompensationPipeline,
+                                        file_source, queue_source)
+from DFRobot_STCC4_poller import STCC4Poller
+
+# The sensors to poll, as (I2C bus, I2C address).
+SENSORS = [(1, 0x64), (1, 0x65)]
+
+# Files holding the current temperature (℃) and humidity (%RH) as plain numbers.
+TEMPERATURE_FILE = "/tmp/temperature"
+HUMIDITY_FILE = "/tmp/humidity"
+
+# Poll period in seconds.
+INTERVAL = 2
+
+# The compensation is read every 10 seconds and pushed to the sensors every 60 seconds.
+SAMPLE_INTERVAL = 10
+PUSH_INTERVAL = 60
+
+poller = STCC4Poller()
+pipeline = STCC4CompensationPipeline(push_interval = PUSH_INTERVAL, sample_interval = SAMPLE_INTERVAL)
+
+# A message client would put the barometer readings (hPa) into this queue.
+pressure_queue = queue.Queue()
+
+def setup():
+    print("This is a demo of compensating several sensors from external readings.\n")
+
+    for bus, addr in SENSORS:
+        poller.add_sensor(bus, addr)
+
+    pipeline.add_source(TEMPERATURE, file_source(TEMPERATURE_FILE))
+    pipeline.add_source(HUMIDITY, file_source(HUMIDITY_FILE))
+    pipeline.add_source(PRESSURE, queue_source(pressure_queue))
+    pipeline.add_poller(poller)
+
+    poller.broadcast(lambda sensor: sensor.wakeup())
+    time.sleep(0.01)
+    poller.broadcast(lambda sensor: sensor.start_measurement())
+
+    # The pipeline runs in the background, sharing the bus locks of the poller.
+    pressure_queue.put(1013)
+    pipeline.start()
+
+def show(batch):
+    print(f"compensation: {pipeline.value(TEMPERATURE)} ℃  {pipeline.value(HUMIDITY)} %  {pipeline.value(PRESSURE)} hPa")
+    for (bus, addr), result in batch.samples.items():
+        if result is None:
+            print(f"  bus {bus} addr 0x{addr:02X}: read error {batch.errors[(bus, addr)]}")
+            continue
+        co2Concentration, temperature, humidity, sensorStatus = result
+        print(f"  bus {bus} addr 0x{addr:02X}: CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {sensorStatus}")
+
+if __name__ == "__main__":
+    try:
+        setup()
+        poller.run(INTERVAL, show)
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user")
+        poller.broadcast(lambda sensor: sensor.stop_measurement())
+    finally:
+        pipeline.stop()
+        poller.close()
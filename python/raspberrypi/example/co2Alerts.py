@@ -0,0 +1,54 @@
+"""!
+    @file co2Alerts.py
+    @brief This routine raises alerts on the CO2 concentration of several sensors.
+    @n The CO2 concentration is too high above 1500 ppm (until it falls back below 1200 ppm), rising too fast
+    @n above 50 ppm/min over 5 minutes, and a sensor is stale after 10 seconds without a sample.
+    @n An alert is only printed when it is raised or cleared, not on every sample.
+    @details Experimental phenomenon: The alerts will be output in the terminal.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import sys
+sys.path.append("./..")
+from DFRobot_STCC4_alerts import STCC4AlertEngine, SlopeRule, StaleRule, StatusRule, ThresholdRule
+from DFRobot_STCC4_poller import STCC4Poller
+
+# The sensors to poll, as (I2C bus, I2C address).
+SENSORS = [(1, 0x64), (1, 0x65)]
+
+# Poll period in seconds.
+INTERVAL = 2
+
+def show(alert):
+    bus, addr = alert.sensor
+    state = "RAISED " if alert.active else "cleared"
+    print(f"{state} bus {bus} addr 0x{addr:02X}: {alert.rule} ({alert.value:.0f})")
+
+poller = STCC4Poller()
+engine = STCC4AlertEngine(show)
+engine.add_rule(ThresholdRule("co2 above 1500 ppm", 1500, 1200))
+engine.add_rule(SlopeRule("co2 rising over 50 ppm/min", 50, window = 300))
+engine.add_rule(StatusRule("testing mode", 0x4000))
+engine.add_rule(StaleRule("no sample for 10 s", 10), [(bus, addr) for bus, addr in SENSORS])
+
+def on_batch(batch):
+    engine.feed_batch(batch)
+    engine.check()
+
+if __name__ == "__main__":
+    try:
+        for bus, addr in SENSORS:
+            poller.add_sensor(bus, addr)
+        poller.begin()
+        poller.run(INTERVAL, on_batch)
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user")
+        poller.broadcast(lambda sensor: sensor.stop_measurement())
+    finally:
+        poller.close()
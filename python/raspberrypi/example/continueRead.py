@@ -17,6 +17,7 @@ import sys
 import time
 sys.path.append("./..")  
 from DFRobot_STCC4 import DFRobot_STCC4_I2C
+from DFRobot_STCC4_status import sample_status, status_text
 
 # Set temperature compensation.
 # The range is 10 - 40℃.
@@ -85,13 +86,15 @@ def setup():
 
 def loop():
     while True:
-        time.sleep(2)
-        
-        # Read measurement data
-        result = sensor.measurement()
+        # Wait for the next sample (one per second) and read it as soon as the sensor has it
+        result = sensor.wait_for_sample()
         if result is not None:
             co2Concentration, temperature, humidity, sensorStatus = result
-            print(f"CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {sensorStatus}")
+            # Named flags of the status word, and NO_RHT_SENSOR if no temperature and humidity sensor is connected
+            flags = sample_status(sensor)
+            print(f"CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {status_text(flags)}")
+        else:
+            print("No new measurement")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,49 @@
+"""!
+    @file daemonRead.py
+    @brief This routine reads the CO2 concentration published by the STCC4 daemon, without touching the IIC bus.
+    @n Start the daemon first, in another terminal: python3 ../DFRobot_STCC4_daemon.py --sensor 1:0x64
+    @n Any number of programs like this one can then read the sensor at the same time.
+    @details Experimental phenomenon: The read data will be output in the terminal every 2 seconds.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import sys
+import time
+sys.path.append("./..")
+from DFRobot_STCC4_daemon import STCC4Client
+
+# Name of the sensor in the daemon ("bus:0xaddr"), or its index.
+SENSOR = "1:0x64"
+
+# Samples older than this many seconds are reported as missing.
+MAX_AGE = 5
+
+def main():
+    try:
+        client = STCC4Client(SENSOR, max_age = MAX_AGE)
+    except FileNotFoundError:
+        print("The STCC4 daemon is not running")
+        return
+    print(f"Sensors published by the daemon: {client.names}\n")
+
+    with client:
+        while True:
+            result = client.measurement()
+            if result is not None:
+                co2Concentration, temperature, humidity, sensorStatus = result
+                print(f"CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {sensorStatus}")
+            else:
+                print(f"No recent measurement (error {client.last_error})")
+            time.sleep(2)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user")
@@ -0,0 +1,80 @@
+"""!
+    @file fleetRecalibration.py
+    @brief This routine force-calibrates many sensors on several IIC buses at the same time.
+    @n All sensors must be in the same atmosphere, whose CO2 concentration is known.
+    @n The readings of every sensor are followed until they are stable, then the stable sensors of each bus
+    @n are calibrated together, so the whole fleet takes about as long as a single sensor.
+    @details Experimental phenomenon: The calibration result of every sensor will be output in the terminal.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import sys
+sys.path.append("./..")
+from DFRobot_STCC4 import RetryPolicy
+from DFRobot_STCC4_poller import STCC4Poller
+from DFRobot_STCC4_recalibration import STCC4Recalibrator
+
+# The sensors to calibrate, as (I2C bus, I2C address).
+SENSORS = [(1, 0x64), (1, 0x65), (3, 0x64), (3, 0x65)]
+
+# The target CO2 concentration to calibrate.
+# The input range of CO2 concentration is 0 - 32000 ppm.
+target = 600
+
+# The readings are stable when, over the last 30 samples, their standard deviation is below 15 ppm
+# and they drift by less than 20 ppm. Sensors still not stable after 10 minutes are not calibrated.
+WINDOW = 30
+MAX_STD = 15
+MAX_DRIFT = 20
+SETTLE_TIMEOUT = 600
+
+# Attempts of the calibration of each sensor before giving up.
+FRC_ATTEMPTS = 5
+
+# Retry the failed bus transactions up to 3 times, with a short exponential backoff.
+poller = STCC4Poller(retry_policy = RetryPolicy(max_attempts = 3, base_delay = 0.01))
+
+def show(name, result):
+    bus, addr = name
+    co2Concentration, temperature, humidity, sensorStatus = result
+    print(f"  bus {bus} addr 0x{addr:02X}: CO2: {co2Concentration} ppm")
+
+def main():
+    print("This demo will force-calibrate all sensors based on the CO2 concentration you input.\n")
+
+    for bus, addr in SENSORS:
+        poller.add_sensor(bus, addr)
+
+    # Wake up all sensors, check their IDs and start the measurement on all of them at the same time.
+    for (bus, addr), error in poller.begin().items():
+        if error != 0:
+            print(f"bus {bus} addr 0x{addr:02X}: bring-up failed, error {error}")
+
+    recalibrator = STCC4Recalibrator(poller, window = WINDOW, max_std = MAX_STD, max_drift = MAX_DRIFT,
+                                     settle_timeout = SETTLE_TIMEOUT, frc_attempts = FRC_ATTEMPTS)
+    results = recalibrator.run(target, callback = show)
+
+    print("")
+    for (bus, addr), result in results.items():
+        if not result.stable:
+            print(f"bus {bus} addr 0x{addr:02X}: readings not stable (std {result.std} ppm, drift {result.drift} ppm), not calibrated")
+        elif not result.ok:
+            print(f"bus {bus} addr 0x{addr:02X}: calibration failed {result.attempts} times, giving up")
+        else:
+            print(f"bus {bus} addr 0x{addr:02X}: stable after {result.settle_time:.0f} s at {result.mean:.0f} ppm, "
+                  f"CO2 concentration correction: {result.correction}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user")
+        poller.broadcast(lambda sensor: sensor.stop_measurement())
+    finally:
+        poller.close()
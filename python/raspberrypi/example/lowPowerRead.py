@@ -0,0 +1,42 @@
+"""!
+    @file lowPowerRead.py
+    @brief This routine takes a single shot measurement of several sensors every 10 seconds with the smallest awake time.
+    @n The sensors share one wake window, and sleep for the rest of the sampling interval.
+    @n If the temperature and humidity sensors are not connected, the obtained temperature and humidity values is the default values.
+    @details Experimental phenomenon: The read data and the duty cycle will be output in the terminal.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import sys
+sys.path.append("./..")
+from DFRobot_STCC4 import DFRobot_STCC4_I2C
+from DFRobot_STCC4_scheduler import STCC4SingleShotScheduler
+
+# Sampling interval in seconds.
+INTERVAL = 10
+
+# The sensor can communicate via two specific addresses (0x64 and 0x65).
+ADDRS = [0x64, 0x65]
+
+def show(results):
+    for addr, result in zip(ADDRS, results.values()):
+        if result is None:
+            print(f"0x{addr:02X}: Failed to read measurements")
+            continue
+        co2Concentration, temperature, humidity, sensorStatus = result
+        print(f"0x{addr:02X}: CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {sensorStatus}")
+    print(f"awake {scheduler.last_awake_time * 1000:.0f} ms, duty cycle {scheduler.duty_cycle * 100:.1f} %")
+
+if __name__ == "__main__":
+    print("This is a demo of low power single shot reading.")
+    scheduler = STCC4SingleShotScheduler(INTERVAL, [DFRobot_STCC4_I2C(addr) for addr in ADDRS])
+    try:
+        scheduler.run(show)
+    except KeyboardInterrupt:
+        print("\nStopping...")
@@ -0,0 +1,62 @@
+"""!
+    @file multiRead.py
+    @brief This routine continuously reads several sensors on several IIC buses at the same time.
+    @n Each bus is served by its own thread, and all sensors of one poll share the same timestamp.
+    @n If the temperature and humidity sensors are not connected, the obtained temperature and humidity values is the default values.
+    @details Experimental phenomenon: The read data of every sensor will be output in the terminal.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import sys
+sys.path.append("./..")
+from DFRobot_STCC4_poller import STCC4Poller
+from DFRobot_STCC4_status import STCC4Status, status_text
+
+# The sensors to poll, as (I2C bus, I2C address).
+# The sensor can communicate via two specific addresses (0x64 and 0x65).
+SENSORS = [(1, 0x64), (1, 0x65), (3, 0x64), (3, 0x65)]
+
+# Poll period in seconds.
+INTERVAL = 2
+
+# Samples taken in testing mode are left out of the batches, their status is still reported.
+poller = STCC4Poller(reject_status = STCC4Status.TESTING_MODE)
+
+def setup():
+    print("This is a demo of reading several sensors on several buses.\n")
+
+    for bus, addr in SENSORS:
+        poller.add_sensor(bus, addr)
+
+    # Wake up all sensors, check their IDs and start the measurement on all of them at the same time.
+    for (bus, addr), error in poller.begin().items():
+        if error != 0:
+            print(f"bus {bus} addr 0x{addr:02X}: bring-up failed, error {error}")
+
+def show(batch):
+    print(f"t = {batch.timestamp:.3f} s, poll took {batch.duration * 1000:.1f} ms")
+    for (bus, addr), result in batch.samples.items():
+        if result is None:
+            if (bus, addr) in batch.status:
+                print(f"  bus {bus} addr 0x{addr:02X}: sample left out, status: {status_text(batch.status[(bus, addr)])}")
+            else:
+                print(f"  bus {bus} addr 0x{addr:02X}: read error {batch.errors[(bus, addr)]}")
+            continue
+        co2Concentration, temperature, humidity, sensorStatus = result
+        print(f"  bus {bus} addr 0x{addr:02X}: CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {status_text(batch.status[(bus, addr)])}")
+
+if __name__ == "__main__":
+    try:
+        setup()
+        poller.run(INTERVAL, show)
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user")
+        poller.broadcast(lambda sensor: sensor.stop_measurement())
+    finally:
+        poller.close()
@@ -0,0 +1,65 @@
+"""!
+    @file muxRead.py
+    @brief This routine reads several sensors with the same IIC address through a TCA9548A multiplexer.
+    @n Every sensor keeps the default address 0x64 and sits on its own channel of the multiplexer.
+    @n The multiplexer remembers the channel it has selected, so the channel is only switched when needed.
+    @n The bus is driven directly through /dev/i2c-1, smbus2 is not used.
+    @details Experimental phenomenon: The read data of every sensor will be output in the terminal.
+
+    @copyright Copyright (c) 2025 DFRobot Co.Ltd (http://www.dfrobot.com)
+    @license The MIT License (MIT)
+    @author [lbx](liubx8023@gmail.com)
+    @version V1.0
+    @date 2025-10-30
+    @url https://github.com/DFRobot/DFRobot_STCC4
+ """
+
+import sys
+sys.path.append("./..")
+from DFRobot_STCC4_bus import LinuxI2CBus, TCA9548A
+from DFRobot_STCC4_poller import STCC4Poller
+
+# I2C bus of the multiplexer, and its address (0x70 - 0x77, set by its A0 - A2 pins).
+I2C_BUS = 1
+MUX_ADDR = 0x70
+
+# Channels of the multiplexer with a sensor, every sensor at address 0x64.
+CHANNELS = [0, 1, 2, 3]
+ADDR = 0x64
+
+# Poll period in seconds.
+INTERVAL = 2
+
+mux = TCA9548A(LinuxI2CBus(I2C_BUS), MUX_ADDR, owned = True)
+poller = STCC4Poller()
+
+def setup():
+    print("This is a demo of reading several sensors behind a multiplexer.\n")
+
+    for channel in CHANNELS:
+        poller.add_sensor(mux.channel(channel), ADDR, channel)
+
+    # Wake up all sensors, check their IDs and start the measurement on all of them.
+    for channel, error in poller.begin().items():
+        if error != 0:
+            print(f"channel {channel}: bring-up failed, error {error}")
+
+def show(batch):
+    print(f"t = {batch.timestamp:.3f} s, poll took {batch.duration * 1000:.1f} ms, channel switches so far: {mux.selects}")
+    for channel, result in batch.samples.items():
+        if result is None:
+            print(f"  channel {channel}: read error {batch.errors[channel]}")
+            continue
+        co2Concentration, temperature, humidity, sensorStatus = result
+        print(f"  channel {channel}: CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {sensorStatus}")
+
+if __name__ == "__main__":
+    try:
+        setup()
+        poller.run(INTERVAL, show)
+    except KeyboardInterrupt:
+        print("\nProgram interrupted by user")
+        poller.broadcast(lambda sensor: sensor.stop_measurement())
+    finally:
+        poller.close()
+        mux.close()
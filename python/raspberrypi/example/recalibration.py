@@ -17,7 +17,7 @@
 import sys
 import time
 sys.path.append("./..")  
-from DFRobot_STCC4 import DFRobot_STCC4_I2C
+from DFRobot_STCC4 import DFRobot_STCC4_I2C, RetryPolicy
 
 # The target CO2 concentration to calibrate. 
 # The input range of CO2 concentration is 0 - 32000 ppm.
@@ -26,6 +26,9 @@ target = 600
 # The frc correction values returned by the sensor are generally not used.
 frcCorrection = 0
 
+# Attempts of the calibration before giving up.
+FRC_ATTEMPTS = 5
+
 # The environmental temperature obtained from STCC4. 
 # If no temperature and humidity sensor is connected, this value will be the default value or the set value.
 temperature = 0.0
@@ -63,6 +66,9 @@ ADDR = 0x64
 # Initialize the sensor
 sensor = DFRobot_STCC4_I2C(addr = ADDR)
 
+# Retry the failed bus transactions up to 3 times, with a short exponential backoff.
+sensor.set_retry_policy(RetryPolicy(max_attempts = 3, base_delay = 0.01))
+
 def setup():
     print("This demo will force-calibrate the sensor based on the CO2 concentration you input.\n")
     
@@ -115,11 +121,16 @@ def setup():
     frcCorrection = sensor.forced_recalibration(target)
 
     # The calibration is determined to be valid by checking the value of frc. 
-    # If frc is equal to 0xffff or 0, it is invalid; otherwise, it is valid.
-    while frcCorrection == 0xFFFF or frcCorrection == 0:
+    # If frc is None, equal to 0xffff or 0, it is invalid; otherwise, it is valid.
+    attempts = 1
+    while frcCorrection is None or frcCorrection == 0xFFFF or frcCorrection == 0:
         print("Calibration failed!\n")
+        if attempts >= FRC_ATTEMPTS:
+            print(f"Calibration failed {attempts} times, giving up")
+            return False
         time.sleep(1)  # 1000ms delay
         frcCorrection = sensor.forced_recalibration(target)
+        attempts += 1
         
     print(f"CO2 concentration correction: {frcCorrection}")
 
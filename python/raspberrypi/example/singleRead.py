@@ -91,10 +91,8 @@ def loop():
 
     # Start a single-measurement
     if sensor.single_measurement():
-        time.sleep(0.9)  # 900ms delay
-
-        # Read sensor data
-        result = sensor.measurement()
+        # Read sensor data as soon as the single shot measurement is done
+        result = sensor.wait_for_sample(timeout = 1.0)
         if result is not None:
             co2Concentration, temperature, humidity, sensorStatus = result
             print(f"CO2: {co2Concentration} ppm  temperature: {temperature:.2f} ℃  humidity: {humidity:.2f} %  status: {sensorStatus}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules of the driver sit next to this directory, as for the examples and benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
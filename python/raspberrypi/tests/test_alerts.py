@@ -0,0 +1,66 @@
+import threading
+import time
+from queue import Queue
+
+from DFRobot_STCC4_alerts import StaleRule, StatusRule, STCC4AlertEngine, ThresholdRule
+
+
+def test_callback_may_call_the_engine():
+    engine = STCC4AlertEngine()
+    engine.add_rule(ThresholdRule("high", 1000, 900))
+    seen = []
+    engine.add_callback(lambda alert: seen.append((alert, engine.active())))
+
+    worker = threading.Thread(target=engine.feed, args=("room", (1200, 20.0, 50.0, 0), 1.0), daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+    (alert, active), = seen
+    assert alert.active and active == [alert]
+
+
+def test_alerts_are_delivered_in_transition_order():
+    engine = STCC4AlertEngine()
+    engine.add_rule(StaleRule("stale", 10.0), ["a", "b"])
+    delivered = []
+    blocked = threading.Event()
+    release = threading.Event()
+
+    def callback(alert):
+        if not delivered:
+            # The checking thread is held while delivering its first alert
+            blocked.set()
+            release.wait(5)
+        delivered.append((alert.sensor, alert.active))
+
+    engine.add_callback(callback)
+    checker = threading.Thread(target=engine.check, args=(time.monotonic() + 20,), daemon=True)
+    checker.start()
+    assert blocked.wait(5)
+    # "b" is cleared by another thread while its raise is still waiting to be delivered
+    feeder = threading.Thread(target=engine.feed, args=("b", (400, 20.0, 50.0, 0)), daemon=True)
+    feeder.start()
+    feeder.join(5)
+    assert not feeder.is_alive()
+    release.set()
+    checker.join(5)
+    assert delivered == [("a", True), ("b", True), ("b", False)]
+    assert [alert.sensor for alert in engine.active()] == ["a"]
+
+
+def test_failing_callback_does_not_stop_the_delivery():
+    queue = Queue()
+    engine = STCC4AlertEngine(queue=queue)
+    engine.add_rule(ThresholdRule("high", 1000, 900))
+    engine.add_rule(StatusRule("testing", 0x4000))
+    seen = []
+
+    def failing(alert):
+        raise RuntimeError("consumer failed")
+
+    engine.add_callback(failing)
+    engine.add_callback(seen.append)
+    engine.feed("room", (1200, 20.0, 50.0, 0x4000), 1.0)
+    assert [alert.rule for alert in seen] == ["high", "testing"]
+    assert queue.qsize() == 2
+    assert isinstance(engine.delivery_error, RuntimeError)
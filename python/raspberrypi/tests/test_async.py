@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+from DFRobot_STCC4_async import AsyncDFRobot_STCC4
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+
+
+def test_is_sample_ready_across_start_stop():
+    async def main():
+        bus = STCC4SimBus()
+        bus.attach(0x64, SimulatedSTCC4(measurement_interval=0.1))
+        sensor = AsyncDFRobot_STCC4(0x64, bus)
+        sensor.sensor.MEASUREMENT_INTERVAL = 0.1
+        sensor.sensor.START_STOP_DELAY = 0.01
+        assert not sensor.is_sample_ready()
+        assert await sensor.start_measurement()
+        await asyncio.sleep(0.15)
+        assert sensor.is_sample_ready()
+        assert await sensor.wait_for_sample(1.0) is not None
+        assert not sensor.is_sample_ready()
+        assert await sensor.stop_measurement()
+        await asyncio.sleep(0.15)
+        assert not sensor.is_sample_ready()
+
+    asyncio.run(main())
+
+
+def test_forced_recalibration_validates_like_the_sync_driver():
+    async def main():
+        bus = STCC4SimBus()
+        bus.attach(0x64)
+        sensor = AsyncDFRobot_STCC4(0x64, bus)
+        sensor.sensor.FRC_DELAY = 0.01
+        transactions = bus.transactions
+        assert await sensor.forced_recalibration(32001) is None
+        assert bus.transactions == transactions
+        assert await sensor.forced_recalibration(400) is not None
+
+    asyncio.run(main())
+
+
+def test_begin_leaves_the_bus_to_other_sensors():
+    async def main():
+        bus = STCC4SimBus()
+        bus.attach(0x64, SimulatedSTCC4(measurement_interval=0.01))
+        lock = threading.Lock()
+        missing = AsyncDFRobot_STCC4(0x65, bus, bus_lock=lock)
+        present = AsyncDFRobot_STCC4(0x64, bus, bus_lock=lock)
+        assert await present.begin() == present.sensor.ERR_OK
+        begin = asyncio.ensure_future(missing.begin(deadline=0.3))
+        # The sensor which does not answer is polled until its deadline, meanwhile the other one is read
+        assert await present.wait_for_sample(0.2) is not None
+        assert not begin.done()
+        assert await begin == missing.sensor.ERR_IC_VERSION
+
+    asyncio.run(main())
+
+
+def test_begin_many():
+    async def main():
+        bus = STCC4SimBus()
+        lock = threading.Lock()
+        sensors = []
+        for addr in (0x64, 0x65):
+            bus.attach(addr)
+            sensors.append(AsyncDFRobot_STCC4(addr, bus, bus_lock=lock))
+        bus.fail_next(3)
+        assert await AsyncDFRobot_STCC4.begin_many(sensors, 25, 50, 1000) == [0, 0]
+        assert all(sensor.sensor.STCC4_SET_RHT_COMPENSATION in sensor.sensor._compensation for sensor in sensors)
+        assert bus.devices[0x64].measuring and bus.devices[0x65].measuring
+
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+import ctypes
+import threading
+import time
+
+import DFRobot_STCC4_bus
+from DFRobot_STCC4 import I2C_M_RD, DFRobot_STCC4_I2C
+from DFRobot_STCC4_bus import LinuxI2CBus, TCA9548A
+from DFRobot_STCC4_sim import SimulatedSTCC4, SimulatedTCA9548A, STCC4SimBus
+
+
+def test_sensor_nack_behind_the_mux_keeps_the_channel_selected():
+    bus = STCC4SimBus()
+    sim_mux = bus.attach(TCA9548A.DEFAULT_ADDR, SimulatedTCA9548A())
+    sim_mux.attach(0, 0x64, SimulatedSTCC4(measurement_interval=0.05))
+    mux = TCA9548A(bus)
+    sensor = DFRobot_STCC4_I2C(0x64, mux.channel(0))
+    assert sensor._start_continuous()
+    reads = 0
+    for _ in range(20):
+        time.sleep(0.01)
+        if sensor.measurement() is not None:
+            reads += 1
+    # Most reads are refused until the next sample, and none of them selects the channel again
+    assert 0 < reads < 20
+    assert mux.selects == 1
+    assert sim_mux.selects == 1
+
+
+def test_failed_control_write_selects_again():
+    bus = STCC4SimBus()
+    sim_mux = bus.attach(TCA9548A.DEFAULT_ADDR, SimulatedTCA9548A())
+    sim_mux.attach(1, 0x64)
+    mux = TCA9548A(bus)
+    sensor = DFRobot_STCC4_I2C(0x64, mux.channel(1))
+    bus.fail_next()
+    try:
+        mux.select(1)
+    except OSError:
+        pass
+    assert mux.selected is None
+    assert sensor.get_id() == sensor.STCC4_PRODUCT_ID
+    assert mux.selects == 1
+    assert mux.selected == 1
+
+
+class FakeI2CDev:
+    """Stands for the I2C_RDWR ioctl: checks the messages stay as filled in, and answers reads with a pattern"""
+
+    def __init__(self):
+        self.calls = []
+        self.overwritten = 0
+
+    def ioctl(self, fd, request, data):
+        msgs = [data.msgs[i] for i in range(data.nmsgs)]
+        before = [(msg.addr, msg.flags, msg.len, msg.buf) for msg in msgs]
+        # Leave time to another thread to overwrite the messages
+        time.sleep(0.0005)
+        if [(msg.addr, msg.flags, msg.len, msg.buf) for msg in msgs] != before:
+            self.overwritten += 1
+        self.calls.append([(msg.addr, msg.flags, ctypes.string_at(msg.buf, msg.len)) for msg in msgs])
+        if data.nmsgs == 2:
+            ctypes.memmove(msgs[1].buf, bytes(range(msgs[1].len)), msgs[1].len)
+
+
+def test_linux_i2c_bus_messages(monkeypatch):
+    dev = FakeI2CDev()
+    monkeypatch.setattr(DFRobot_STCC4_bus.fcntl, "ioctl", dev.ioctl)
+    bus = LinuxI2CBus("/dev/null")
+    try:
+        bus.write(0x64, bytearray(b"\x21\x8b\x00"), 2)
+        rbuf = bytearray(12)
+        bus.write_read(0x64, bytearray(b"\xec\x05"), 2, rbuf, 4)
+    finally:
+        bus.close()
+    assert dev.calls == [[(0x64, 0, b"\x21\x8b")], [(0x64, 0, b"\xec\x05"), (0x64, I2C_M_RD, bytes(4))]]
+    assert rbuf[:4] == b"\x00\x01\x02\x03" and rbuf[4:] == bytes(8)
+
+
+def test_linux_i2c_bus_shared_by_threads(monkeypatch):
+    dev = FakeI2CDev()
+    monkeypatch.setattr(DFRobot_STCC4_bus.fcntl, "ioctl", dev.ioctl)
+    bus = LinuxI2CBus("/dev/null")
+
+    def worker(addr):
+        wbuf, rbuf = bytearray(2), bytearray(12)
+        for _ in range(50):
+            bus.write_read(addr, wbuf, 2, rbuf, 12)
+
+    threads = [threading.Thread(target=worker, args=(addr,)) for addr in (0x64, 0x65)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    bus.close()
+    assert len(dev.calls) == 100
+    assert dev.overwritten == 0
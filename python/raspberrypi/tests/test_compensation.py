@@ -0,0 +1,122 @@
+import queue
+import time
+
+import pytest
+
+from DFRobot_STCC4 import DFRobot_STCC4_I2C
+from DFRobot_STCC4_compensation import (HUMIDITY, PRESSURE, TEMPERATURE, STCC4CompensationPipeline, file_source,
+                                        queue_source)
+from DFRobot_STCC4_poller import STCC4Poller
+from DFRobot_STCC4_sim import STCC4SimBus
+
+
+def rht_raw(temperature, humidity):
+    return int((temperature + 45) * 65535 / 175), int((humidity + 6) * 65535 / 125)
+
+
+def test_smoothed_and_clamped_values_reach_the_sensor(tmp_path):
+    bus = STCC4SimBus()
+    sim = bus.attach(0x64)
+    pipeline = STCC4CompensationPipeline(push_interval=0.0, alpha=0.5)
+    pipeline.add_sensor(DFRobot_STCC4_I2C(0x64, bus), "room")
+    temperatures = queue.Queue()
+    pipeline.add_source(TEMPERATURE, queue_source(temperatures))
+    pipeline.add_source(TEMPERATURE, lambda: 22.0)
+    pipeline.add_source(HUMIDITY, lambda: 95.0)
+    path = tmp_path / "pressure"
+    pipeline.add_source(PRESSURE, file_source(str(path)))
+
+    # No pressure yet: only the RHT compensation is written
+    temperatures.put(30.0)
+    temperatures.put(18.0)
+    pipeline.sample()
+    assert pipeline.value(PRESSURE) is None
+    assert pipeline.push() == {"room": True}
+    assert (sim.temp_raw, sim.hum_raw) == rht_raw(20.0, 80.0)
+    assert sim.pressure_raw == 1013 * 50
+
+    # Mean of the sources folded into the average, humidity clamped to the sensor range
+    temperatures.put(28.0)
+    path.write_text("1000.4\n")
+    pipeline.sample()
+    assert pipeline.value(TEMPERATURE) == 22.5
+    assert pipeline.value(HUMIDITY) == 80.0
+    assert pipeline.push() == {"room": True}
+    assert (sim.temp_raw, sim.hum_raw) == rht_raw(22.5, 80.0)
+    assert sim.pressure_raw == 1000 * 50
+
+    # An empty queue and an unreadable file keep the last average
+    path.write_text("n/a")
+    pipeline.sample()
+    assert pipeline.value(TEMPERATURE) == 22.25
+    assert pipeline.value(PRESSURE) == 1000.4
+
+
+def test_push_through_a_poller():
+    bus = STCC4SimBus()
+    sims = [bus.attach(0x64), bus.attach(0x65)]
+    poller = STCC4Poller()
+    poller.add_sensor(bus, 0x64, "a")
+    poller.add_sensor(bus, 0x65, "b")
+    pipeline = STCC4CompensationPipeline(push_interval=0.0, alpha=1.0)
+    pipeline.add_poller(poller)
+    pipeline.add_source(PRESSURE, lambda: 1500.0)
+    pipeline.run(1)
+    assert pipeline.last_push == {"a": True, "b": True}
+    assert [sim.pressure_raw for sim in sims] == [1100 * 50, 1100 * 50]
+    poller.close()
+
+
+def test_run_returns_after_the_last_push():
+    pipeline = STCC4CompensationPipeline(push_interval=0.2)
+    samples = []
+    pipeline.add_source(PRESSURE, lambda: samples.append(None))
+    start = time.monotonic()
+    pipeline.run(2)
+    # One interval between the two pushes, none after the last one
+    assert 0.2 <= time.monotonic() - start < 0.35
+    assert len(samples) == 2
+
+
+def test_raising_source_is_recorded_and_the_thread_keeps_running():
+    bus = STCC4SimBus()
+    sim = bus.attach(0x64)
+    pipeline = STCC4CompensationPipeline(push_interval=0.01, alpha=1.0)
+    pipeline.add_sensor(DFRobot_STCC4_I2C(0x64, bus))
+    error = RuntimeError("source gone")
+    calls = []
+
+    def broken():
+        calls.append(None)
+        raise error
+
+    pipeline.add_source(TEMPERATURE, broken)
+    pipeline.add_source(TEMPERATURE, lambda: 15.0)
+    pipeline.add_source(HUMIDITY, lambda: 40.0)
+    pipeline.start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(calls) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(calls) >= 3
+        assert pipeline._thread.is_alive()
+        assert pipeline.errors == {TEMPERATURE: error}
+        assert pipeline.last_push == {0: True}
+        assert (sim.temp_raw, sim.hum_raw) == rht_raw(15.0, 40.0)
+    finally:
+        pipeline.stop()
+    assert pipeline._thread is None
+
+
+def test_failed_write_and_unknown_quantity():
+    bus = STCC4SimBus()
+    bus.attach(0x64)
+    pipeline = STCC4CompensationPipeline(push_interval=0.0)
+    pipeline.add_sensor(DFRobot_STCC4_I2C(0x64, bus), "room")
+    pipeline.add_source(PRESSURE, lambda: 950.0)
+    pipeline.sample()
+    bus.fail_next()
+    assert pipeline.push() == {"room": False}
+    assert pipeline.push() == {"room": True}
+    with pytest.raises(ValueError):
+        pipeline.add_source("co2", lambda: 400.0)
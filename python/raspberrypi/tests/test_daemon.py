@@ -0,0 +1,134 @@
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import pytest
+
+import DFRobot_STCC4_daemon
+from DFRobot_STCC4 import DFRobot_STCC4
+from DFRobot_STCC4_daemon import STCC4Client, STCC4Daemon
+from DFRobot_STCC4_bus import TCA9548A
+from DFRobot_STCC4_sim import SimulatedSTCC4, SimulatedTCA9548A, STCC4SimBus
+
+
+def make_daemon(shm_name, name="room"):
+    bus = STCC4SimBus()
+    bus.attach(0x64)
+    daemon = STCC4Daemon(shm_name, interval=0.01)
+    daemon.add_sensor(bus, 0x64, name)
+    return daemon
+
+
+def test_running_daemon_block_is_not_taken_over():
+    shm_name = "stcc4-test-" + uuid.uuid4().hex[:8]
+    with make_daemon(shm_name) as first:
+        first.start()
+        second = make_daemon(shm_name)
+        with pytest.raises(FileExistsError):
+            second.start()
+        second.close()
+        with STCC4Client("room", shm_name) as client:
+            assert client.names == ["room"]
+
+
+def test_stale_block_is_reclaimed():
+    shm_name = "stcc4-test-" + uuid.uuid4().hex[:8]
+    first = make_daemon(shm_name)
+    first.start()
+    # Daemon gone without close(): its heartbeat stops
+    DFRobot_STCC4_daemon._HEARTBEAT.pack_into(first._shm.buf, DFRobot_STCC4_daemon.HEARTBEAT_OFFSET, 0.0)
+    with make_daemon(shm_name, "hall") as second:
+        second.start()
+        with STCC4Client("hall", shm_name) as client:
+            assert client.names == ["hall"]
+    first._shm.close()
+    first.poller.close()
+
+
+def test_name_too_long_is_rejected():
+    daemon = make_daemon("stcc4-test-" + uuid.uuid4().hex[:8], "é" * 17)
+    with pytest.raises(ValueError):
+        daemon.start()
+    daemon.close()
+
+
+def test_no_resource_tracker_error_at_exit():
+    # Daemon and client in one process: the block must be unregistered exactly once
+    code = (
+        "import uuid\n"
+        "from DFRobot_STCC4_daemon import STCC4Client, STCC4Daemon\n"
+        "from DFRobot_STCC4_sim import STCC4SimBus\n"
+        "bus = STCC4SimBus()\n"
+        "bus.attach(0x64)\n"
+        "name = 'stcc4-test-' + uuid.uuid4().hex[:8]\n"
+        "with STCC4Daemon(name, 0.01) as daemon:\n"
+        "    daemon.add_sensor(bus, 0x64, 'room')\n"
+        "    daemon.start()\n"
+        "    daemon.run(3)\n"
+        "    with STCC4Client('room', name) as client:\n"
+        "        assert client.measurement() is not None or client.last_error\n"
+    )
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == ""
+
+
+def test_default_names_of_sensors_behind_a_mux():
+    bus = STCC4SimBus()
+    sim_mux = bus.attach(TCA9548A.DEFAULT_ADDR, SimulatedTCA9548A())
+    mux = TCA9548A(bus)
+    daemon = STCC4Daemon("stcc4-test-" + uuid.uuid4().hex[:8])
+    for channel in range(2):
+        sim_mux.attach(channel)
+        daemon.add_sensor(mux.channel(channel), 0x64)
+    bus.attach(0x64)
+    other = STCC4SimBus()
+    other.attach(0x64)
+    daemon.add_sensor(bus, 0x64)
+    daemon.add_sensor(other, 0x64)
+    assert daemon.poller.names == ["bus0/0x70.0:0x64", "bus0/0x70.1:0x64", "bus0:0x64", "bus1:0x64"]
+
+
+def test_slot_with_unseen_stores_is_rejected():
+    shm_name = "stcc4-test-" + uuid.uuid4().hex[:8]
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(co2=650, measurement_interval=0.01))
+    with STCC4Daemon(shm_name, interval=0.01) as daemon:
+        daemon.add_sensor(bus, 0x64, "room")
+        daemon.start()
+        time.sleep(0.02)
+        daemon.run(1)
+        with STCC4Client("room", shm_name) as client:
+            assert client.measurement()[0] == 650
+            # As if the final sequence number was seen before one of the data stores
+            offset = daemon._slots["room"] + DFRobot_STCC4_daemon.PAYLOAD_OFFSET + 24
+            buf = daemon._shm.buf
+            buf[offset] ^= 0xFF
+            assert client.measurement() is None
+            assert client.last_error == DFRobot_STCC4.ERR_DATA_READ
+            buf[offset] ^= 0xFF
+            assert client.measurement()[0] == 650
+
+
+def test_not_ready_reads_keep_the_published_sample():
+    shm_name = "stcc4-test-" + uuid.uuid4().hex[:8]
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(measurement_interval=0.05))
+    with STCC4Daemon(shm_name, interval=0.01) as daemon:
+        daemon.add_sensor(bus, 0x64, "room")
+        daemon.start()
+        errors = []
+        publish = daemon.publish
+
+        def recording(batch):
+            publish(batch)
+            errors.append(DFRobot_STCC4_daemon._DATA.unpack_from(daemon._shm.buf, daemon._slots["room"])[9])
+
+        daemon.poller.run(daemon.interval, recording, 20)
+        # Polled five times per sample, the refused reads are not published as errors
+        assert errors == [DFRobot_STCC4.ERR_OK] * 20
+        with STCC4Client("room", shm_name) as client:
+            assert client.measurement() is not None
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C, STCC4Bus, STCC4Measurement
+from DFRobot_STCC4_frames import FRAME_VALID, crc_masks, decode_frames
+
+
+class ArchiveBus(STCC4Bus):
+    """Answers every read with the next frame of an archive"""
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.offset = 0
+
+    def write_read(self, addr, wbuf, wlength, rbuf, rlength):
+        rbuf[:rlength] = self.archive[self.offset:self.offset + rlength]
+        self.offset += 12
+
+
+def make_archive(count, corrupt_every=7):
+    crc = DFRobot_STCC4()
+    rng = random.Random(1)
+    archive = bytearray()
+    for i in range(count):
+        frame = bytearray()
+        for value in (rng.randrange(400, 5000), rng.randrange(0x10000), rng.randrange(0x10000), rng.choice((0, 0x4000))):
+            frame += bytes((value >> 8, value & 0xFF, crc.calculation_crc([value])))
+        if i % corrupt_every == 0:
+            # Corrupt the CRC of word i % 4
+            frame[3 * (i % 4) + 2] ^= 0x5A
+        archive += frame
+    return bytes(archive)
+
+
+def test_crc_masks():
+    archive = make_archive(8)
+    masks = crc_masks(archive)
+    assert masks.tolist() == [FRAME_VALID & ~0x01] + [FRAME_VALID] * 6 + [FRAME_VALID & ~0x08]
+
+
+def test_decode_frames_matches_read_measurement():
+    archive = make_archive(200)
+    sensor = DFRobot_STCC4_I2C(0x64, ArchiveBus(archive))
+    record = STCC4Measurement()
+    decoded = decode_frames(archive)
+    assert len(decoded) == 200
+    for row in decoded:
+        if sensor.read_measurement(record) == sensor.ERR_OK:
+            assert row["crc_mask"] == FRAME_VALID
+            assert (int(row["co2_concentration"]), float(row["temperature"]), float(row["humidity"]),
+                    int(row["sensor_status"]), int(row["temp_raw"]), int(row["hum_raw"])) == (
+                record.co2_concentration, record.temperature, record.humidity, record.sensor_status,
+                record.temp_raw, record.hum_raw)
+        else:
+            assert sensor.last_error == sensor.ERR_CRC
+            assert row["crc_mask"] != FRAME_VALID
+
+
+def test_decode_frames_valid_only():
+    archive = make_archive(70)
+    valid = decode_frames(archive, valid_only=True)
+    assert len(valid) == 60
+    assert (valid["crc_mask"] == FRAME_VALID).all()
+    assert (valid["co2_concentration"] == decode_frames(archive)["co2_concentration"][crc_masks(archive) == FRAME_VALID]).all()
+
+
+def test_decode_frames_from_an_array():
+    archive = make_archive(3)
+    assert (decode_frames(np.frombuffer(archive, dtype=np.uint8)) == decode_frames(archive)).all()
+    with pytest.raises(ValueError):
+        decode_frames(archive[:-1])
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C
+from DFRobot_STCC4_history import STCC4History
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+
+
+def filled(capacity, count):
+    history = STCC4History(capacity)
+    for i in range(count):
+        history.append(float(i), 400 + i, 0x6666, 0x72AF, i)
+    return history
+
+
+def test_wraparound_keeps_the_newest_samples():
+    history = filled(4, 6)
+    assert len(history) == 4
+    assert [history[i][1] for i in range(4)] == [402, 403, 404, 405]
+    # The window wraps: the oldest samples sit at the end of the arrays
+    assert [list(view) for view in history.views("co2")] == [[402, 403], [404, 405]]
+    assert [list(view) for view in history.views("co2", 3)] == [[403], [404, 405]]
+    assert [list(view) for view in history.views("co2", 2)] == [[404, 405]]
+    history.clear()
+    assert len(history) == 0
+    assert history.views("co2") == (memoryview(history._co2)[0:0],)
+
+
+def test_getitem_with_negative_indexes():
+    history = filled(4, 6)
+    assert history[-1][:2] == (5.0, 405)
+    assert history[-4][:2] == (2.0, 402)
+    timestamp, co2, temperature, humidity, status = history[-2]
+    assert (timestamp, co2, status) == (4.0, 404, 4)
+    assert temperature == pytest.approx(25.0, abs=0.01)
+    assert humidity == pytest.approx(50.0, abs=0.01)
+    with pytest.raises(IndexError):
+        history[-5]
+    with pytest.raises(IndexError):
+        history[4]
+
+
+def test_count_since_across_the_wrap():
+    history = filled(5, 8)
+    # Timestamps 3.0 to 7.0 held, the oldest stored at the end of the arrays
+    assert history.count_since(0.0) == 5
+    assert history.count_since(3.0) == 5
+    assert history.count_since(5.5) == 2
+    assert history.count_since(7.0) == 1
+    assert history.count_since(8.0) == 0
+    assert history.mean("co2", history.count_since(5.5)) == 406.5
+    assert STCC4History(3).count_since(0.0) == 0
+
+
+def test_statistics_of_an_empty_history():
+    history = STCC4History(3)
+    for field in ("co2", "timestamp", "temperature", "humidity"):
+        assert history.min(field) is None
+        assert history.max(field) is None
+        assert history.mean(field) is None
+    history = filled(3, 5)
+    assert history.mean("co2", 0) is None
+    assert history.min("co2", 0) is None
+
+
+def test_statistics_over_a_window():
+    history = STCC4History(3)
+    for i, (co2, temp_raw) in enumerate([(500, 0x4000), (450, 0x8000), (700, 0x6000), (600, 0x5000)]):
+        history.append(float(i), co2, temp_raw, 0x72AF, 0)
+    assert history.min("co2") == 450
+    assert history.max("co2") == 700
+    assert history.mean("co2") == pytest.approx(1750 / 3)
+    assert history.max("co2", 1) == 600
+    assert history.min("temperature") == pytest.approx(-45.0 + 175.0 * 0x5000 / 65535)
+    assert history.max("temperature", 2) == pytest.approx(-45.0 + 175.0 * 0x6000 / 65535)
+    assert history.mean("humidity") == pytest.approx(50.0, abs=0.01)
+    with pytest.raises(ValueError):
+        STCC4History(0)
+
+
+def test_driver_records_every_sample():
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(co2=820, measurement_interval=0.01))
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    history = STCC4History(2)
+    sensor.set_history(history)
+    assert sensor._start_continuous()
+    for _ in range(3):
+        time.sleep(0.015)
+        assert sensor.read_measurement() == DFRobot_STCC4.ERR_OK
+    assert len(history) == 2
+    assert history[-1][0] == sensor.last_measurement.timestamp
+    assert history.mean("co2") == 820
+    sensor.set_history(None)
+    time.sleep(0.015)
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_OK
+    assert history[-1][0] != sensor.last_measurement.timestamp
@@ -0,0 +1,139 @@
+import os
+
+import pytest
+
+from DFRobot_STCC4_log import HEADER_SIZE, RECORD_SIZE, STCC4Log
+
+
+class Clock:
+    """Nanosecond clock advanced by hand"""
+
+    def __init__(self, now=1000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def fill(log, clock, count, step=10, sensor=0):
+    stamps = []
+    for i in range(count):
+        clock.now += step
+        stamps.append(log.append(400 + i, 0x6666, 0x72AF, 0, sensor))
+    return stamps
+
+
+def crash(log):
+    """Drop the log without syncing its record count, as on a power loss"""
+    log._mm.close()
+    log._file.close()
+    log._mm = None
+    log._file = None
+
+
+def test_append_after_close_raises(tmp_path):
+    log = STCC4Log(str(tmp_path), segment_records=4)
+    log.append(400, 0x6666, 0x72AF, 0)
+    log.close()
+    with pytest.raises(ValueError, match="log is closed"):
+        log.append(400, 0x6666, 0x72AF, 0)
+    with STCC4Log(str(tmp_path)) as reopened:
+        assert len(reopened) == 1
+
+
+def test_unsynced_records_are_recovered(tmp_path):
+    clock = Clock()
+    log = STCC4Log(str(tmp_path), segment_records=16, sync_every=100, clock=clock)
+    stamps = fill(log, clock, 10)
+    crash(log)
+    with STCC4Log(str(tmp_path), segment_records=16, clock=clock) as reopened:
+        assert [record[0] for record in reopened.query()] == stamps
+
+
+def test_torn_record_and_the_ones_after_it_are_erased(tmp_path):
+    clock = Clock()
+    log = STCC4Log(str(tmp_path), segment_records=16, sync_every=100, clock=clock)
+    stamps = fill(log, clock, 10)
+    path = log.segments[0][0]
+    crash(log)
+    with open(path, "r+b") as f:
+        # Flip a CRC byte of record 7
+        f.seek(HEADER_SIZE + 7 * RECORD_SIZE + 20)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes((byte[0] ^ 0xFF,)))
+    with STCC4Log(str(tmp_path), segment_records=16, clock=clock) as reopened:
+        assert [record[0] for record in reopened.query()] == stamps[:7]
+    with open(path, "rb") as f:
+        f.seek(HEADER_SIZE + 7 * RECORD_SIZE)
+        assert f.read(3 * RECORD_SIZE) == bytes(3 * RECORD_SIZE)
+
+
+def test_truncated_segment(tmp_path):
+    clock = Clock()
+    log = STCC4Log(str(tmp_path), segment_records=16, sync_every=100, clock=clock)
+    stamps = fill(log, clock, 10)
+    path = log.segments[0][0]
+    crash(log)
+    # Cut in the middle of record 5
+    os.truncate(path, HEADER_SIZE + 5 * RECORD_SIZE + 10)
+    with STCC4Log(str(tmp_path), segment_records=16, clock=clock) as reopened:
+        assert [record[0] for record in reopened.query()] == stamps[:5]
+        # The short segment is full, new records go to the next one
+        clock.now += 10
+        reopened.append(400, 0x6666, 0x72AF, 0)
+        assert len(reopened.segments) == 2
+        assert len(reopened) == 6
+
+
+def test_query_ranges(tmp_path):
+    clock = Clock()
+    with STCC4Log(str(tmp_path), segment_records=4, clock=clock) as log:
+        stamps = []
+        for i in range(10):
+            stamps += fill(log, clock, 1, sensor=i % 2)
+        assert len(log.segments) == 3
+        assert [record[0] for record in log.query()] == stamps
+        assert [record[0] for record in log.query(stamps[3], stamps[6])] == stamps[3:7]
+        assert [record[0] for record in log.query(stamps[3] + 1, stamps[6] - 1)] == stamps[4:6]
+        assert [record[0] for record in log.query(start=stamps[8])] == stamps[8:]
+        assert [record[0] for record in log.query(end=stamps[1])] == stamps[:2]
+        assert [record[0] for record in log.query(sensor=1)] == stamps[1::2]
+        assert list(log.query(stamps[-1] + 1)) == []
+        ts, sensor, co2, temp_raw, hum_raw, status = next(log.query(stamps[2], stamps[2]))
+        assert (ts, sensor, co2, temp_raw, hum_raw, status) == (stamps[2], 0, 400, 0x6666, 0x72AF, 0)
+
+
+def test_rotate_keeps_max_segments(tmp_path):
+    clock = Clock()
+    with STCC4Log(str(tmp_path), segment_records=4, max_segments=2, clock=clock) as log:
+        stamps = fill(log, clock, 10)
+        assert len(log.segments) == 2
+        assert [record[0] for record in log.query()] == stamps[4:]
+    assert len([name for name in os.listdir(str(tmp_path)) if name.endswith(".stcc4log")]) == 2
+
+
+def test_compact(tmp_path):
+    clock = Clock()
+    with STCC4Log(str(tmp_path), segment_records=4, clock=clock) as log:
+        stamps = fill(log, clock, 10)
+        log.compact(stamps[5])
+        # The first segment is deleted, the second rewritten with its newer records
+        assert [count for _, count, _, _ in log.segments] == [3, 2]
+        assert [record[0] for record in log.query()] == stamps[5:]
+    with STCC4Log(str(tmp_path), segment_records=4, clock=clock) as reopened:
+        assert [record[0] for record in reopened.query()] == stamps[5:]
+
+
+def test_clock_offset_is_kept_across_reopen(tmp_path):
+    clock = Clock(10 ** 12)
+    with STCC4Log(str(tmp_path), clock=clock) as log:
+        stamps = fill(log, clock, 3)
+    # The clock restarted from 0, as after a reboot
+    clock.now = 0
+    with STCC4Log(str(tmp_path), clock=clock) as log:
+        clock.now += 10
+        ts = log.append(400, 0x6666, 0x72AF, 0)
+        assert ts >= stamps[-1]
+        clock.now += 10
+        assert log.append(400, 0x6666, 0x72AF, 0) == ts + 10
@@ -0,0 +1,75 @@
+import time
+
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C
+from DFRobot_STCC4_metrics import STCC4Metrics, command_name
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+
+READ = DFRobot_STCC4.STCC4_READ_MEASURE
+
+
+def test_snapshot_counters_and_buckets():
+    metrics = STCC4Metrics(buckets=(0.001, 0.01))
+    metrics.transaction("room", READ, 14, 0.0005)
+    metrics.transaction("room", READ, 14, 0.001)
+    metrics.transaction("room", READ, 14, 0.5, OSError(121, "NACK"))
+    metrics.crc_failure("room", READ)
+    metrics.retry("room", READ)
+    assert metrics.snapshot() == {"room": {"READ_MEASURE": {
+        "transactions": 3,
+        "bytes": 28,
+        "errors": {"OSError": 1},
+        "crc_failures": 1,
+        "retries": 1,
+        "latency_sum": 0.5015,
+        "latency_buckets": [(0.001, 2), (0.01, 0), (float("inf"), 1)],
+    }}}
+    assert command_name(0x1234) == "0x1234"
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_prometheus_exposition():
+    metrics = STCC4Metrics(buckets=(0.001,))
+    metrics.transaction("room", READ, 14, 0.0005)
+    metrics.transaction("room", READ, 14, 0.002, TimeoutError())
+    lines = metrics.prometheus("co2").splitlines()
+    labels = 'sensor="room",command="READ_MEASURE"'
+    assert "# TYPE co2_transactions_total counter" in lines
+    assert "co2_transactions_total{%s} 2" % labels in lines
+    assert "co2_bytes_total{%s} 14" % labels in lines
+    assert "co2_crc_failures_total{%s} 0" % labels in lines
+    assert 'co2_errors_total{%s,type="TimeoutError"} 1' % labels in lines
+    assert "# TYPE co2_transaction_seconds histogram" in lines
+    # Cumulative buckets
+    assert 'co2_transaction_seconds_bucket{%s,le="0.001"} 1' % labels in lines
+    assert 'co2_transaction_seconds_bucket{%s,le="+Inf"} 2' % labels in lines
+    assert "co2_transaction_seconds_sum{%s} 0.0025" % labels in lines
+    assert "co2_transaction_seconds_count{%s} 2" % labels in lines
+
+
+def test_label_values_are_escaped():
+    metrics = STCC4Metrics()
+    metrics.transaction('hall "north"\\\nshelf', READ, 14, 0.0)
+    text = metrics.prometheus()
+    assert 'stcc4_transactions_total{sensor="hall \\"north\\"\\\\\\nshelf",command="READ_MEASURE"} 1\n' in text
+    # One sample per line whatever the sensor name
+    assert all(line.startswith(("#", "stcc4_")) for line in text.splitlines())
+
+
+def test_driver_records_its_transactions():
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(measurement_interval=0.01))
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    metrics = STCC4Metrics()
+    sensor.set_metrics(metrics)
+    assert sensor._start_continuous()
+    time.sleep(0.02)
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_OK
+    bus.corrupt_next()
+    time.sleep(0.02)
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_CRC
+    data = metrics.snapshot()["0x64"]
+    assert data["READ_MEASURE"]["transactions"] == 2
+    assert data["READ_MEASURE"]["bytes"] == 2 * 14
+    assert data["READ_MEASURE"]["crc_failures"] == 1
+    assert data["START_CONT_MEASURE"]["transactions"] == 1
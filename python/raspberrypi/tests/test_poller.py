@@ -0,0 +1,53 @@
+import time
+
+from DFRobot_STCC4 import CircuitBreaker, DFRobot_STCC4
+from DFRobot_STCC4_poller import STCC4Poller
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+
+
+def test_breaker_ignores_not_ready_reads():
+    # Polled 5 times per sample: most reads are refused because no new sample is ready yet
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(measurement_interval=0.1))
+    with STCC4Poller(breaker_factory=CircuitBreaker) as poller:
+        sensor = poller.add_sensor(bus, 0x64, "room")
+        assert poller.begin() == {"room": DFRobot_STCC4.ERR_OK}
+        errors = []
+        samples = 0
+        for _ in range(40):
+            batch = poller.poll()
+            if batch.samples["room"] is not None:
+                samples += 1
+            else:
+                errors.append(batch.errors["room"])
+            time.sleep(0.02)
+        assert samples >= 5
+        assert DFRobot_STCC4.ERR_CIRCUIT_OPEN not in errors
+        assert sensor._breaker.state(0x64) == CircuitBreaker.CLOSED
+
+
+def test_breaker_opens_on_dead_sensor():
+    bus = STCC4SimBus()
+    bus.attach(0x64)
+    with STCC4Poller(breaker_factory=lambda: CircuitBreaker(failure_threshold=3)) as poller:
+        sensor = poller.add_sensor(bus, 0x64, "room")
+        bus.fail_next(1000)
+        for _ in range(5):
+            poller.poll()
+        assert sensor._breaker.state(0x64) == CircuitBreaker.OPEN
+
+
+def test_run_returns_after_the_last_poll():
+    bus = STCC4SimBus()
+    bus.attach(0x64)
+    with STCC4Poller() as poller:
+        poller.add_sensor(bus, 0x64, "room")
+        batches = []
+        start = time.monotonic()
+        poller.run(0.2, batches.append, 2)
+        # One interval between the two polls, none after the last one
+        assert len(batches) == 2
+        assert 0.2 <= time.monotonic() - start < 0.35
+        assert batches[1].timestamp - batches[0].timestamp >= 0.2
+        poller.run(0.2, batches.append, 0)
+        assert len(batches) == 2
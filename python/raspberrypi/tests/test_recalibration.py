@@ -0,0 +1,83 @@
+import threading
+import time
+
+from DFRobot_STCC4 import DFRobot_STCC4
+from DFRobot_STCC4_poller import STCC4Poller
+from DFRobot_STCC4_recalibration import FRC_FAILED, STCC4Recalibrator
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+
+INTERVAL = 0.02
+
+
+class FailingFRC(SimulatedSTCC4):
+    """Sensor whose forced recalibration always fails"""
+
+    def command(self, cmd, words):
+        super().command(cmd, words)
+        if cmd == DFRobot_STCC4.STCC4_FORC_CALIBRATION:
+            self.frc_correction = FRC_FAILED
+
+
+def make_poller(devices):
+    bus = STCC4SimBus()
+    poller = STCC4Poller()
+    for index, (name, device) in enumerate(devices.items()):
+        bus.attach(0x64 + index, device)
+        sensor = poller.add_sensor(bus, 0x64 + index, name)
+        sensor.MEASUREMENT_INTERVAL = INTERVAL
+        sensor.START_STOP_DELAY = 0.01
+        sensor.FRC_DELAY = 0.01
+    poller.broadcast(lambda sensor: sensor._start_continuous())
+    return poller
+
+
+def noisy(now):
+    return 400 if int(now / INTERVAL) % 2 else 600
+
+
+def test_stable_unstable_and_failed_sensors():
+    devices = {
+        "stable": SimulatedSTCC4(co2=400, measurement_interval=INTERVAL),
+        "unstable": SimulatedSTCC4(co2=noisy, measurement_interval=INTERVAL),
+        "frc_fails": FailingFRC(co2=400, measurement_interval=INTERVAL),
+    }
+    with make_poller(devices) as poller:
+        recalibrator = STCC4Recalibrator(poller, window=5, settle_timeout=0.5, frc_attempts=2, retry_delay=0.01)
+        results = recalibrator.run(420)
+
+    stable = results["stable"]
+    assert stable.stable and stable.ok
+    assert stable.correction == 0x8000 + 20
+    assert stable.attempts == 1
+    assert stable.samples >= 5 and stable.std == 0
+    assert devices["stable"].measuring
+
+    unstable = results["unstable"]
+    assert not unstable.stable and not unstable.ok
+    assert unstable.attempts == 0
+    assert unstable.std > 15
+
+    failed = results["frc_fails"]
+    assert failed.stable and not failed.ok
+    assert failed.attempts == 2
+
+
+def test_zero_correction_is_not_a_failure():
+    devices = {"room": SimulatedSTCC4(co2=400 + 0x8000, measurement_interval=INTERVAL)}
+    with make_poller(devices) as poller:
+        results = STCC4Recalibrator(poller, window=3, settle_timeout=0.5).run(400)
+    assert results["room"].correction == 0x0000
+
+
+def test_bus_is_not_held_while_settling():
+    devices = {"room": SimulatedSTCC4(co2=noisy, measurement_interval=INTERVAL)}
+    with make_poller(devices) as poller:
+        recalibrator = STCC4Recalibrator(poller, window=5, settle_timeout=0.5)
+        worker = threading.Thread(target=recalibrator.run, args=(420,))
+        worker.start()
+        time.sleep(0.1)
+        start = time.monotonic()
+        assert poller.call("room", lambda sensor: sensor.get_id()) == DFRobot_STCC4.STCC4_PRODUCT_ID
+        assert time.monotonic() - start < 0.2
+        assert worker.is_alive()
+        worker.join()
@@ -0,0 +1,82 @@
+import time
+
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C
+from DFRobot_STCC4_scheduler import STCC4SingleShotScheduler
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+
+SHOT = 0.02
+
+
+class SlowWakeup(SimulatedSTCC4):
+    """Sensor refusing its first single shot triggers, as if it took longer to wake up"""
+
+    def __init__(self, refusals, **kwargs):
+        super().__init__(**kwargs)
+        self.refusals = refusals
+
+    def command(self, cmd, words):
+        if cmd == DFRobot_STCC4.STCC4_SINGLE_SHOT and not self.sleeping and self.refusals:
+            self.refusals -= 1
+            raise OSError(121, "NACK")
+        super().command(cmd, words)
+
+
+def make_scheduler(devices, interval=0.2, deadline=0.2):
+    bus = STCC4SimBus()
+    scheduler = STCC4SingleShotScheduler(interval, deadline=deadline)
+    for index, (name, device) in enumerate(devices.items()):
+        if device is not None:
+            bus.attach(0x64 + index, device)
+        sensor = DFRobot_STCC4_I2C(0x64 + index, bus)
+        sensor.SINGLE_SHOT_DELAY = SHOT
+        sensor.WAKEUP_DELAY = 0.001
+        scheduler.add_sensor(sensor, name)
+    return scheduler
+
+
+def test_cycle_measures_every_sensor_and_puts_it_to_sleep():
+    devices = {
+        "a": SimulatedSTCC4(co2=500, single_shot_time=SHOT),
+        "b": SimulatedSTCC4(co2=900, single_shot_time=SHOT),
+    }
+    scheduler = make_scheduler(devices)
+    assert scheduler.duty_cycle == 0.0
+    for _ in range(2):
+        results = scheduler.cycle()
+        assert {name: sample[0] for name, sample in results.items()} == {"a": 500, "b": 900}
+        assert all(device.sleeping for device in devices.values())
+    assert SHOT <= scheduler.last_awake_time < 0.2
+    assert scheduler.duty_cycle == scheduler._awake_total / (2 * scheduler.interval)
+    assert STCC4SingleShotScheduler(1.0).cycle() == {}
+
+
+def test_retry_all_waits_for_late_and_drops_dead_sensors():
+    devices = {
+        "late": SlowWakeup(3, single_shot_time=SHOT),
+        "dead": None,
+        "ok": SimulatedSTCC4(single_shot_time=SHOT),
+    }
+    scheduler = make_scheduler(devices, deadline=0.1)
+    start = time.monotonic()
+    triggered = scheduler._retry_all(lambda sensor: sensor.single_measurement())
+    # "late" is retried every POLL_INTERVAL until accepted, "dead" until the deadline
+    assert [name for name, _, _ in triggered] == ["ok", "late"]
+    assert devices["late"].refusals == 0
+    assert 0.1 <= time.monotonic() - start < 0.2
+    assert all(start <= trigger_time <= time.monotonic() for _, _, trigger_time in triggered)
+
+    devices["late"].refusals = 1
+    results = scheduler.cycle()
+    assert results["dead"] is None
+    assert results["late"] is not None and results["ok"] is not None
+
+
+def test_run_returns_after_the_last_cycle():
+    scheduler = make_scheduler({"a": SimulatedSTCC4(single_shot_time=SHOT)}, interval=0.2)
+    results = []
+    start = time.monotonic()
+    scheduler.run(results.append, 2)
+    # One interval between the two cycles, none after the last one
+    assert len(results) == 2
+    assert 0.2 <= time.monotonic() - start < 0.35
+    assert 0.0 < scheduler.duty_cycle < 1.0
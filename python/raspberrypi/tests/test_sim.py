@@ -0,0 +1,112 @@
+import time
+
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+
+
+def test_traffic_counters_of_a_measurement_read():
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(measurement_interval=0.01))
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    assert sensor._start_continuous()
+    time.sleep(0.02)
+    bus.transactions = bus.bytes_written = bus.bytes_read = 0
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_OK
+    # 2 command bytes written, 4 words of 3 bytes read
+    assert bus.transactions == 1
+    assert bus.bytes_written == 2
+    assert bus.bytes_read == 12
+
+
+def test_is_sample_ready_after_a_read():
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(measurement_interval=0.1))
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    sensor.MEASUREMENT_INTERVAL = 0.1
+    sensor.START_STOP_DELAY = 0.01
+    assert sensor.start_measurement()
+    while not sensor.is_sample_ready():
+        time.sleep(0.01)
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_OK
+    # The sample is consumed: the next one is only due one interval later
+    assert not sensor.is_sample_ready()
+    while not sensor.is_sample_ready():
+        time.sleep(0.01)
+    time.sleep(0.01)
+    assert sensor.measurement() is not None
+    assert sensor.last_error == DFRobot_STCC4.ERR_OK
+    assert not sensor.is_sample_ready()
+
+
+def test_corrupted_frame_leaves_the_record_untouched():
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(co2=650, measurement_interval=0.01))
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    assert sensor._start_continuous()
+    time.sleep(0.02)
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_OK
+    before = sensor.last_measurement.as_tuple(), sensor.last_measurement.timestamp
+    bus.devices[0x64].co2 = 900
+    time.sleep(0.02)
+    bus.corrupt_next()
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_CRC
+    assert sensor.last_error == DFRobot_STCC4.ERR_CRC
+    assert (sensor.last_measurement.as_tuple(), sensor.last_measurement.timestamp) == before
+
+
+def writes(bus, call):
+    before = bus.transactions
+    assert call()
+    return bus.transactions - before
+
+
+def test_compensation_cache_skips_writes():
+    bus = STCC4SimBus()
+    sim = bus.attach(0x64)
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    assert writes(bus, lambda: sensor.set_rht_compensation(20.0, 40.0)) == 1
+    assert writes(bus, lambda: sensor.set_rht_compensation(20.0, 40.0)) == 0
+    # Same raw words: still skipped without hysteresis
+    assert writes(bus, lambda: sensor.set_rht_compensation(20.001, 40.0)) == 0
+    assert writes(bus, lambda: sensor.set_rht_compensation(20.1, 40.0)) == 1
+    assert writes(bus, lambda: sensor.set_pressure_compensation(1000)) == 1
+    assert writes(bus, lambda: sensor.set_pressure_compensation(1000)) == 0
+
+    sensor.set_compensation_hysteresis(temperature=0.5, humidity=1.0, pressure=2)
+    assert writes(bus, lambda: sensor.set_rht_compensation(20.4, 40.9)) == 0
+    assert writes(bus, lambda: sensor.set_rht_compensation(20.4, 41.2)) == 1
+    assert writes(bus, lambda: sensor.set_pressure_compensation(1002)) == 0
+    assert writes(bus, lambda: sensor.set_pressure_compensation(1003)) == 1
+    assert sim.pressure_raw == 1003 * 50
+
+    sensor.invalidate_compensation()
+    assert writes(bus, lambda: sensor.set_rht_compensation(20.4, 41.2)) == 1
+    assert writes(bus, lambda: sensor.set_pressure_compensation(1003)) == 1
+
+    # A failed write is sent again
+    bus.fail_next()
+    assert not sensor.set_pressure_compensation(1010)
+    assert writes(bus, lambda: sensor.set_pressure_compensation(1010)) == 1
+
+
+def test_compensation_cache_is_cleared_by_sleep_and_reset():
+    bus = STCC4SimBus()
+    sim = bus.attach(0x64)
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    sensor.WAKEUP_DELAY = 0
+    expected = sensor._rht_words(20.0, 40.0)
+
+    for reset in (sensor.soft_reset, sensor.fall_asleep):
+        sensor.invalidate_compensation()
+        assert writes(bus, lambda: sensor.set_rht_compensation(20.0, 40.0)) == 1
+        assert writes(bus, lambda: sensor.set_pressure_compensation(950)) == 1
+        assert reset()
+        if sim.sleeping:
+            sensor.wakeup()
+        else:
+            # The reset sensor is back to its defaults
+            assert (sim.temp_raw, sim.pressure_raw) == (0x6666, 1013 * 50)
+        assert writes(bus, lambda: sensor.set_rht_compensation(20.0, 40.0)) == 1
+        assert writes(bus, lambda: sensor.set_pressure_compensation(950)) == 1
+        assert [sim.temp_raw, sim.hum_raw] == expected
+        assert sim.pressure_raw == 950 * 50
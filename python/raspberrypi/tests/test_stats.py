@@ -0,0 +1,26 @@
+from DFRobot_STCC4_stats import STCC4Aggregator
+
+
+def test_late_sample_does_not_reopen_a_closed_bucket():
+    rollups = []
+    aggregator = STCC4Aggregator(periods=(60.0,), callback=rollups.append)
+    aggregator.feed("room", (400, 20.0, 50.0, 0), 10.0)
+    aggregator.feed("room", (500, 20.0, 50.0, 0), 70.0)
+    # Out of order: belongs to the bucket [0, 60) emitted by the previous sample
+    aggregator.feed("room", (900, 20.0, 50.0, 0), 30.0)
+    aggregator.feed("room", (600, 20.0, 50.0, 0), 130.0)
+    aggregator.flush()
+    assert [rollup.start for rollup in rollups] == [0.0, 60.0, 120.0]
+    assert [rollup.count for rollup in rollups] == [1, 1, 1]
+    assert aggregator.late == 1
+    assert aggregator.stats("room").count == 4
+
+
+def test_late_sample_after_flush_is_dropped():
+    rollups = []
+    aggregator = STCC4Aggregator(periods=(60.0,), callback=rollups.append)
+    aggregator.feed("room", (400, 20.0, 50.0, 0), 10.0)
+    aggregator.flush()
+    aggregator.feed("room", (500, 20.0, 50.0, 0), 20.0)
+    assert aggregator.flush() == []
+    assert aggregator.late == 1
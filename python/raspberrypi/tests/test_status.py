@@ -0,0 +1,74 @@
+import time
+
+from DFRobot_STCC4 import DFRobot_STCC4, DFRobot_STCC4_I2C
+from DFRobot_STCC4_poller import STCC4Poller
+from DFRobot_STCC4_sim import SimulatedSTCC4, STCC4SimBus
+from DFRobot_STCC4_status import BAD_SAMPLE, STCC4Status, decode_status, sample_status, status_text
+
+
+def start(device):
+    bus = STCC4SimBus()
+    bus.attach(0x64, device)
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    assert sensor._start_continuous()
+    return sensor, bus
+
+
+def read(sensor):
+    time.sleep(0.015)
+    assert sensor.read_measurement() == DFRobot_STCC4.ERR_OK
+    return sample_status(sensor)
+
+
+def test_decode_status():
+    assert decode_status(0) == 0
+    assert status_text(decode_status(0)) == "OK"
+    flags = decode_status(0x4000)
+    assert flags == STCC4Status.TESTING_MODE
+    assert decode_status(0x4000) is flags
+    # Unknown bits are kept
+    assert decode_status(0x4001) & 0x0001
+    assert status_text(decode_status(0x4000 | STCC4Status.NO_RHT_SENSOR)) == "TESTING_MODE|NO_RHT_SENSOR"
+
+
+def test_sample_status_without_sht4x():
+    sensor, bus = start(SimulatedSTCC4(measurement_interval=0.01))
+    assert read(sensor) == STCC4Status.NO_RHT_SENSOR
+    # The sensor echoes the compensation written
+    assert sensor.set_rht_compensation(30, 60)
+    assert read(sensor) == STCC4Status.NO_RHT_SENSOR
+    # Not known whether the sensor took the second write: both values are recognized
+    bus.fail_next()
+    assert not sensor.set_rht_compensation(20, 40)
+    assert len(sensor.rht_compensation_raw()) == 2
+    assert read(sensor) == STCC4Status.NO_RHT_SENSOR
+    # Back to the defaults after a reset
+    sensor.soft_reset()
+    assert sensor.rht_compensation_raw() == (DFRobot_STCC4.DEFAULT_RHT_RAW,)
+    assert sensor._start_continuous()
+    assert read(sensor) == STCC4Status.NO_RHT_SENSOR
+
+
+def test_sample_status_with_sht4x():
+    sensor, _ = start(SimulatedSTCC4(temperature=22.5, humidity=41.0, measurement_interval=0.01))
+    assert sensor.set_rht_compensation(30, 60)
+    assert read(sensor) == 0
+    sensor._write_cmd16(sensor.STCC4_ENABLE_TESTING_MODE)
+    assert read(sensor) == STCC4Status.TESTING_MODE
+
+
+def test_poller_rejects_bad_samples():
+    bus = STCC4SimBus()
+    bus.attach(0x64, SimulatedSTCC4(temperature=22.5, humidity=41.0, measurement_interval=0.01))
+    bus.attach(0x65, SimulatedSTCC4(measurement_interval=0.01))
+    with STCC4Poller(reject_status=BAD_SAMPLE) as poller:
+        for addr, name in ((0x64, "sht4x"), (0x65, "no_sht4x")):
+            poller.add_sensor(bus, addr, name)
+        poller.broadcast(lambda sensor: sensor._start_continuous())
+        time.sleep(0.015)
+        batch = poller.poll()
+    assert batch.samples["sht4x"] is not None
+    assert batch.status["sht4x"] == 0
+    assert batch.samples["no_sht4x"] is None
+    assert batch.errors["no_sht4x"] == DFRobot_STCC4.ERR_STATUS
+    assert batch.status["no_sht4x"] == STCC4Status.NO_RHT_SENSOR
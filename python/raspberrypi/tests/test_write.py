@@ -0,0 +1,54 @@
+from DFRobot_STCC4 import DFRobot_STCC4_I2C, STCC4Bus
+
+
+class RecordingBus(STCC4Bus):
+    """Mock bus recording every write transaction as (address, bytes)"""
+
+    def __init__(self):
+        self.transactions = []
+
+    def write(self, addr, buf, length):
+        self.transactions.append((addr, bytes(buf[:length])))
+
+
+def test_crc_of_the_datasheet_example():
+    sensor = DFRobot_STCC4_I2C(0x64, RecordingBus())
+    assert sensor.calculation_crc([0xBEEF]) == 0x92
+
+
+def test_compensation_byte_stream():
+    bus = RecordingBus()
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    # 25 degrees / 50 %RH -> temp_raw 0x6666, hum_raw 0x72AF; 1000 hPa -> 50000 = 0xC350
+    assert sensor.set_rht_compensation(25, 50)
+    assert sensor.set_pressure_compensation(1000)
+    # Command and data words, each followed by its CRC, in a single transaction
+    assert bus.transactions == [
+        (0x64, bytes([0xE0, 0x00, 0x66, 0x66, 0x93, 0x72, 0xAF, sensor.calculation_crc([0x72AF])])),
+        (0x64, bytes([0xE0, 0x16, 0xC3, 0x50, sensor.calculation_crc([0xC350])])),
+    ]
+
+
+def test_out_of_range_compensation_is_not_written():
+    bus = RecordingBus()
+    sensor = DFRobot_STCC4_I2C(0x64, bus)
+    assert not sensor.set_rht_compensation(5, 50)
+    assert not sensor.set_pressure_compensation(1200)
+    assert bus.transactions == []
+
+
+def test_check_crc_frame_with_good_and_bad_words():
+    sensor = DFRobot_STCC4_I2C(0x64, RecordingBus())
+    frame = bytearray()
+    for word in (0xBEEF, 0x0000, 0x1234, 0xFFFF, 0x8000):
+        frame += bytes((word >> 8, word & 0xFF, sensor.calculation_crc([word])))
+    assert sensor.check_crc_frame(frame) == 0b11111
+    frame[4] ^= 0x01        # LSB of word 1
+    frame[11] ^= 0xFF       # CRC of word 3
+    assert sensor.check_crc_frame(frame) == 0b10101
+    for same in (bytes(frame), memoryview(frame), list(frame)):
+        assert sensor.check_crc_frame(same) == 0b10101
+    # Only the leading words, a trailing partial triplet is not checked
+    assert sensor.check_crc_frame(frame, 6) == 0b01
+    assert sensor.check_crc_frame(frame + b"\xbe\xef") == 0b10101
+    assert sensor.check_crc_frame(frame, 2) == 0